@@ -162,6 +162,7 @@ from app.url_converters import (
     TemplateTypeConverter,
     TicketTypeConverter,
 )
+from app.utils.spreadsheet_conversion import spreadsheet_conversion_pool
 from app.utils.user_id import get_user_id_from_flask_login_session
 
 login_manager = LoginManager()
@@ -213,6 +214,7 @@ def create_app(application):
         # External API clients
         redis_client,
         logo_client,
+        spreadsheet_conversion_pool,
     ):
         client.init_app(application)
 
@@ -240,6 +242,7 @@ def create_app(application):
 
 def init_app(application):
     application.after_request(useful_headers_after_request)
+    application.after_request(log_request_cache_memo_after_request)
 
     # Load user first (as we want user_id to be available for all calls to API, which service+organisation might make.
     application.before_request(make_nonce_before_request)
@@ -373,6 +376,17 @@ def make_nonce_before_request():
         request.csp_nonce = secrets.token_urlsafe(16)
 
 
+def log_request_cache_memo_after_request(response):
+    if memo := getattr(request, "request_cache_memo", None):
+        extra = {"request_cache_memo_hits": memo.hits, "request_cache_memo_misses": memo.misses}
+        current_app.logger.debug(
+            "Request cache memo: %(request_cache_memo_hits)s hits, %(request_cache_memo_misses)s misses",
+            extra,
+            extra=extra,
+        )
+    return response
+
+
 #  https://www.owasp.org/index.php/List_of_useful_HTTP_headers
 def useful_headers_after_request(response):
     response.headers.add("X-Content-Type-Options", "nosniff")
@@ -0,0 +1,101 @@
+// Counts how many text messages an SMS template will be charged as, using the rules from
+// app/utils/sms_fragment_counting.py, so the template editor doesn't need to ask the server
+// after every key press.
+//
+// tests/sms-fragment-counts.json has examples this has to agree with the server on.
+
+const SMS_FRAGMENT_COUNTING_RULES_VERSION = 2;
+
+const characterCount = count => count === 1 ? '1 character' : `${count.toLocaleString('en-GB')} characters`;
+
+const messageCount = count => count === 1 ? '1 text message' : `${count.toLocaleString('en-GB')} text messages`;
+
+const formattedList = (items, maxItemsShown, wordForItemsNotShown) => {
+  if (items.length > maxItemsShown) {
+    items = [...items.slice(0, maxItemsShown - 1), wordForItemsNotShown];
+  }
+  if (items.length === 1) {
+    return items[0];
+  }
+  return `${items.slice(0, -1).join(', ')} and ${items[items.length - 1]}`;
+};
+
+const countSMSFragments = (content, rules, prefix) => {
+  const placeholderPattern = new RegExp(rules.placeholder_pattern, 'g');
+  const hasPlaceholders = content.match(placeholderPattern) !== null;
+
+  const gsmCharacters = new Set(rules.gsm_characters);
+  const extendedGsmCharacters = new Set(rules.extended_gsm_characters);
+  const unicodeCharacters = new Set(rules.unicode_characters);
+  const replacementCharacters = new Map(Object.entries(rules.replacement_characters));
+
+  // change the message the same way the server does before sending it
+  const sanitise = text => [...text].map(character => {
+    if (replacementCharacters.has(character)) {
+      return replacementCharacters.get(character);
+    }
+    if (gsmCharacters.has(character) || unicodeCharacters.has(character)) {
+      return character;
+    }
+    // anything else is sent as a single character, either without its accent or as a question mark
+    return '?';
+  }).join('');
+
+  const contentWithoutPlaceholders = sanitise(content.replace(placeholderPattern, '')).trim();
+  // count characters rather than UTF-16 code units, like Python does
+  const contentCount = [...contentWithoutPlaceholders].length;
+  const message = [...(prefix ? `${sanitise(prefix)}: ${contentWithoutPlaceholders}` : contentWithoutPlaceholders)];
+
+  const nonGsmCharacters = [...new Set(message.filter(character => unicodeCharacters.has(character)))];
+
+  const weightedCount = message.length + message.filter(character => extendedGsmCharacters.has(character)).length;
+  const fragmentLengths = rules.fragment_lengths[nonGsmCharacters.length ? 'unicode' : 'gsm'];
+  const fragmentCount = weightedCount <= fragmentLengths.single ? 1 : Math.ceil(weightedCount / fragmentLengths.multipart);
+  const previousFragmentBoundary = fragmentCount === 2 ? fragmentLengths.single : (fragmentCount - 1) * fragmentLengths.multipart;
+
+  return {
+    fragmentCount: fragmentCount,
+    // the service name doesn't count towards the limit
+    isMessageTooLong: contentCount > rules.character_limit,
+    countOfCharactersAboveLimit: contentCount - rules.character_limit,
+    countOfCharactersAbovePreviousFragmentBoundary: weightedCount - previousFragmentBoundary,
+    nonGsmCharacters: nonGsmCharacters,
+    hasPlaceholders: hasPlaceholders
+  };
+};
+
+// Matches app/templates/partials/templates/content-count-message.html
+const renderSMSFragmentCount = count => {
+  if (count.isMessageTooLong) {
+    return `<span class="govuk-error-message">
+      You have ${characterCount(count.countOfCharactersAboveLimit)} too many
+    </span>`;
+  }
+
+  let html = `Will be charged as ${messageCount(count.fragmentCount)}`;
+
+  if (count.hasPlaceholders) {
+    html += ' (not including personalisation)';
+  }
+
+  // the non-GSM characters are all letters, so don't need escaping
+  if (count.nonGsmCharacters.length && count.fragmentCount > 1) {
+    html += `
+      <p class="govuk-hint govuk-!-margin-top-2 govuk-!-margin-bottom-1">
+        Reduce the cost of sending this message by:
+      </p>
+      <ul class="govuk-hint govuk-list govuk-list--bullet govuk-!-margin-bottom-0">
+        <li>removing ${formattedList(count.nonGsmCharacters, 3, 'similar characters')}</li>
+        <li>removing ${characterCount(count.countOfCharactersAbovePreviousFragmentBoundary)}</li>
+      </ul>`;
+  } else if (count.fragmentCount > 1) {
+    html += `
+      <p class="govuk-hint govuk-!-margin-bottom-0">
+        Reduce the cost of sending this message by removing ${characterCount(count.countOfCharactersAbovePreviousFragmentBoundary)}
+      </p>`;
+  }
+
+  return `<span>${html}</span>`;
+};
+
+export { SMS_FRAGMENT_COUNTING_RULES_VERSION, countSMSFragments, renderSMSFragmentCount };
@@ -10,6 +10,7 @@ const defaultInterval = 2000;
 // timeout – The single active setTimeout handle
 // interval – Current backoff interval
 // fetching – Whether a fetch is in flight
+// etag – Fingerprint of the last response, so the server can tell us nothing has changed
 function getState(resource) {
   if (!resourceState[resource]) {
     resourceState[resource] = {
@@ -17,11 +18,21 @@ function getState(resource) {
       timeout: null,
       interval: defaultInterval,
       fetching: false,
+      etag: null,
     };
   }
   return resourceState[resource];
 }
 
+// The server can tell us, in seconds, how long it will be before anything could change.
+// We never poll faster than the response time allows.
+function calculateInterval(responseTime, pollInterval) {
+  const backoff = UpdateContent.prototype.calculateBackoff(responseTime);
+  const serverInterval = parseInt(pollInterval, 10) * 1000;
+
+  return Number.isNaN(serverInterval) ? backoff : Math.max(serverInterval, backoff);
+}
+
 // Because the polling loop is shared, it can't belong to one instance. 
 // It reads and writes resourceState[resource] directly. 
 // All instances for the same URL share the exact same timeout and interval.
@@ -47,11 +58,28 @@ async function pollResource(resource, $form) {
       fetchOptions.body = new URLSearchParams(new FormData(formEl)).toString();
       fetchOptions.headers['Content-Type'] = 'application/x-www-form-urlencoded';
     }
+  } else if (state.etag) {
+    fetchOptions.headers['If-None-Match'] = state.etag;
   }
 
   try {
     const response = await fetch(resource, fetchOptions);
 
+    const pollInterval = response.headers.get('X-Poll-Interval');
+    // The server knows nothing on the page can change any more
+    const stopPolling = pollInterval === 'stop';
+
+    if (response.status === 304) {
+      // Nothing has changed since the last response, so there’s nothing to render
+      state.fetching = false;
+      if (stopPolling) {
+        return;
+      }
+      state.interval = calculateInterval(Date.now() - startTime, pollInterval);
+      state.timeout = setTimeout(() => pollResource(resource, $form), state.interval);
+      return;
+    }
+
     if (!response.ok) {
       if (response.status === 401) {
         locationReload();
@@ -62,17 +90,19 @@ async function pollResource(resource, $form) {
 
     const responseData = await response.json();
 
+    state.etag = response.headers.get('ETag');
+
     for (const renderer of state.renderers) {
       renderer(responseData);
     }
 
-    if (responseData.stop === 1) {
+    if (responseData.stop === 1 || stopPolling) {
       state.fetching = false;
       return;
     }
 
     // Calculate backoff from actual response time, replacing the initial default.
-    state.interval = UpdateContent.prototype.calculateBackoff(Date.now() - startTime);
+    state.interval = calculateInterval(Date.now() - startTime, pollInterval);
 
   } catch {
     // Network error – back off and retry.
@@ -1,4 +1,9 @@
 import { isSupported } from 'govuk-frontend';
+import {
+  SMS_FRAGMENT_COUNTING_RULES_VERSION,
+  countSMSFragments,
+  renderSMSFragmentCount
+} from './sms-fragment-count.mjs';
 
 // This new way of writing Javascript components is based on the GOV.UK Frontend skeleton Javascript coding standard
 // that uses ES2015 Classes -
@@ -18,11 +23,23 @@ class UpdateStatus {
 
     this.$module = $module;
     this.$textbox = document.getElementById(this.$module.dataset.target);
+    this.smsFragmentCountingRules = this.getSMSFragmentCountingRules();
     this.throttleOn = false;
     this.callsHaveBeenThrottled = false;
     this.timeout = null;
   }
 
+  // if the page tells us how to count, we don't need to ask the server every time the content changes
+  getSMSFragmentCountingRules() {
+    if (!this.$module.dataset.smsFragmentCountingRules) {
+      return null;
+    }
+
+    const rules = JSON.parse(this.$module.dataset.smsFragmentCountingRules);
+
+    return rules.version === SMS_FRAGMENT_COUNTING_RULES_VERSION ? rules : null;
+  }
+
   getRenderer($module, response) {
     $module.innerHTML = response.html;
   }
@@ -62,6 +79,15 @@ class UpdateStatus {
   }
 
   async update() {
+    if (this.smsFragmentCountingRules) {
+      this.getRenderer(this.$module, {
+        html: renderSMSFragmentCount(
+          countSMSFragments(this.$textbox.value, this.smsFragmentCountingRules, this.$module.dataset.smsPrefix)
+        )
+      });
+      return;
+    }
+
     const url = this.$module.dataset.updatesUrl;
     const formData = new URLSearchParams(new FormData(this.$textbox.closest('form'))).toString();
 
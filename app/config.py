@@ -34,6 +34,10 @@ class Config:
 
     ASSETS_DEBUG = False
     AWS_REGION = "eu-west-1"
+    # every S3 call in a worker shares one client and its pool of connections
+    S3_MAX_POOL_CONNECTIONS = 50
+    S3_TCP_KEEPALIVE = True
+    S3_MAX_ATTEMPTS = 3
     DEFAULT_SERVICE_LIMIT = 50
     DEFAULT_SERVICE_INTERNATIONAL_SMS_LIMIT = 100
     DEFAULT_LIVE_SERVICE_RATE_LIMITS = {
@@ -95,6 +99,42 @@ class Config:
     REDIS_ENABLED = False if os.environ.get("REDIS_ENABLED") == "0" else True
     REDIS_SOCKET_TIMEOUT = 5
     REDIS_SOCKET_CONNECT_TIMEOUT = 5
+    # remember values read from Redis for the rest of the request they were read in
+    REQUEST_CACHE_MEMO_ENABLED = True
+    # keep values read from Redis in each worker’s memory for a short time, for keys matching these patterns
+    LOCAL_CACHE_TTLS = {
+        "letter-rates": 300,
+        "sms-rate": 300,
+        "email_branding": 60,
+        "letter_branding": 60,
+        "domains": 60,
+    }
+    LOCAL_CACHE_MAX_ITEMS = 1_000
+    # keep rendered letter preview pages in Redis, unless template preview says not to
+    LETTER_PREVIEW_CACHE_TTL = 60 * 60 * 24
+    # previews with personalisation (like names and addresses from an upload) aren’t kept longer than the upload is
+    LETTER_PREVIEW_PERSONALISED_CACHE_TTL = 60 * 60
+    LETTER_PREVIEW_CACHE_MAX_BYTES = 512 * 1024
+    # the pages which expire soonest are removed once the cached pages take up more than this between them
+    LETTER_PREVIEW_CACHE_MAX_TOTAL_BYTES = 64 * 1024 * 1024
+    # uploaded letters are split into pages once, then each page is kept while the letter is being previewed
+    LETTER_UPLOAD_PAGE_CACHE_TTL = 60 * 10
+    # if another request is already splitting a letter into pages, wait this long for it before doing it ourselves
+    LETTER_UPLOAD_PAGE_SPLIT_WAIT_FOR = 5
+    # spreadsheets big enough to hold up other requests while they’re parsed are converted to CSV in child processes
+    SPREADSHEET_CONVERSION_PROCESSES = 2
+    SPREADSHEET_CONVERSION_MAX_QUEUED = 10
+    SPREADSHEET_CONVERSION_TIMEOUT = 25
+    SPREADSHEET_CONVERSION_INLINE_BELOW_BYTES = 256 * 1024
+    # share the parts of the dashboard which are the same for everyone between all the people looking at it
+    DASHBOARD_PARTIALS_FRESH_FOR = 5
+    DASHBOARD_PARTIALS_KEEP_FOR = 60
+    # if nobody has rendered them yet, wait this long for whoever is doing it before doing it ourselves
+    DASHBOARD_PARTIALS_WAIT_FOR = 2
+    # reports can be very big, so they're sent on from S3 a chunk at a time, or the browser gets them from S3 itself
+    REPORT_REQUEST_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    REPORT_REQUEST_DOWNLOAD_VIA_PRESIGNED_URL = os.environ.get("REPORT_REQUEST_DOWNLOAD_VIA_PRESIGNED_URL") == "1"
+    REPORT_REQUEST_PRESIGNED_URL_EXPIRY_SECONDS = 60
 
     ASSET_DOMAIN = os.environ.get("ASSET_DOMAIN", "")
     ASSET_PATH = os.environ.get("ASSET_PATH", "/static/")
@@ -177,6 +217,8 @@ class Test(Development):
     ANTIVIRUS_API_KEY = "test-antivirus-secret"
     ANTIVIRUS_ENABLED = True
     REDIS_ENABLED = False
+    LOCAL_CACHE_TTLS = {}
+    SPREADSHEET_CONVERSION_PROCESSES = 0
     ZENDESK_API_KEY = "test"
 
     ASSET_DOMAIN = "static.example.com"
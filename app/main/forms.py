@@ -1,4 +1,5 @@
 import weakref
+from collections import defaultdict
 from contextlib import suppress
 from copy import deepcopy
 from datetime import UTC, datetime, timedelta
@@ -116,6 +117,7 @@ from app.utils.govuk_frontend_field import (
     render_govuk_frontend_macro,
 )
 from app.utils.image_processing import CorruptImage, ImageProcessor, WrongImageFormat
+from app.utils.spreadsheet_conversion import SpreadsheetConversionPool, spreadsheet_conversion_pool
 from app.utils.user_permissions import (
     all_ui_permissions,
     organisation_user_permission_names,
@@ -473,16 +475,24 @@ class NestedFieldMixin:
         ):
             # assign all options with a NONE_OPTION_VALUE (not always None) to the None key
             if option.data == self.NONE_OPTION_VALUE:
-                child_ids = [folder["id"] for folder in self.all_template_folders if folder["parent_id"] is None]
+                child_ids = self.child_folder_ids_by_parent_id.get(None, ())
                 key = self.NONE_OPTION_VALUE
             else:
-                child_ids = [folder["id"] for folder in self.all_template_folders if folder["parent_id"] == option.data]
+                child_ids = self.child_folder_ids_by_parent_id.get(option.data, ())
                 key = option.data
 
             child_map[key] = [option for option in options if option.data in child_ids]
 
         return child_map
 
+    @cached_property
+    def child_folder_ids_by_parent_id(self):
+        # can be set by the form instead, if something’s already grouped the folders by their parent
+        child_folder_ids = defaultdict(set)
+        for folder in self.all_template_folders:
+            child_folder_ids[folder["parent_id"]].add(folder["id"])
+        return child_folder_ids
+
     def get_items_from_options(self, field):
         items = []
 
@@ -1696,7 +1706,7 @@ class CsvUploadForm(StripWhitespaceForm):
         )
 
         try:
-            self.as_csv_data = Spreadsheet.from_file(field.data, filename=field.data.filename).as_csv_data
+            self.as_csv_data = spreadsheet_conversion_pool.convert_to_csv(field.data, filename=field.data.filename)
         except (UnicodeDecodeError, BadZipFile, XLRDError) as e:
             current_app.logger.warning(
                 "Could not read %s",
@@ -1705,7 +1715,7 @@ class CsvUploadForm(StripWhitespaceForm):
                 extra={"file_name": field.data.filename},
             )
             raise ValidationError("Notify cannot read this file - try using a different file type") from e
-        except SoftEventletTimeout as e:
+        except (SoftEventletTimeout, SpreadsheetConversionPool.ConversionTimeoutError) as e:
             current_app.logger.warning(
                 "Timed out reading %s",
                 field.data.filename,
@@ -2848,7 +2858,7 @@ class TemplateAndFoldersSelectionForm(OrderableFieldsForm):
 
     def __init__(
         self,
-        all_template_folders,
+        user_template_folder_view,
         template_list,
         available_template_types,
         allow_adding_copy_of_template,
@@ -2865,13 +2875,14 @@ class TemplateAndFoldersSelectionForm(OrderableFieldsForm):
         self.op = None
         self.is_move_op = self.is_add_folder_op = self.is_add_template_op = False
 
-        self.move_to.all_template_folders = all_template_folders
+        self.move_to.all_template_folders = user_template_folder_view.template_folders
+        self.move_to.child_folder_ids_by_parent_id = user_template_folder_view.child_folder_ids_by_parent_id
 
         self.move_to.option_hints = option_hints
 
         self.move_to.choices = [
-            (item["id"], item["name"]) for item in ([self.ALL_TEMPLATES_FOLDER] + all_template_folders)
-        ]
+            (self.ALL_TEMPLATES_FOLDER["id"], self.ALL_TEMPLATES_FOLDER["name"])
+        ] + user_template_folder_view.move_to_choices
 
         self.add_template_by_template_type.choices = list(
             filter(
@@ -1,9 +1,11 @@
 import calendar
+import json
 from datetime import UTC, datetime
 from functools import partial
 from itertools import groupby
+from time import monotonic, sleep
 
-from flask import Response, abort, jsonify, render_template, request, session, url_for
+from flask import Response, abort, current_app, jsonify, render_template, request, session, url_for
 from werkzeug.utils import redirect
 
 from app import (
@@ -21,6 +23,7 @@ from app.formatters import format_date_numeric, format_datetime_numeric, format_
 from app.main import json_updates, main
 from app.main.forms import SearchNotificationsForm
 from app.models.notification import InboundSMSMessages, InterruptibleNotifications
+from app.notify_client import fan_out
 from app.statistics_utils import get_formatted_percentage
 from app.utils import (
     DELIVERED_STATUSES,
@@ -28,12 +31,14 @@ from app.utils import (
     REQUESTED_STATUSES,
     SEVEN_DAYS_TTL,
     get_sha512_hashed,
+    make_json_updates_response,
     parse_filter_args,
     service_has_permission,
     set_status_filters,
 )
 from app.utils.csv import Spreadsheet
 from app.utils.pagination import generate_next_dict, generate_previous_dict, get_page_from_request
+from app.utils.redis_locks import acquire_lock, release_lock
 from app.utils.time import get_current_financial_year
 from app.utils.user import user_has_permissions
 
@@ -64,7 +69,17 @@ def service_dashboard(service_id):
 @json_updates.route("/services/<uuid:service_id>/dashboard.json")
 @user_has_permissions("view_activity")
 def service_dashboard_updates(service_id):
-    return jsonify(**get_dashboard_partials())
+    shared_partials = get_shared_dashboard_partials()
+    return make_json_updates_response(
+        partial(get_dashboard_partials, shared_partials),
+        shared_partials,
+        current_service.scheduled_job_stats,
+        current_service.inbound_sms_summary,
+        current_service.returned_letter_statistics,
+        current_service.unsubscribe_requests_statistics,
+        # the totals won’t change until the shared copy of them is refreshed
+        poll_interval=current_app.config["DASHBOARD_PARTIALS_FRESH_FOR"],
+    )
 
 
 @json_updates.route("/services/<uuid:service_id>/dashboard-usage.json")
@@ -144,12 +159,14 @@ def post_report_request_and_redirect(current_service, report_type, message_type,
 @main.route("/services/<uuid:service_id>/notifications/<template_type:message_type>", methods=["GET", "POST"])
 @user_has_permissions()
 def view_notifications(service_id, message_type=None):
-    partials_data = _get_notifications_dashboard_partials_data(service_id, message_type)
-
-    notifications_count = notification_api_client.get_notifications_count_for_service(
-        service_id,
-        message_type,
-        partials_data["service_data_retention_days"],
+    partials_data, notifications_count = fan_out(
+        partial(_get_notifications_dashboard_partials_data, service_id, message_type),
+        partial(
+            notification_api_client.get_notifications_count_for_service,
+            service_id,
+            message_type,
+            current_service.get_days_of_retention(message_type) if message_type is not None else None,
+        ),
     )
 
     can_download = notifications_count <= MAX_NOTIFICATION_FOR_DOWNLOAD
@@ -280,10 +297,23 @@ def template_usage(service_id):
 )
 @user_has_permissions()
 def get_notifications_page_partials_as_json(service_id, message_type=None):
-    return jsonify(_get_notifications_dashboard_partials_data(service_id, message_type))
+    data = _get_notifications_dashboard_data(service_id, message_type)
+    return make_json_updates_response(
+        partial(_render_notifications_dashboard_partials, **data),
+        data["notifications"].items,
+        data["notifications"].prev,
+        data["notifications"].next,
+        data["statistics"],
+        data["service_data_retention_days"],
+        data["cached_search_query_hash"],
+    )
 
 
 def _get_notifications_dashboard_partials_data(service_id, message_type):
+    return _render_notifications_dashboard_partials(**_get_notifications_dashboard_data(service_id, message_type))
+
+
+def _get_notifications_dashboard_data(service_id, message_type):
     page = get_page_from_request()
     if page is None:
         abort(404, f"Invalid page argument ({request.args.get('page')}).")
@@ -301,14 +331,41 @@ def _get_notifications_dashboard_partials_data(service_id, message_type):
     if message_type is not None:
         service_data_retention_days = current_service.get_days_of_retention(message_type)
 
-    notifications = InterruptibleNotifications(
-        service_id=service_id,
-        page=page,
-        template_type=[message_type] if message_type else [],
-        status=filter_args.get("status"),
-        limit_days=service_data_retention_days,
-        to=cached_search_term or search_term,
+    notifications, statistics = fan_out(
+        partial(
+            InterruptibleNotifications,
+            service_id=service_id,
+            page=page,
+            template_type=[message_type] if message_type else [],
+            status=filter_args.get("status"),
+            limit_days=service_data_retention_days,
+            to=cached_search_term or search_term,
+        ),
+        partial(service_api_client.get_service_statistics, service_id, limit_days=service_data_retention_days),
     )
+    return {
+        "service_id": service_id,
+        "message_type": message_type,
+        "page": page,
+        "service_data_retention_days": service_data_retention_days,
+        "search_term": search_term,
+        "cached_search_query_hash": cached_search_query_hash,
+        "notifications": notifications,
+        "statistics": statistics,
+    }
+
+
+def _render_notifications_dashboard_partials(
+    *,
+    service_id,
+    message_type,
+    page,
+    service_data_retention_days,
+    search_term,
+    cached_search_query_hash,
+    notifications,
+    statistics,
+):
     url_args = {
         "message_type": message_type,
         "status": request.args.get("status"),
@@ -331,7 +388,7 @@ def _get_notifications_dashboard_partials_data(service_id, message_type):
             status_filters=get_status_filters(
                 current_service,
                 message_type,
-                service_api_client.get_service_statistics(service_id, limit_days=service_data_retention_days),
+                statistics,
                 search_query=cached_search_query_hash or None,
             ),
         ),
@@ -444,7 +501,12 @@ def inbox(service_id):
 @user_has_permissions("view_activity")
 @service_has_permission("inbound_sms")
 def inbox_updates(service_id):
-    return jsonify(get_inbox_partials(service_id))
+    page = int(request.args.get("page", 1))
+    inbound_messages_data = service_api_client.get_most_recent_inbound_sms(service_id, page=page)
+    return make_json_updates_response(
+        partial(get_inbox_partials, service_id, inbound_messages_data),
+        inbound_messages_data,
+    )
 
 
 @main.route("/services/<uuid:service_id>/inbox.csv")
@@ -477,9 +539,10 @@ def inbox_download(service_id):
     )
 
 
-def get_inbox_partials(service_id):
+def get_inbox_partials(service_id, inbound_messages_data=None):
     page = int(request.args.get("page", 1))
-    inbound_messages_data = service_api_client.get_most_recent_inbound_sms(service_id, page=page)
+    if inbound_messages_data is None:
+        inbound_messages_data = service_api_client.get_most_recent_inbound_sms(service_id, page=page)
     inbound_messages = inbound_messages_data["data"]
     if not inbound_messages:
         inbound_number = current_service.inbound_number
@@ -553,13 +616,7 @@ def get_dashboard_partials_lazy():
     }
 
 
-def get_dashboard_partials():
-    all_statistics = template_statistics_client.get_template_statistics_for_service(current_service.id, limit_days=7)
-    template_statistics = aggregate_template_usage(all_statistics)
-    stats = aggregate_notifications_stats(all_statistics)
-
-    dashboard_totals = get_dashboard_totals(stats)
-
+def get_dashboard_partials(shared_partials):
     return {
         "upcoming": render_template(
             "views/dashboard/_upcoming.html",
@@ -567,6 +624,81 @@ def get_dashboard_partials():
         "inbox": render_template(
             "views/dashboard/_inbox.html",
         ),
+        **shared_partials,
+    }
+
+
+def get_shared_dashboard_partials():
+    """
+    The totals and template statistics are the same for everyone looking at a service’s dashboard, so we keep
+    them in Redis for a few seconds rather than each person’s browser causing them to be fetched and rendered.
+
+    When they’re missing or out of date the first request to notice takes a lock and renders them again. Other
+    requests keep using the out of date ones until it’s done, or wait a moment for the new ones if there aren’t
+    any, so only one of them does the work.
+    """
+    if not redis_client.active:
+        return render_shared_dashboard_partials()
+
+    cache_key = f"service-{current_service.id}-dashboard-partials"
+    lock_key = f"{cache_key}-lock"
+    cached_value = _get_cached_dashboard_partials(cache_key)
+
+    if cached_value and cached_value["fresh_until"] > datetime.now(UTC).timestamp():
+        return cached_value["partials"]
+
+    if not (lock_token := acquire_lock(lock_key, ttl_in_seconds=current_app.config["DASHBOARD_PARTIALS_FRESH_FOR"])):
+        if cached_value:
+            return cached_value["partials"]
+
+        return _wait_for_dashboard_partials(cache_key) or render_shared_dashboard_partials()
+
+    try:
+        shared_partials = render_shared_dashboard_partials()
+
+        redis_client.set(
+            cache_key,
+            json.dumps(
+                {
+                    "fresh_until": datetime.now(UTC).timestamp() + current_app.config["DASHBOARD_PARTIALS_FRESH_FOR"],
+                    "partials": shared_partials,
+                }
+            ),
+            ex=current_app.config["DASHBOARD_PARTIALS_KEEP_FOR"],
+        )
+    finally:
+        release_lock(lock_key, lock_token)
+
+    return shared_partials
+
+
+def _get_cached_dashboard_partials(cache_key):
+    if cached_value := redis_client.get(cache_key):
+        return json.loads(cached_value)
+
+    return None
+
+
+def _wait_for_dashboard_partials(cache_key):
+    waited_until = monotonic() + current_app.config["DASHBOARD_PARTIALS_WAIT_FOR"]
+
+    while monotonic() < waited_until:
+        sleep(0.1)
+
+        if cached_value := _get_cached_dashboard_partials(cache_key):
+            return cached_value["partials"]
+
+    return None
+
+
+def render_shared_dashboard_partials():
+    all_statistics = template_statistics_client.get_template_statistics_for_service(current_service.id, limit_days=7)
+    template_statistics = aggregate_template_usage(all_statistics)
+    stats = aggregate_notifications_stats(all_statistics)
+
+    dashboard_totals = get_dashboard_totals(stats)
+
+    return {
         "totals": render_template(
             "views/dashboard/_totals.html",
             service_id=current_service.id,
@@ -1,8 +1,9 @@
+from functools import partial
+
 from flask import (
     Response,
     abort,
     flash,
-    jsonify,
     redirect,
     render_template,
     request,
@@ -22,8 +23,8 @@ from app.main import json_updates, main
 from app.models.job import Job
 from app.notify_client.job_api_client import JobApiClient
 from app.s3_client.s3_csv_client import s3download
-from app.utils import parse_filter_args, set_status_filters
-from app.utils.csv import generate_notifications_csv
+from app.utils import make_json_updates_response, parse_filter_args, set_status_filters
+from app.utils.csv import generate_notifications_csv, stream_csv
 from app.utils.letters import get_letter_printing_statement, printing_today_or_tomorrow
 from app.utils.user import user_has_permissions
 
@@ -95,7 +96,7 @@ def view_job_csv(service_id, job_id):
         template_type=job.template_type,
     )
     return Response(
-        list(data),
+        stream_csv(data),
         mimetype="text/csv",
         headers={
             "Content-Disposition": 'inline; filename="{} - {}.csv"'.format(
@@ -158,8 +159,16 @@ def cancel_letter_job(service_id, job_id):
 @user_has_permissions()
 def view_job_updates(service_id, job_id):
     job = Job.from_id(job_id, service_id=service_id)
+    filter_args = parse_filter_args(request.args)
+    notifications = job.get_notifications(status=set_status_filters(filter_args))
 
-    return jsonify(**get_job_partials(job))
+    return make_json_updates_response(
+        partial(get_job_partials, job, notifications),
+        job._dict,
+        notifications.items,
+        notifications.next,
+        poll_interval=job.poll_interval,
+    )
 
 
 def _get_job_counts(job):
@@ -213,10 +222,11 @@ def _get_job_counts(job):
     ]
 
 
-def get_job_partials(job):
+def get_job_partials(job, notifications=None):
     filter_args = parse_filter_args(request.args)
     filter_args["status"] = set_status_filters(filter_args)
-    notifications = job.get_notifications(status=filter_args["status"])
+    if notifications is None:
+        notifications = job.get_notifications(status=filter_args["status"])
     if job.template_type == "letter":
         counts = render_template(
             "partials/jobs/count-letters.html",
@@ -33,7 +33,7 @@ from app.utils import (
     parse_filter_args,
     set_status_filters,
 )
-from app.utils.csv import generate_notifications_csv
+from app.utils.csv import generate_notifications_csv, stream_csv
 from app.utils.letters import get_letter_validation_error
 from app.utils.templates import get_template
 from app.utils.user import user_has_permissions
@@ -239,7 +239,7 @@ def download_notifications_csv(service_id):
         limit_days=service_data_retention_days,
     )
     return Response(
-        list(data),
+        stream_csv(data),
         mimetype="text/csv",
         headers={
             "Content-Disposition": 'inline; filename="{} - {} - {} report.csv"'.format(
@@ -524,7 +524,7 @@ def clear_cache():
         "template": [
             "service-????????-????-????-????-????????????-templates",
             "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-version-*",
-            "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-versions",
+            "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-versions*",
             "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-page-count",
             "service-????????-????-????-????-????????????-template-precompiled",
         ],
@@ -1,4 +1,4 @@
-from flask import abort, jsonify, render_template, send_file, url_for
+from flask import Response, abort, current_app, jsonify, render_template, url_for
 from notifications_python_client.errors import HTTPError
 from werkzeug.utils import redirect
 
@@ -113,13 +113,19 @@ def report_request_download(service_id, report_request_id):
     if report_request.status != REPORT_REQUEST_STORED:
         abort(404)
 
+    if current_app.config["REPORT_REQUEST_DOWNLOAD_VIA_PRESIGNED_URL"]:
+        return redirect(ReportRequest.get_download_url(report_request_id))
+
     file_contents = ReportRequest.download(report_request_id)
 
-    return send_file(
-        path_or_file=file_contents,
-        download_name=f"{report_request_id}.csv",
-        as_attachment=True,
+    response = Response(
+        file_contents.iter_chunks(current_app.config["REPORT_REQUEST_DOWNLOAD_CHUNK_SIZE"]),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={report_request_id}.csv"},
     )
+    # stop reading from S3 if the download doesn't get to the end
+    response.call_on_close(file_contents.close)
+    return response
 
 
 # this endpoint is used by Javascript to poll for changes every N seconds
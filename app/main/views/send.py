@@ -1,4 +1,7 @@
 import itertools
+import json
+from datetime import timedelta
+from functools import partial
 from string import ascii_uppercase
 
 from flask import (
@@ -13,6 +16,7 @@ from flask import (
 from notifications_python_client.errors import HTTPError
 from notifications_utils import SMS_CHAR_COUNT_LIMIT
 from notifications_utils.insensitive_dict import InsensitiveDict, InsensitiveSet
+from notifications_utils.json import RelaxedContainerJSONEncoder as RCJSONEncoder
 from notifications_utils.recipient_validation.phone_number import PhoneNumber
 from notifications_utils.recipient_validation.postal_address import PostalAddress, address_lines_1_to_7_keys
 from notifications_utils.recipients import RecipientCSV, first_column_headings
@@ -26,6 +30,7 @@ from app import (
     service_api_client,
     template_preview_client,
 )
+from app.extensions import redis_client
 from app.main import main, no_cookie
 from app.main.forms import (
     ChooseTimeForm,
@@ -36,6 +41,7 @@ from app.main.forms import (
 )
 from app.models.contact_list import ContactList, ContactLists
 from app.models.user import Users
+from app.notify_client import fan_out
 from app.s3_client.s3_csv_client import (
     get_csv_metadata,
     s3download,
@@ -43,11 +49,15 @@ from app.s3_client.s3_csv_client import (
     set_metadata_on_csv_upload,
 )
 from app.utils import PermanentRedirect, should_skip_template_page
-from app.utils.csv import Spreadsheet, get_errors_for_csv
+from app.utils.csv import RowErrorSummary, Spreadsheet, get_errors_for_csv
 from app.utils.user import user_has_permissions
 
 letter_address_columns = InsensitiveSet(column.replace("_", " ") for column in address_lines_1_to_7_keys)
 
+# Long enough to cover someone looking through the letters on the check page, short enough that we don’t keep
+# personalisation from an upload around for much longer than the upload itself is useful
+CHECKED_UPLOAD_CACHE_TTL = int(timedelta(hours=1).total_seconds())
+
 
 def get_example_csv_fields(column_headers, use_example_as_example, submitted_fields):
     if use_example_as_example:
@@ -560,7 +570,7 @@ def send_from_contact_list(service_id, template_id, contact_list_id):
     )
 
 
-def _check_messages(service_id, template_id, upload_id, preview_row, emergency_contact=False):
+def _check_job_does_not_exist(service_id, template_id, upload_id):
     try:
         # The happy path is that the job doesn’t already exist, so the
         # API will return a 404 and the client will raise HTTPError.
@@ -574,24 +584,48 @@ def _check_messages(service_id, template_id, upload_id, preview_row, emergency_c
     except HTTPError as e:
         if e.status_code != 404:
             raise
-    contents = s3download(service_id, upload_id)
 
-    template = current_service.get_template_with_user_permission_or_403(
-        template_id,
-        current_user,
-        show_recipient=True,
-        letter_preview_url=url_for(
-            "no_cookie.check_messages_preview",
-            service_id=service_id,
-            template_id=template_id,
-            upload_id=upload_id,
-            filetype="png",
-            row_index=preview_row,
+
+def _check_messages(service_id, template_id, upload_id, preview_row, emergency_contact=False):
+    # Neither of these depend on each other, so fetch them at the same time. If the job exists already the redirect
+    # is raised in preference to the user not being allowed to use the template because it comes first.
+    _, template = fan_out(
+        partial(_check_job_does_not_exist, service_id, template_id, upload_id),
+        partial(
+            current_service.get_template_with_user_permission_or_403,
+            template_id,
+            current_user,
+            show_recipient=True,
+            letter_preview_url=url_for(
+                "no_cookie.check_messages_preview",
+                service_id=service_id,
+                template_id=template_id,
+                upload_id=upload_id,
+                filetype="png",
+                row_index=preview_row,
+            ),
         ),
     )
 
-    remaining_messages = current_service.remaining_messages(template.template_type)
-    remaining_international_sms_messages = current_service.remaining_messages("international_sms")
+    # only read the upload once we know we’re going to show it
+    contents, metadata = fan_out(
+        partial(s3download, service_id, upload_id),
+        partial(get_csv_metadata, service_id, upload_id),
+    )
+    original_file_name = metadata.get("original_file_name", "")
+
+    remaining_messages, remaining_international_sms_messages, sent_previously, guestlist_users = fan_out(
+        partial(current_service.remaining_messages, template.template_type),
+        partial(current_service.remaining_messages, "international_sms"),
+        partial(
+            job_api_client.has_sent_previously,
+            service_id,
+            template.id,
+            template.get_raw("version"),
+            original_file_name,
+        ),
+        partial(Users, service_id) if current_service.trial_mode else lambda: None,
+    )
 
     if template.template_type == "email":
         template.reply_to = get_email_reply_to_address_from_session()
@@ -604,8 +638,8 @@ def _check_messages(service_id, template_id, upload_id, preview_row, emergency_c
         max_initial_rows_shown=50,
         max_errors_shown=50,
         guestlist=(
-            itertools.chain.from_iterable([user.mobile_number, user.email_address] for user in Users(service_id))
-            if current_service.trial_mode
+            itertools.chain.from_iterable([user.mobile_number, user.email_address] for user in guestlist_users)
+            if guestlist_users is not None
             else None
         ),
         remaining_messages=remaining_messages,
@@ -630,12 +664,18 @@ def _check_messages(service_id, template_id, upload_id, preview_row, emergency_c
         template.values = recipients[preview_row - 2].recipient_and_personalisation
     elif preview_row > 2:
         abort(404)
-    original_file_name = get_csv_metadata(service_id, upload_id).get("original_file_name", "")
+
+    if template.template_type == "letter":
+        _cache_checked_upload(service_id, upload_id, template, recipients, preview_row)
+
+    row_error_summary = RowErrorSummary(recipients)
+
     return {
         "recipients": recipients,
         "template": template,
         "errors": recipients.has_errors,
-        "row_errors": get_errors_for_csv(recipients, template.template_type),
+        "row_errors": get_errors_for_csv(recipients, template.template_type, row_error_summary),
+        "row_error_summary": row_error_summary,
         "count_of_recipients": len(recipients),
         "count_of_displayed_recipients": len(list(recipients.displayed_rows)),
         "original_file_name": original_file_name,
@@ -653,14 +693,59 @@ def _check_messages(service_id, template_id, upload_id, preview_row, emergency_c
         ),
         "first_recipient_column": recipients.recipient_column_headers[0],
         "preview_row": preview_row,
-        "sent_previously": job_api_client.has_sent_previously(
-            service_id, template.id, template.get_raw("version"), original_file_name
-        ),
+        "sent_previously": sent_previously,
         "letter_min_address_lines": PostalAddress.MIN_LINES,
         "letter_max_address_lines": PostalAddress.MAX_LINES,
     }
 
 
+def _get_checked_upload_cache_key(service_id, upload_id, template):
+    return (
+        f"service-{service_id}-upload-{upload_id}-template-{template.id}-version-{template.get_raw('version')}-checked"
+    )
+
+
+def _cache_checked_upload(service_id, upload_id, template, recipients, preview_row):
+    """
+    Store what we learnt from parsing and validating the upload, so that the letter previews on the check page
+    don’t need to download and parse the whole file again for every page of every row they show.
+
+    Only the rows someone can navigate to from the check page are stored, so the size of the cache entry doesn’t
+    grow with the size of the upload.
+    """
+    rows = {str(row.index + 2): row.recipient_and_personalisation for row in recipients.displayed_rows}
+
+    if preview_row < len(recipients) + 2:
+        rows[str(preview_row)] = recipients[preview_row - 2].recipient_and_personalisation
+
+    redis_client.set(
+        _get_checked_upload_cache_key(service_id, upload_id, template),
+        RCJSONEncoder().encode({"count_of_recipients": len(recipients), "rows": rows}),
+        ex=CHECKED_UPLOAD_CACHE_TTL,
+    )
+
+
+def _get_template_for_checked_upload_row(service_id, template_id, upload_id, preview_row):
+    template = current_service.get_template_with_user_permission_or_403(template_id, current_user, show_recipient=True)
+
+    if template.template_type != "letter":
+        return None
+
+    if not (cached_upload := redis_client.get(_get_checked_upload_cache_key(service_id, upload_id, template))):
+        return None
+
+    cached_upload = json.loads(cached_upload)
+
+    if preview_row < 2 or (preview_row > 2 and preview_row >= cached_upload["count_of_recipients"] + 2):
+        abort(404)
+
+    if str(preview_row) not in cached_upload["rows"]:
+        return None
+
+    template.values = cached_upload["rows"][str(preview_row)]
+    return template
+
+
 @main.route("/services/<uuid:service_id>/<uuid:template_id>/check/<uuid:upload_id>", methods=["GET"])
 @main.route(
     "/services/<uuid:service_id>/<uuid:template_id>/check/<uuid:upload_id>/row-<int:row_index>", methods=["GET"]
@@ -717,7 +802,11 @@ def check_messages_preview(service_id, template_id, upload_id, filetype, row_ind
     if filetype == "png":
         page = request.args.get("page", 1)
 
-    template = _check_messages(service_id, template_id, upload_id, row_index)["template"]
+    template = _get_template_for_checked_upload_row(service_id, template_id, upload_id, row_index)
+
+    if template is None:
+        template = _check_messages(service_id, template_id, upload_id, row_index)["template"]
+
     return template_preview_client.get_preview_for_templated_letter(
         db_template=template._template,
         filetype=filetype,
@@ -10,10 +10,12 @@ from flask import (
     abort,
     current_app,
     flash,
+    get_flashed_messages,
     jsonify,
     redirect,
     render_template,
     request,
+    stream_template,
     url_for,
 )
 from markupsafe import Markup
@@ -58,6 +60,7 @@ from app.main.forms import (
 from app.main.views.send import get_sender_details
 from app.models.service import Service
 from app.models.template_list import InterruptibleUserTemplateList, InterruptibleUserTemplateLists, TemplateList
+from app.notify_client import fan_out
 from app.s3_client.s3_letter_upload_client import (
     backup_original_letter_to_s3,
     get_attachment_pdf_and_metadata,
@@ -65,6 +68,7 @@ from app.s3_client.s3_letter_upload_client import (
     upload_letter_attachment_to_s3,
     upload_letter_to_s3,
 )
+from app.template_previews import get_template_preview_client
 from app.utils import (
     should_skip_template_page,
 )
@@ -73,6 +77,7 @@ from app.utils.letters import (
     get_letter_validation_error,
 )
 from app.utils.pagination import generate_optional_previous_and_next_dicts, get_page_from_request
+from app.utils.sms_fragment_counting import get_sms_fragment_counting_rules
 from app.utils.templates import TemplateChange, TemplatedLetterImageTemplate, get_template
 from app.utils.user import user_has_permissions
 
@@ -154,12 +159,9 @@ def choose_template(service_id, template_type="all", template_folder_id=None):
         service=current_service, template_type=template_type, template_folder_id=template_folder_id, user=current_user
     )
 
-    all_template_folders = InterruptibleUserTemplateList(
-        service=current_service, user=current_user
-    ).all_template_folders
     option_hints = {template_folder_id: "current folder"}
     templates_and_folders_form = TemplateAndFoldersSelectionForm(
-        all_template_folders=all_template_folders,
+        user_template_folder_view=template_list.folder_view,
         template_list=template_list,
         template_type=template_type,
         available_template_types=current_service.available_template_types,
@@ -426,7 +428,12 @@ def choose_template_to_copy(
         )
 
     else:
-        return render_template(
+        # Each service is listed as soon as its templates arrive, so send the page as it’s rendered rather than
+        # waiting for all of them. The session can’t change once the page has started, so take any flash messages
+        # out of it first.
+        get_flashed_messages()
+
+        return stream_template(
             "views/templates/copy.html",
             services_templates_and_folders=InterruptibleUserTemplateLists(current_user),
             _search_form=SearchTemplatesForm(current_service.api_keys),
@@ -686,6 +693,7 @@ def add_service_template(service_id, template_type, template_folder_id=None):
         template_folder_id=template_folder_id,
         heading_action="New",
         back_link=url_for("main.choose_template", service_id=current_service.id, template_folder_id=template_folder_id),
+        sms_fragment_counting_rules=get_sms_fragment_counting_rules(),
         error_summary_enabled=True,
     )
 
@@ -829,6 +837,7 @@ def edit_service_template(service_id, template_id, language=None):  # noqa
         letter_languages=template.get_raw("letter_languages"),
         language_options=LetterLanguageOptions,
         back_link=url_for("main.view_template", service_id=current_service.id, template_id=template.id),
+        sms_fragment_counting_rules=get_sms_fragment_counting_rules(),
         error_summary_enabled=True,
     )
 
@@ -949,17 +958,34 @@ def view_template_versions(service_id, template_id):
     page = get_page_from_request() or 1
     page_size = 25
 
-    template_data = service_api_client.get_service_template_versions(service_id, template_id)["data"]
-    num_pages = math.ceil(len(template_data) / page_size)
+    response = service_api_client.get_service_template_versions(service_id, template_id, page=page, page_size=page_size)
+    num_pages = math.ceil(response["total"] / page_size)
 
     if page > num_pages:
         return redirect(
             url_for(".view_template_versions", service_id=service_id, template_id=template_id, page=num_pages)
         )
 
-    start_offset = (page - 1) * page_size
-    end_offset = start_offset + page_size
-    templates = template_data[start_offset:end_offset]
+    versions = [
+        get_template(
+            template,
+            current_service,
+            letter_preview_url=url_for(
+                "no_cookie.view_letter_template_version_preview",
+                service_id=service_id,
+                template_id=template_id,
+                version=template["version"],
+                filetype="png",
+            ),
+        )
+        for template in response["data"]
+    ]
+
+    # rendering each letter needs its page count, so get them all at once rather than one after another
+    if letter_versions := [version for version in versions if isinstance(version, TemplatedLetterImageTemplate)]:
+        # make the client here so that every green thread shares it, rather than each making its own
+        get_template_preview_client()
+        fan_out(*(partial(getattr, version, "all_page_counts") for version in letter_versions))
 
     previous_page, next_page = generate_optional_previous_and_next_dicts(
         ".view_template_versions",
@@ -972,20 +998,7 @@ def view_template_versions(service_id, template_id):
     return render_template(
         "views/templates/choose_history.html",
         template_id=template_id,
-        versions=[
-            get_template(
-                template,
-                current_service,
-                letter_preview_url=url_for(
-                    "no_cookie.view_letter_template_version_preview",
-                    service_id=service_id,
-                    template_id=template_id,
-                    version=template["version"],
-                    filetype="png",
-                ),
-            )
-            for template in templates
-        ],
+        versions=versions,
         previous_page=previous_page,
         next_page=next_page,
     )
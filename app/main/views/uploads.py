@@ -35,11 +35,11 @@ from app.s3_client.s3_letter_upload_client import (
     LetterNotFoundError,
     backup_original_letter_to_s3,
     get_letter_metadata,
-    get_letter_pdf_and_metadata,
+    get_letter_pdf_page,
     get_transient_letter_file_location,
     upload_letter_to_s3,
 )
-from app.utils.csv import Spreadsheet, get_errors_for_csv
+from app.utils.csv import RowErrorSummary, Spreadsheet, get_errors_for_csv
 from app.utils.letters import (
     get_letter_printing_statement,
     get_letter_validation_error,
@@ -274,13 +274,18 @@ def view_letter_upload_as_preview(service_id, file_id):
     except ValueError:
         abort(400)
 
-    pdf_file, metadata = get_letter_pdf_and_metadata(service_id, file_id)
+    metadata = get_letter_metadata(service_id, file_id)
     invalid_pages = json.loads(metadata.get("invalid_pages", "[]"))
 
+    try:
+        pdf_page = get_letter_pdf_page(service_id, file_id, page)
+    except IndexError:
+        abort(404)
+
     if metadata.get("message") == "content-outside-printable-area" and page in invalid_pages:
-        return template_preview_client.get_png_for_invalid_pdf_page(pdf_file, page)
+        return template_preview_client.get_png_for_invalid_single_page_pdf(pdf_page, page)
     else:
-        return template_preview_client.get_png_for_valid_pdf_page(pdf_file, page)
+        return template_preview_client.get_png_for_valid_single_page_pdf(pdf_page, page)
 
 
 @main.route("/services/<uuid:service_id>/upload-letter/send/<uuid:file_id>", methods=["POST"])
@@ -414,12 +419,15 @@ def check_contact_list(service_id, upload_id):
             allowed_file_extensions=Spreadsheet.ALLOWED_FILE_EXTENSIONS,
         )
 
-    if row_errors := get_errors_for_csv(recipients, template_type):
+    row_error_summary = RowErrorSummary(recipients)
+
+    if row_errors := get_errors_for_csv(recipients, template_type, row_error_summary):
         return render_template(
             "views/uploads/contact-list/row-errors.html",
             recipients=recipients,
             original_file_name=original_file_name,
             row_errors=row_errors,
+            row_error_summary=row_error_summary,
             form=form,
             allowed_file_extensions=Spreadsheet.ALLOWED_FILE_EXTENSIONS,
         )
@@ -11,6 +11,7 @@ from app.models import JSONModel, ModelList
 from app.models.job import PaginatedJobsAndScheduledJobs
 from app.notify_client.contact_list_api_client import contact_list_api_client
 from app.s3_client.s3_csv_client import (
+    copy_csv_upload,
     get_csv_metadata,
     s3download,
     s3upload,
@@ -84,18 +85,12 @@ class ContactList(JSONModel):
         )
 
     def copy_to_uploads(self):
-        metadata = self.get_metadata(self.service_id, self.id)
-        new_upload_id = s3upload(
+        return copy_csv_upload(
             self.service_id,
-            self.contents,
-            current_app.config["AWS_REGION"],
-        )
-        set_metadata_on_csv_upload(
-            self.service_id,
-            new_upload_id,
-            **metadata,
+            self.id,
+            from_bucket=self.get_bucket_name(),
+            **self.get_metadata(self.service_id, self.id),
         )
-        return new_upload_id
 
     @classmethod
     def create(cls, service_id, upload_id):
@@ -14,7 +14,7 @@ from app.models.notification import Notifications
 from app.notify_client.job_api_client import JobApiClient, job_api_client
 from app.notify_client.notification_api_client import notification_api_client
 from app.notify_client.service_api_client import service_api_client
-from app.utils import set_status_filters
+from app.utils import STOP_POLLING, set_status_filters
 from app.utils.letters import get_letter_printing_statement
 from app.utils.time import is_less_than_days_ago
 
@@ -35,6 +35,9 @@ class Job(JSONModel):
 
     __sort_attribute__ = "original_file_name"
 
+    MIN_POLL_INTERVAL = 2
+    MAX_POLL_INTERVAL = 60
+
     @classmethod
     def from_id(cls, job_id, service_id):
         return cls(job_api_client.get_job(service_id, job_id)["data"])
@@ -106,6 +109,25 @@ class Job(JSONModel):
         # change to status == FINISHED_ALL_NOTIFICATIONS_CREATED_JOB_STATUS once api support rolled out
         return self.notification_count == self.notifications_sent
 
+    @property
+    def poll_interval(self):
+        """
+        How long a page showing this job should wait before checking if it’s changed, in seconds
+        """
+        if self.cancelled or self.finished_processing:
+            return STOP_POLLING
+
+        if self.scheduled:
+            # nothing happens until the job is due to start, but keep the time left until then up to date
+            seconds_until_scheduled = (self.scheduled_for - datetime.now(UTC)).total_seconds()
+            return int(min(max(seconds_until_scheduled, self.MIN_POLL_INTERVAL), self.MAX_POLL_INTERVAL))
+
+        if not self.still_processing and self.template_type == "letter":
+            # letters take days to be delivered, so there’s no rush to find out
+            return self.MAX_POLL_INTERVAL
+
+        return None
+
     @property
     def awaiting_processing_or_recently_processed(self):
         if not self.processing_started:
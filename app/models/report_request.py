@@ -2,11 +2,10 @@ from datetime import datetime
 from typing import Any
 
 from flask import current_app
-from notifications_utils.s3 import s3download
 
 from app import report_request_api_client
 from app.models import JSONModel
-from app.s3_client import check_s3_object_exists
+from app.s3_client import check_s3_object_exists, get_s3_object_body, get_s3_presigned_url
 
 
 class ReportRequest(JSONModel):
@@ -31,11 +30,21 @@ class ReportRequest(JSONModel):
 
     @staticmethod
     def download(report_request_id):
-        return s3download(
+        return get_s3_object_body(
             bucket_name=ReportRequest.get_bucket_name(),
             filename=f"notifications_report/{report_request_id}.csv",
         )
 
+    @staticmethod
+    def get_download_url(report_request_id):
+        return get_s3_presigned_url(
+            bucket_name=ReportRequest.get_bucket_name(),
+            filename=f"notifications_report/{report_request_id}.csv",
+            expires_in=current_app.config["REPORT_REQUEST_PRESIGNED_URL_EXPIRY_SECONDS"],
+            ResponseContentType="text/csv; charset=utf-8",
+            ResponseContentDisposition=f"attachment; filename={report_request_id}.csv",
+        )
+
     @staticmethod
     def exists_in_s3(report_request_id):
         return check_s3_object_exists(
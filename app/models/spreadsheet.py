@@ -1,7 +1,10 @@
 import csv
 import logging
+from collections import deque
+from collections.abc import Iterator
 from io import BytesIO, StringIO
-from itertools import chain, compress, count, repeat
+from itertools import compress
+from operator import attrgetter
 from os import path
 from time import sleep
 from typing import IO, Self, final
@@ -11,8 +14,9 @@ import openpyxl.reader.excel
 import pyexcel
 from notifications_utils.eventlet import greenlet_thread_time_ns, greenlet_thread_time_ns_max_continuous
 from notifications_utils.interruptible_io import InterruptibleIOZipFile
-from openpyxl.utils import get_column_letter as openpyxl_get_column_letter
-from openpyxl.worksheet.dimensions import DimensionHolder as openpyxl_DimensionHolder
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet as openpyxl_ReadOnlyWorksheet
+from openpyxl.worksheet._reader import WorkSheetParser as openpyxl_WorkSheetParser
+from openpyxl.worksheet.cell_range import CellRange as openpyxl_CellRange
 
 # monkeypatch the reference openpyxl will use for ZipFile
 openpyxl.reader.excel.ZipFile = InterruptibleIOZipFile  # type: ignore[attr-defined]
@@ -90,181 +94,283 @@ class Spreadsheet:
         return cls(rows=rows, filename=filename, row_limit=row_limit)
 
     @staticmethod
-    def _openpyxl_dimension_visible(dimensions: openpyxl_DimensionHolder, index: int | str) -> bool:
-        # test for containment before attempting access to avoid unnecessary defaultdict allocation
-        return index not in dimensions or dimensions[index].hidden is False
+    def _openpyxl_attribute_true(value: str | None) -> bool:
+        # the same as openpyxl's Bool descriptor would make of an xml attribute
+        return value not in (None, "", "false", "f", "0")
+
+    @staticmethod
+    def _openpyxl_parser(sheet: openpyxl_ReadOnlyWorksheet, source: IO[bytes]) -> openpyxl_WorkSheetParser:
+        # APIFRAGILE on openpyxl's internal worksheet parser, set up the same way ReadOnlyWorksheet does it
+        return openpyxl_WorkSheetParser(
+            source,
+            sheet._shared_strings,  # type: ignore[attr-defined]
+            data_only=True,
+            epoch=sheet.parent.epoch,
+            date_formats=sheet.parent._date_formats,  # type: ignore[attr-defined]
+            timedelta_formats=sheet.parent._timedelta_formats,  # type: ignore[attr-defined]
+            rich_text=False,
+        )
 
     @classmethod
-    def _from_xlsx(  # noqa C901 is bunk
+    def _iter_openpyxl_parser_rows(
+        cls, parser: openpyxl_WorkSheetParser, min_max_row: int = 0
+    ) -> Iterator[tuple[int, bool, list[dict]]]:
+        """
+        Yields the index, visibility and parsed cells of every row up to the last one in the sheet (or
+        `min_max_row` if that's further), including rows missing from the file, which are empty and can't be hidden.
+        """
+        next_row_index = 1
+        for row_index, cells in parser.parse():
+            # we only ever need the dimensions of the row we're looking at, so don't let them pile up
+            row_attrs = parser.row_dimensions.pop(str(row_index), {})
+
+            for missing_row_index in range(next_row_index, row_index):
+                yield missing_row_index, True, []
+
+            yield row_index, not cls._openpyxl_attribute_true(row_attrs.get("hidden")), cells
+            next_row_index = row_index + 1
+
+        for missing_row_index in range(next_row_index, min_max_row + 1):
+            yield missing_row_index, True, []
+
+    @classmethod
+    def _scan_xlsx_sheet(  # noqa C901 is bunk
         cls,
-        file_content: IO[bytes],
-        filename: str,
+        sheet: openpyxl_ReadOnlyWorksheet,
         row_limit: int | None,
         column_limit_from_header: bool,
         absolute_column_limit: int,
         min_column_limit: int,
-    ) -> Self:
+    ) -> tuple[int, int, int, tuple[bool, ...], list[openpyxl_CellRange]]:
         """
-        Extracts all non-hidden content from the first non-hidden sheet of an xlsx file in a way that is
-        comparatively efficient and with reduced blocking.
+        Makes a pass through the sheet's xml to find which rows and columns are visible, the bounds of the content
+        we'll keep and which cells are merged, only ever holding on to one row at a time.
+
+        Returns the first visible row (our header row), the bottom-most row and rightmost column we need to read,
+        which of the columns up to the column limit are visible, and the merged cell ranges within those bounds.
         """
+        hidden_column_ranges: list[tuple[int, int]] = []
+        column_limit = absolute_column_limit
+        visible_column_map: tuple[bool, ...] = ()
 
-        thread_times = {}
-        thread_time_start = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
+        def column_visible(col_index: int) -> bool:
+            return not any(min_col <= col_index <= max_col for min_col, max_col in hidden_column_ranges)
 
-        book = openpyxl.load_workbook(
-            file_content,
-            data_only=True,
-            keep_links=False,
-            rich_text=False,
-            # "read only" mode is cut-down in multiple ways and doesn't even parse hidden row/column
-            # or merged cell information (which we want)
-            read_only=False,
-        )
-        sheet = next((sheet for sheet in book.worksheets if sheet.sheet_state != "hidden"), None)
-        if not sheet:
-            return cls.from_rows(iter(()), filename)  # empty spreadsheet
+        def read_header(parser: openpyxl_WorkSheetParser, header_cells: list[dict]) -> None:
+            nonlocal column_limit, visible_column_map
 
-        thread_time_end = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
-        thread_times["load_workbook"] = {
-            "elapsed_since_prev": thread_time_end - thread_time_start,
-            "max_cont_running": greenlet_thread_time_ns_max_continuous() or 0,  # returns None if not using eventlet
-        }
-        thread_time_start = thread_time_end
-
-        # yield to any event loop or GIL
-        sleep(0)
+            # <cols> comes before <sheetData>, so we know about every column by the time we see any rows
+            hidden_column_ranges.extend(
+                (int(attrs["min"]), int(attrs.get("max", attrs["min"])))
+                for attrs in parser.column_dimensions.values()
+                if cls._openpyxl_attribute_true(attrs.get("hidden"))
+            )
 
-        # the first_visible_row will be our header row (1-based index)
-        try:
-            first_visible_row = next(
-                # shouldn't be possible to loop infinitely as long as sheet's row_dimensions are finite
-                i
-                for i in (range(1, row_limit + 1) if row_limit is not None else count(1))
-                # test for containment before attempting access to avoid unnecessary defaultdict allocation
-                if cls._openpyxl_dimension_visible(sheet.row_dimensions, i)
+            # find the rightmost nonempty, non-hidden header cell - 1-based index
+            header_last_nonempty_column = next(
+                (
+                    cell["column"]
+                    for cell in reversed(header_cells)
+                    if column_visible(cell["column"]) and str("" if cell["value"] is None else cell["value"]).strip()
+                ),
+                0,
             )
-        except StopIteration:
-            raise cls.AllRowsHiddenError("Didn't find a non-hidden row before row limit reached") from None
 
-        thread_time_end = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
-        thread_times["calc_first_visible_row"] = {
-            "elapsed_since_prev": thread_time_end - thread_time_start,
-            "max_cont_running": greenlet_thread_time_ns_max_continuous() or 0,  # returns None if not using eventlet
-        }
-        thread_time_start = thread_time_end
+            if column_limit_from_header:
+                if header_last_nonempty_column > absolute_column_limit:
+                    raise cls.TooManyColumnsError(
+                        f"Last non-empty header column ({header_last_nonempty_column}) "
+                        f"is beyond absolute limit of {absolute_column_limit}"
+                    )
 
-        # yield to any event loop or GIL
-        sleep(0)
+                column_limit = max(header_last_nonempty_column or 1, min_column_limit)
 
-        # find the rightmost nonempty, non-hidden header cell - 1-based index
-        header_last_nonempty_column = 0
-        # items reversed in the hopes we encounter the rightmost first, meaning cheap early conditions can
-        # exclude most cells without more expensive checks
-        for (row_index, col_index), cell in reversed(sheet._cells.items()):  # APIFRAGILE on sheet._cells
-            if row_index == first_visible_row and header_last_nonempty_column < col_index:
-                col_letter = openpyxl_get_column_letter(col_index)
-                if (cls._openpyxl_dimension_visible(sheet.column_dimensions, col_letter)) and str(
-                    "" if cell.value is None else cell.value
-                ).strip():
-                    header_last_nonempty_column = col_index
+            # cheaper to access than the hidden column ranges, can co-iterate through it alongside row
+            visible_column_map = tuple(column_visible(col_index) for col_index in range(1, column_limit + 1))
 
-        thread_time_end = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
-        thread_times["calc_header_last_nonempty_column"] = {
-            "elapsed_since_prev": thread_time_end - thread_time_start,
-            "max_cont_running": greenlet_thread_time_ns_max_continuous() or 0,  # returns None if not using eventlet
-        }
-        thread_time_start = thread_time_end
+        def check_first_visible_row(row_index: int) -> None:
+            if row_limit is not None and row_index > row_limit:
+                raise cls.AllRowsHiddenError("Didn't find a non-hidden row before row limit reached")
 
-        # yield to any event loop or GIL
-        sleep(0)
+        # the first_visible_row will be our header row (1-based index). if every row in the file is hidden, it's
+        # the one after the last of them
+        first_visible_row = None
+        first_visible_row_candidate = 1
 
-        column_limit = absolute_column_limit
+        # find the rightmost and bottom-most non-empty cells that column_limit (and row_limit) wouldn't exclude
+        # so we can perhaps further reduce the bounds we have to iterate through - both 1-based indexes
+        max_col_within_limit = max_row_within_limit = 1
 
-        if column_limit_from_header:
-            if header_last_nonempty_column > absolute_column_limit:
-                raise cls.TooManyColumnsError(
-                    f"Last non-empty header column ({header_last_nonempty_column}) "
-                    f"is beyond absolute limit of {absolute_column_limit}"
-                )
-
-            column_limit = max(header_last_nonempty_column or 1, min_column_limit)
-
-        # cheaper to access than sheet.column_dimensions, can co-iterate through it alongside row
-        visible_column_map = tuple(
-            cls._openpyxl_dimension_visible(sheet.column_dimensions, col_letter)
-            for col_letter in (openpyxl_get_column_letter(col_index) for col_index in range(1, column_limit + 1))
-        )
+        # APIFRAGILE on ReadOnlyWorksheet._get_source
+        with sheet._get_source() as source:  # type: ignore[attr-defined]
+            parser = cls._openpyxl_parser(sheet, source)
+
+            for i, (row_index, row_visible, cells) in enumerate(cls._iter_openpyxl_parser_rows(parser), 1):
+                if not i % cls.AS_CSV_LOOP_INTERRUPTIBLE_EVERY:
+                    # yield to any event loop or GIL
+                    sleep(0)
+
+                if not row_visible:
+                    if first_visible_row is None:
+                        first_visible_row_candidate = row_index + 1
+                        # fail early rather than go through millions of hidden rows
+                        check_first_visible_row(first_visible_row_candidate)
+                    continue
+
+                if first_visible_row is None:
+                    first_visible_row = row_index
+                    check_first_visible_row(first_visible_row)
+                    read_header(parser, cells)
+
+                for cell in cells:
+                    col_index = cell["column"]
+                    if (
+                        col_index <= column_limit
+                        # cheap early filter
+                        and (row_index > max_row_within_limit or col_index > max_col_within_limit)
+                        and visible_column_map[col_index - 1]
+                        and str("" if cell["value"] is None else cell["value"]).strip()
+                    ):
+                        if row_limit is not None and row_index > row_limit:
+                            # fail earlier than we otherwise would to save pointless work
+                            raise cls.TooManyRowsError(f"Exceeded row limit of {row_limit}")
+
+                        max_row_within_limit = max(max_row_within_limit, row_index)
+                        max_col_within_limit = max(max_col_within_limit, col_index)
+
+            if first_visible_row is None:
+                first_visible_row = first_visible_row_candidate
+                check_first_visible_row(first_visible_row)
+                read_header(parser, [])
+
+        # <mergeCells> comes after <sheetData>, so we only know about them once we've been through every row
+        max_range = openpyxl_CellRange(min_row=1, min_col=1, max_row=max_row_within_limit, max_col=max_col_within_limit)
+        merged_ranges = [
+            range_.intersection(max_range)
+            for range_ in (
+                openpyxl_CellRange(merge_cell.ref)
+                # APIFRAGILE on WorkSheetParser.merged_cells
+                for merge_cell in (parser.merged_cells.mergeCell if parser.merged_cells else ())
+            )
+            if not range_.isdisjoint(max_range)
+        ]
 
-        thread_time_end = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
-        thread_times["calc_visible_column_map"] = {
-            "elapsed_since_prev": thread_time_end - thread_time_start,
-            "max_cont_running": greenlet_thread_time_ns_max_continuous() or 0,  # returns None if not using eventlet
-        }
-        thread_time_start = thread_time_end
+        return first_visible_row, max_row_within_limit, max_col_within_limit, visible_column_map, merged_ranges
 
-        # yield to any event loop or GIL
-        sleep(0)
+    @classmethod
+    def _iter_xlsx_sheet_values(
+        cls,
+        book: openpyxl.Workbook,
+        sheet: openpyxl_ReadOnlyWorksheet,
+        first_visible_row: int,
+        max_row: int,
+        max_col: int,
+        visible_column_map: tuple[bool, ...],
+        merged_ranges: list[openpyxl_CellRange],
+    ) -> Iterator[list]:
+        """
+        Streams the values of the visible cells in each visible row, giving merged cells the value of the top left
+        cell of their range.
+        """
+        # a merged range's top left cell always comes before the rest of it, so we can pick up its value on the way
+        pending_merged_ranges = deque(sorted(merged_ranges, key=attrgetter("min_row")))
+        current_merged_ranges: list[tuple[openpyxl_CellRange, object]] = []
 
-        # now we have a column_limit of some description, in another pass find the rightmost and bottom-most
-        # non-empty cells that column_limit (and row_limit) wouldn't exclude so we can perhaps further reduce
-        # the bounds we have to iterate through - both 1-based indexes
-        max_col_within_limit = max_row_within_limit = 1
-        # why items reversed? i'm banking on the dict being populated in the order the parser encountered
-        # the cells and that being approximately in top-left -> bottom-right order, meaning we encounter
-        # the maximums early and most iterations can skip the more expensive conditions due to the indexes
-        # just being lower
-        for (row_index, col_index), cell in reversed(sheet._cells.items()):  # APIFRAGILE on sheet._cells
-            if (
-                col_index <= column_limit
-                # cheap early filter
-                and (row_index > max_row_within_limit or col_index > max_col_within_limit)
-                and visible_column_map[col_index - 1]
-                and cls._openpyxl_dimension_visible(sheet.row_dimensions, row_index)
-                and str("" if cell.value is None else cell.value).strip()
-            ):
-                if row_limit is not None and row_index > row_limit:
-                    # fail earlier than we otherwise would to save pointless work, this calculation
-                    # counting hidden rows also saves us from having to "skip" millions of them
-                    raise cls.TooManyRowsError(f"Exceeded row limit of {row_limit}")
-
-                max_row_within_limit = max(max_row_within_limit, row_index)
-                max_col_within_limit = max(max_col_within_limit, col_index)
+        try:
+            # APIFRAGILE on ReadOnlyWorksheet._get_source
+            with sheet._get_source() as source:  # type: ignore[attr-defined]
+                parser = cls._openpyxl_parser(sheet, source)
+
+                for row_index, row_visible, cells in cls._iter_openpyxl_parser_rows(parser, min_max_row=max_row):
+                    if row_index > max_row:
+                        break
+
+                    values: list = [None] * max_col
+                    for cell in cells:
+                        if cell["column"] <= max_col:
+                            values[cell["column"] - 1] = cell["value"]
+
+                    while pending_merged_ranges and pending_merged_ranges[0].min_row <= row_index:
+                        range_ = pending_merged_ranges.popleft()
+                        current_merged_ranges.append((range_, values[range_.min_col - 1]))
+
+                    current_merged_ranges = [
+                        (range_, value) for range_, value in current_merged_ranges if range_.max_row >= row_index
+                    ]
+                    for range_, value in current_merged_ranges:
+                        values[range_.min_col - 1 : range_.max_col] = [value] * (range_.max_col - range_.min_col + 1)
+
+                    if row_index >= first_visible_row and row_visible:
+                        yield list(compress(values, visible_column_map))
+        finally:
+            # read-only workbooks keep the file open for as long as we're reading from it
+            book.close()
 
-        thread_time_end = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
-        thread_times["calc_max_within_limit"] = {
-            "elapsed_since_prev": thread_time_end - thread_time_start,
-            "max_cont_running": greenlet_thread_time_ns_max_continuous() or 0,  # returns None if not using eventlet
-        }
-        thread_time_start = thread_time_end
+    @classmethod
+    def _from_xlsx(
+        cls,
+        file_content: IO[bytes],
+        filename: str,
+        row_limit: int | None,
+        column_limit_from_header: bool,
+        absolute_column_limit: int,
+        min_column_limit: int,
+    ) -> Self:
+        """
+        Extracts all non-hidden content from the first non-hidden sheet of an xlsx file in a way that is
+        comparatively efficient and with reduced blocking.
 
-        # yield to any event loop or GIL
-        sleep(0)
+        openpyxl's "read only" mode doesn't tell us about hidden rows and columns or merged cells (which we want)
+        and its normal mode creates an object for every cell in the sheet, so instead we go through the sheet's
+        xml twice with openpyxl's streaming parser: once to find out what's visible and where the content is,
+        and again to read the values. Memory use grows with the number of columns rather than the number of cells.
+        """
+
+        thread_times = {}
+        thread_time_start = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
 
-        # to limit the merged-cell lookup cost no matter how many ranges the document has, flatten merged-cell
-        # information into a big dict keyed by coordinates (akin to sheet._cells) with values being the value
-        # each cell should instead have (taken from the top left cell of the range). note 1-based coordinates
-        # to match sheet._cells keys.
-        max_range = openpyxl.worksheet.cell_range.CellRange(  # type: ignore[attr-defined]
-            min_row=1, min_col=1, max_row=max_row_within_limit, max_col=max_col_within_limit
+        book = openpyxl.load_workbook(
+            # we read the rows lazily, by which point whoever gave us file_content might have closed it. the
+            # compressed file is a lot smaller than what's in it, so it's cheap to hold on to our own copy
+            BytesIO(file_content.read()),
+            data_only=True,
+            keep_links=False,
+            rich_text=False,
+            read_only=True,
         )
-        merged_cell_map = dict(
-            chain.from_iterable(
-                zip(range_.cells, repeat(sheet.cell(range_.min_row, range_.min_col).value), strict=False)
-                for range_ in (
-                    range_.intersection(max_range)
-                    for range_ in sheet.merged_cells.ranges
-                    if not range_.isdisjoint(max_range)
-                )
+
+        try:
+            sheet = next((sheet for sheet in book.worksheets if sheet.sheet_state != "hidden"), None)
+            if not sheet:
+                book.close()
+                return cls.from_rows(iter(()), filename)  # empty spreadsheet
+
+            thread_time_end = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
+            thread_times["load_workbook"] = {
+                "elapsed_since_prev": thread_time_end - thread_time_start,
+                "max_cont_running": greenlet_thread_time_ns_max_continuous() or 0,  # returns None if not using eventlet
+            }
+            thread_time_start = thread_time_end
+
+            # yield to any event loop or GIL
+            sleep(0)
+
+            first_visible_row, max_row, max_col, visible_column_map, merged_ranges = cls._scan_xlsx_sheet(
+                sheet,
+                row_limit,
+                column_limit_from_header,
+                absolute_column_limit,
+                min_column_limit,
             )
-        )
+        except BaseException:
+            book.close()
+            raise
 
         thread_time_end = greenlet_thread_time_ns() or 0  # returns None if not using eventlet
-        thread_times["calc_merged_cell_map"] = {
+        thread_times["scan_sheet"] = {
             "elapsed_since_prev": thread_time_end - thread_time_start,
             "max_cont_running": greenlet_thread_time_ns_max_continuous() or 0,  # returns None if not using eventlet
         }
-        thread_time_start = thread_time_end
 
         # yield to any event loop or GIL
         sleep(0)
@@ -275,21 +381,8 @@ class Spreadsheet:
         )
 
         return cls.from_rows(
-            (
-                (
-                    merged_cell_map.get((row_index, col_index), value)
-                    for col_index, value in compress(enumerate(row, 1), visible_column_map)
-                )
-                for row_index, row in enumerate(
-                    sheet.iter_rows(
-                        min_row=first_visible_row,
-                        max_col=max_col_within_limit,
-                        max_row=max_row_within_limit,
-                        values_only=True,
-                    ),
-                    first_visible_row,
-                )
-                if cls._openpyxl_dimension_visible(sheet.row_dimensions, row_index)
+            cls._iter_xlsx_sheet_values(
+                book, sheet, first_visible_row, max_row, max_col, visible_column_map, merged_ranges
             ),
             filename,
             row_limit=row_limit,
@@ -1,7 +1,12 @@
+from collections import defaultdict
+from functools import partial
+
+from flask import has_request_context, request
 from notifications_utils.interruptible_io import InterruptibleIterableMixin
 from werkzeug.utils import cached_property
 
 from app import format_notification_type
+from app.notify_client import fan_out, fan_out_lazily
 
 
 class TemplateList:
@@ -76,64 +81,220 @@ class TemplateList:
                 service_id=self.service.id,
             )
 
+    @cached_property
+    def _index(self):
+        return TemplateListIndex(templates=self.all_templates, folders=self.all_template_folders)
+
     def _get_templates(self, template_type, template_folder_id):
-        if template_folder_id:
-            template_folder_id = str(template_folder_id)
+        return self._index.get_templates(template_type, template_folder_id)
+
+    def _get_template_folders(self, template_type, parent_folder_id):
+        return self._index.get_template_folders(template_type, parent_folder_id)
+
+    @property
+    def templates_to_show(self):
+        return any(self)
+
+    @property
+    def folder_is_empty(self):
+        return not any(self._get_templates_and_folders("all", self.template_folder_id, []))
+
+
+class TemplateListIndex:
+    """
+    Groups templates and folders by the folder they’re in, so that a
+    TemplateList can look up the contents of a folder without going
+    through every template and folder belonging to the service.
+
+    A folder is only visible when filtering by a template type if it
+    (or one of its subfolders) contains a template of that type, so
+    we also work out which template types each folder contains.
+    """
+
+    def __init__(self, *, templates, folders):
+        self.templates_by_folder_id = defaultdict(list)
+        self.folders_by_parent_id = defaultdict(list)
+        self._template_types_by_folder_id = {}
+
+        for template in templates:
+            self.templates_by_folder_id[template.get("folder")].append(template)
+
+        for folder in folders:
+            self.folders_by_parent_id[folder["parent_id"]].append(folder)
+
+    @staticmethod
+    def _normalise_folder_id(folder_id):
+        return str(folder_id) if folder_id else None
+
+    def get_templates(self, template_type, template_folder_id):
+        templates = self.templates_by_folder_id.get(self._normalise_folder_id(template_folder_id), [])
+
+        if template_type == "all":
+            return list(templates)
+
+        return [template for template in templates if template["template_type"] == template_type]
+
+    def get_template_folders(self, template_type, parent_folder_id):
+        folders = self.folders_by_parent_id.get(self._normalise_folder_id(parent_folder_id), [])
+
+        if template_type == "all":
+            return list(folders)
+
+        return [folder for folder in folders if template_type in self.get_template_types_in_folder(folder["id"])]
+
+    def get_template_types_in_folder(self, template_folder_id):
+        """
+        Returns the set of template types in a folder or any of its
+        subfolders. Each folder’s answer is worked out once, building
+        on the answers for its subfolders.
+        """
+        template_folder_id = self._normalise_folder_id(template_folder_id)
+
+        if template_folder_id not in self._template_types_by_folder_id:
+            self._template_types_by_folder_id[template_folder_id] = {
+                template["template_type"] for template in self.templates_by_folder_id.get(template_folder_id, [])
+            }.union(
+                *(
+                    self.get_template_types_in_folder(child_folder["id"])
+                    for child_folder in self.folders_by_parent_id.get(template_folder_id, [])
+                )
+            )
+
+        return self._template_types_by_folder_id[template_folder_id]
+
+
+class UserTemplateFolderView:
+    """
+    Works out which of a service’s templates and folders a user has
+    permission to view.
+
+    For each folder, we do the following:
+    - if user has no permission to view the folder, skip it
+    - if folder is visible and its parent is visible, we add it to the list of folders
+    we later return without modifying anything
+    - if folder is visible, but the parent is not, we go up through the parents until we
+    either find a visible parent or reach root folder. The names of the invisible parents
+    are concatenated to the front of our folder name, and the parent_id becomes that of the
+    closest visible parent. This flattens the path to the folder making sure it displays in
+    the closest visible parent.
+
+    Each invisible folder’s path is only worked out once, however many
+    folders are inside it.
+
+    The "Templates" page lists templates, and also lists folders to
+    move them to, so use `get_user_template_folder_view` to share one
+    of these between everything on a page.
+    """
+
+    def __init__(self, *, service, user):
+        self.service = service
+        self.user = user
+        self._invisible_paths_by_folder_id = {}
+
+    @cached_property
+    def _visible_folder_ids(self):
+        return {
+            folder["id"]
+            for folder in self.service.all_template_folders
+            if self.user.has_template_folder_permission(folder, service=self.service)
+        }
+
+    def _is_visible(self, folder_id):
+        return folder_id is None or folder_id in self._visible_folder_ids
+
+    def _get_invisible_path(self, folder):
+        """
+        Returns the names of an invisible folder and its invisible
+        ancestors (outermost first), and the ID of its closest
+        visible ancestor.
+        """
+        if folder["id"] not in self._invisible_paths_by_folder_id:
+            if self._is_visible(folder["parent_id"]):
+                names, visible_ancestor_id = [], folder["parent_id"]
+            else:
+                names, visible_ancestor_id = self._get_invisible_path(
+                    self.service.get_template_folder(folder["parent_id"])
+                )
+            self._invisible_paths_by_folder_id[folder["id"]] = (names + [folder["name"]], visible_ancestor_id)
+
+        return self._invisible_paths_by_folder_id[folder["id"]]
+
+    @cached_property
+    def template_folders(self):
+        user_folders = []
+        for folder in self.service.all_template_folders:
+            if not self._is_visible(folder["id"]):
+                continue
+            if self._is_visible(folder["parent_id"]):
+                user_folders.append(folder)
+                continue
+            parent_names, parent_id = self._get_invisible_path(self.service.get_template_folder(folder["parent_id"]))
+            name = folder["name"]
+            for parent_name in reversed(parent_names):
+                name = [parent_name, name]
+            user_folders.append(
+                {
+                    "id": folder["id"],
+                    "name": name,
+                    "parent_id": parent_id,
+                    "users_with_permission": folder["users_with_permission"],
+                }
+            )
+        return user_folders
 
+    @cached_property
+    def templates(self):
         return [
             template
-            for template in self.all_templates
-            if template_type in ("all", template["template_type"]) and template.get("folder") == template_folder_id
+            for template in self.service.all_templates
+            # Check if each template is in a folder the user has
+            # access to. If it's not in a folder ("None"), then
+            # it's at the top level and all users have access.
+            if self._is_visible(template["folder"])
         ]
 
-    def _get_template_folders(self, template_type, parent_folder_id):
-        if parent_folder_id:
-            parent_folder_id = str(parent_folder_id)
+    @cached_property
+    def index(self):
+        return TemplateListIndex(templates=self.templates, folders=self.template_folders)
 
-        return [
-            folder
-            for folder in self.all_template_folders
-            if (folder["parent_id"] == parent_folder_id and self._is_folder_visible(folder["id"], template_type))
-        ]
+    @cached_property
+    def move_to_choices(self):
+        return [(folder["id"], folder["name"]) for folder in self.template_folders]
 
-    def _is_folder_visible(self, template_folder_id, template_type):
-        if template_type == "all":
-            return True
+    @cached_property
+    def child_folder_ids_by_parent_id(self):
+        return {
+            parent_id: {folder["id"] for folder in folders}
+            for parent_id, folders in self.index.folders_by_parent_id.items()
+        }
 
-        if self._get_templates(template_type, template_folder_id):
-            return True
 
-        if any(
-            self._is_folder_visible(child_folder["id"], template_type)
-            for child_folder in self._get_template_folders(template_type, template_folder_id)
-        ):
-            return True
+def get_user_template_folder_view(*, service, user):
+    if not has_request_context():
+        return UserTemplateFolderView(service=service, user=user)
 
-        return False
+    # stored on the request, like the request cache memo, so that it’s never shared between requests
+    if not hasattr(request, "user_template_folder_views"):
+        request.user_template_folder_views = {}
 
-    @property
-    def templates_to_show(self):
-        return any(self)
+    key = (service.id, user.id)
+    if key not in request.user_template_folder_views:
+        request.user_template_folder_views[key] = UserTemplateFolderView(service=service, user=user)
 
-    @property
-    def folder_is_empty(self):
-        return not any(self._get_templates_and_folders("all", self.template_folder_id, []))
+    return request.user_template_folder_views[key]
 
 
 class UserTemplateList(TemplateList):
     """
     Represents a filtered list of templates and folders for a
     service based on which folders the specified user has access
-    to. See the comment on "all_template_folders".
+    to. See the comment on "UserTemplateFolderView".
 
     This is used in several places:
 
     - On the "Templates" page. We render all the templates and
     folders to support JS search, hiding nested items with CSS.
 
-    - On the "Templates" page, we also use "all_template_folders"
-    to render the list of folders to move a template to.
-
     - On the SMS reply-to page. We render all the templates and
     folders to support JS search, hiding nested items with CSS.
     """
@@ -143,61 +304,20 @@ class UserTemplateList(TemplateList):
         super().__init__(**kwargs)
 
     @cached_property
-    def all_templates(self):
-        all_folder_ids = [folder["id"] for folder in self.all_template_folders]
+    def folder_view(self):
+        return get_user_template_folder_view(service=self.service, user=self.user)
 
-        return [
-            template
-            for template in self.service.all_templates
-            # Check if each template is in a folder the user has
-            # access to. If it's not in a folder ("None"), then
-            # it's at the top level and all users have access.
-            if template["folder"] in (all_folder_ids + [None])
-        ]
+    @property
+    def all_templates(self):
+        return self.folder_view.templates
 
-    @cached_property
+    @property
     def all_template_folders(self):
-        """Returns a modified list of folders a user has permission to view
-
-        For each folder, we do the following:
-        - if user has no permission to view the folder, skip it
-        - if folder is visible and its parent is visible, we add it to the list of folders
-        we later return without modifying anything
-        - if folder is visible, but the parent is not, we iterate through the parent until we
-        either find a visible parent or reach root folder. On each iteration we concatenate
-        invisible parent folder name to the front of our folder name, modifying the name, and we
-        change parent_folder_id attribute to a higher level parent. This flattens the path to the
-        folder making sure it displays in the closest visible parent.
+        return self.folder_view.template_folders
 
-        """
-        user_folders = []
-        for folder in self.service.all_template_folders:
-            if not self.user.has_template_folder_permission(folder, service=self.service):
-                continue
-            parent = self.service.get_template_folder(folder["parent_id"])
-            if self.user.has_template_folder_permission(parent, service=self.service):
-                user_folders.append(folder)
-            else:
-                folder_attrs = {
-                    "id": folder["id"],
-                    "name": folder["name"],
-                    "parent_id": folder["parent_id"],
-                    "users_with_permission": folder["users_with_permission"],
-                }
-                while folder_attrs["parent_id"] is not None:
-                    folder_attrs["name"] = [
-                        parent["name"],
-                        folder_attrs["name"],
-                    ]
-                    if parent["parent_id"] is None:
-                        folder_attrs["parent_id"] = None
-                    else:
-                        parent = self.service.get_template_folder(parent["parent_id"])
-                        folder_attrs["parent_id"] = parent.get("id", None)
-                        if self.user.has_template_folder_permission(parent, service=self.service):
-                            break
-                user_folders.append(folder_attrs)
-        return user_folders
+    @property
+    def _index(self):
+        return self.folder_view.index
 
 
 # why not just mix this in to `UserTemplateList`? we always want to apply it "on top" of any
@@ -244,8 +364,15 @@ class UserTemplateLists:
     for each service a user has access to.
 
     This is used exclusively on the "Copy template" page.
+
+    Someone can belong to a lot of services, so rather than fetching
+    each service’s templates and folders in turn, we fetch them for
+    all the services at the same time and list each service as soon
+    as its own have arrived.
     """
 
+    MAX_CONCURRENT_SERVICES = 10
+
     def __init__(self, user):
         self.services = sorted(
             user.services,
@@ -253,15 +380,29 @@ class UserTemplateLists:
         )
         self.user = user
 
+    @staticmethod
+    def _fetch_templates_and_folders(service):
+        # both are cached on the service, so the template lists won’t fetch them again
+        return fan_out(lambda: service.all_templates, lambda: service.all_template_folders)
+
+    def _iter_services_with_templates_and_folders(self):
+        fetched = fan_out_lazily(
+            *(partial(self._fetch_templates_and_folders, service) for service in self.services),
+            max_concurrency=self.MAX_CONCURRENT_SERVICES,
+        )
+        for service, _ in zip(self.services, fetched, strict=True):
+            yield service
+
     def __iter__(self):
         if len(self.services) == 1:
+            self._fetch_templates_and_folders(self.services[0])
             yield from UserTemplateList(
                 service=self.services[0],
                 user=self.user,
             )
             return
 
-        for service in self.services:
+        for service in self._iter_services_with_templates_and_folders():
             yield from ServiceTemplateList(
                 service=service,
                 user=self.user,
@@ -1,6 +1,11 @@
+from collections.abc import Callable, Iterable, Iterator
+from contextvars import copy_context
+from fnmatch import fnmatchcase
+from functools import partial
 from typing import Any
 
-from flask import g, has_request_context, request
+from eventlet.greenpool import GreenPool
+from flask import current_app, g, has_request_context, request
 from notifications_python_client import __version__
 from notifications_python_client.base import BaseAPIClient
 from notifications_utils.clients.redis import RequestCache
@@ -8,8 +13,89 @@ from notifications_utils.json import RelaxedContainerJSONEncoder, StrictJsonTopL
 
 from app import current_user
 from app.extensions import redis_client
+from app.notify_client.local_cache import LocallyCachedRedisClient
 
-cache: RequestCache = RequestCache(redis_client)
+
+class RequestCacheMemo:
+    """
+    Values read from Redis by `cache` during a single request, keyed by Redis key (which is made up of the
+    client method’s arguments), along with how many lookups were answered from here rather than Redis.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def forget(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def forget_by_pattern(self, pattern):
+        self.forget(*(key for key in self.values if fnmatchcase(key, pattern)))
+
+    def forget_everything(self):
+        self.values.clear()
+
+
+def get_request_cache_memo() -> RequestCacheMemo | None:
+    if not has_request_context() or not current_app.config["REQUEST_CACHE_MEMO_ENABLED"]:
+        return None
+
+    # stored on the request rather than `g`, which can outlive a request if the app context was already pushed
+    if not hasattr(request, "request_cache_memo"):
+        request.request_cache_memo = RequestCacheMemo()
+
+    return request.request_cache_memo
+
+
+class _RequestMemoisedRedisClient:
+    """
+    Sits between `cache` and Redis, remembering what Redis returned (or what `cache` wrote to it) for each
+    key for the rest of the request. This means that looking up the same user, service or template several
+    times while serving one request only goes to Redis, or the API, once – even if Redis is disabled.
+
+    Anything `cache.delete` removes from Redis is forgotten too.
+    """
+
+    def __init__(self, redis_client):
+        self._redis_client = redis_client
+
+    def __getattr__(self, name):
+        return getattr(self._redis_client, name)
+
+    def get(self, key, *args, **kwargs):
+        if (memo := get_request_cache_memo()) is None:
+            return self._redis_client.get(key, *args, **kwargs)
+
+        if key in memo.values:
+            memo.hits += 1
+            return memo.values[key]
+
+        memo.misses += 1
+        value = self._redis_client.get(key, *args, **kwargs)
+        if value is not None:
+            memo.values[key] = value
+        return value
+
+    def set(self, key, value, *args, **kwargs):
+        if (memo := get_request_cache_memo()) is not None and not kwargs.get("nx") and not kwargs.get("xx"):
+            # Redis gives back bytes, which is what `cache` expects to decode
+            memo.values[key] = value.encode("utf-8") if isinstance(value, str) else value
+        return self._redis_client.set(key, value, *args, **kwargs)
+
+    def delete(self, *keys, **kwargs):
+        if memo := get_request_cache_memo():
+            memo.forget(*keys)
+        return self._redis_client.delete(*keys, **kwargs)
+
+    def delete_by_pattern(self, pattern, *args, **kwargs):
+        if memo := get_request_cache_memo():
+            memo.forget_by_pattern(pattern)
+        return self._redis_client.delete_by_pattern(pattern, *args, **kwargs)
+
+
+cache: RequestCache = RequestCache(_RequestMemoisedRedisClient(LocallyCachedRedisClient(redis_client)))
 
 
 class _ExtraRelaxedContainerJSONEncoder(RelaxedContainerJSONEncoder):
@@ -30,6 +116,57 @@ def _attach_current_user(data):
     return dict(created_by=current_user.id, **data)
 
 
+def _call_capturing_exception(call: Callable[[], Any]) -> tuple[Any, Exception | None]:
+    # eventlet’s hub prints a traceback for any exception a green thread doesn’t handle, so hand
+    # exceptions back to `fan_out` to be raised in the calling thread instead
+    try:
+        return call(), None
+    except Exception as e:
+        return None, e
+
+
+def fan_out(*calls: Callable[[], Any]) -> list[Any]:
+    """
+    Run each of `calls` in its own green thread and return their results in the same order
+    as `calls`. If any call raises, the first exception (in the order of `calls`) is re-raised
+    once they have all finished.
+
+    Each call runs in a copy of the current context, so anything that relies on the flask request
+    (like the onward request headers and `X-Notify-User-Id` added by `generate_headers`) keeps
+    working. Only use this for calls which don’t depend on each other’s side effects.
+    """
+    if len(calls) < 2:
+        return [call() for call in calls]
+
+    pool = GreenPool(size=len(calls))
+    threads = [pool.spawn(copy_context().run, _call_capturing_exception, call) for call in calls]
+    outcomes = [thread.wait() for thread in threads]
+
+    for _, exception in outcomes:
+        if exception is not None:
+            raise exception
+
+    return [result for result, _ in outcomes]
+
+
+def _run_in_context(context, call: Callable[[], Any]) -> tuple[Any, Exception | None]:
+    return context.run(_call_capturing_exception, call)
+
+
+def fan_out_lazily(*calls: Callable[[], Any], max_concurrency: int) -> Iterator[Any]:
+    """
+    Like `fan_out`, but yields each result (in the order of `calls`) as soon as it’s ready, so the caller
+    can get on with the first results while later calls are still running. No more than `max_concurrency`
+    calls run at the same time. If a call raises, the exception is raised in place of its result.
+    """
+    pool = GreenPool(size=max_concurrency)
+    # the calls are spawned from another green thread, so copy the context for each of them here
+    for result, exception in pool.starmap(_run_in_context, [(copy_context(), call) for call in calls]):
+        if exception is not None:
+            raise exception
+        yield result
+
+
 class NotifyAdminAPIClient(BaseAPIClient):
     def __init__(self, app):
         try:
@@ -67,6 +204,28 @@ class NotifyAdminAPIClient(BaseAPIClient):
 
         return headers
 
+    def request(self, method, url, data=None, params=None):
+        try:
+            return super().request(method, url, data=data, params=params)
+        finally:
+            # we can’t tell which cached values a write affects, so don’t trust any of them for the rest of the request
+            if method != "GET" and (memo := get_request_cache_memo()):
+                memo.forget_everything()
+
+    def get_many(self, requests: Iterable[str | tuple[str, dict | None]]) -> list[Any]:
+        """
+        Make several independent GET requests at the same time, so the total time taken is that of
+        the slowest request rather than the sum of all of them.
+
+        `requests` is an iterable of URLs, or of `(url, params)` tuples. Responses are returned in
+        the same order as `requests`.
+        """
+        calls = []
+        for item in requests:
+            url, params = (item, None) if isinstance(item, str) else item
+            calls.append(partial(self.get, url, params=params))
+        return fan_out(*calls)
+
     def _serialize_data(self, data: Any) -> str:
         return _ExtraRelaxedContainerJSONEncoder().encode(data)
 
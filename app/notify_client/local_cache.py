@@ -0,0 +1,167 @@
+import os
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from time import monotonic
+
+import eventlet
+from flask import current_app
+
+from app import memo_resetters
+
+INVALIDATION_CHANNEL = "admin-local-cache-invalidation"
+
+
+class LocalCache:
+    """
+    A bounded, least-recently-used store of values with an expiry time,
+    held in the memory of a single worker process.
+    """
+
+    def __init__(self):
+        self._values = OrderedDict()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key):
+        value, expires_at = self._values.get(key, (None, 0))
+
+        if expires_at <= monotonic():
+            self._values.pop(key, None)
+            return None
+
+        self._values.move_to_end(key)
+        return value
+
+    def set(self, key, value, *, ttl_in_seconds, max_items):
+        self._values[key] = (value, monotonic() + ttl_in_seconds)
+        self._values.move_to_end(key)
+
+        while len(self._values) > max_items:
+            self._values.popitem(last=False)
+
+    def forget_by_pattern(self, pattern):
+        for key in [key for key in self._values if fnmatchcase(key, pattern)]:
+            del self._values[key]
+
+    def clear(self):
+        self._values.clear()
+
+
+local_cache = LocalCache()
+memo_resetters.append(lambda: local_cache.clear())
+
+
+class LocallyCachedRedisClient:
+    """
+    Sits in front of Redis, keeping values for keys matching one of the
+    patterns in `LOCAL_CACHE_TTLS` in the worker’s memory for a short
+    time. This takes Redis out of the way for things which hardly ever
+    change, like letter and SMS rates.
+
+    When a key is deleted from Redis we tell every other worker to forget
+    it too, by publishing the key (or pattern) on a Redis channel which
+    each worker listens to. Nothing is kept until Redis has confirmed we’re
+    listening, otherwise we could miss being told to forget it.
+    """
+
+    # how long to wait for a message before checking again, so a quiet channel doesn’t hit REDIS_SOCKET_TIMEOUT
+    LISTEN_TIMEOUT_IN_SECONDS = 1
+
+    def __init__(self, redis_client):
+        self._redis_client = redis_client
+        self._listener = None
+        self._listener_pid = None
+        self._subscribed = False
+
+    def __getattr__(self, name):
+        return getattr(self._redis_client, name)
+
+    @property
+    def _enabled(self):
+        return bool(current_app.config["LOCAL_CACHE_TTLS"]) and self._redis_client.active
+
+    @staticmethod
+    def _get_ttl_in_seconds(key):
+        return next(
+            (ttl for pattern, ttl in current_app.config["LOCAL_CACHE_TTLS"].items() if fnmatchcase(key, pattern)),
+            None,
+        )
+
+    def get(self, key, *args, **kwargs):
+        if not self._enabled or not (ttl_in_seconds := self._get_ttl_in_seconds(key)):
+            return self._redis_client.get(key, *args, **kwargs)
+
+        self._ensure_listening_for_invalidations()
+
+        if not self._subscribed:
+            return self._redis_client.get(key, *args, **kwargs)
+
+        if (value := local_cache.get(key)) is not None:
+            return value
+
+        value = self._redis_client.get(key, *args, **kwargs)
+
+        if value is not None:
+            local_cache.set(
+                key,
+                value,
+                ttl_in_seconds=ttl_in_seconds,
+                max_items=current_app.config["LOCAL_CACHE_MAX_ITEMS"],
+            )
+
+        return value
+
+    def delete(self, *keys, **kwargs):
+        for key in keys:
+            self._forget_everywhere(key)
+        return self._redis_client.delete(*keys, **kwargs)
+
+    def delete_by_pattern(self, pattern, *args, **kwargs):
+        self._forget_everywhere(pattern)
+        return self._redis_client.delete_by_pattern(pattern, *args, **kwargs)
+
+    def _forget_everywhere(self, pattern):
+        if not self._enabled:
+            return
+
+        local_cache.forget_by_pattern(pattern)
+
+        try:
+            self._redis_client.redis_store.publish(INVALIDATION_CHANNEL, pattern)
+        except Exception:
+            current_app.logger.warning("Failed to publish local cache invalidation for %s", pattern, exc_info=True)
+
+    def _ensure_listening_for_invalidations(self):
+        # gunicorn forks workers after the app is loaded, so each process needs its own listener
+        if self._listener is not None and self._listener_pid == os.getpid():
+            return
+
+        self._listener_pid = os.getpid()
+        self._subscribed = False
+        self._listener = eventlet.spawn(self._listen_for_invalidations, current_app._get_current_object())
+
+    def _listen_for_invalidations(self, app):
+        try:
+            pubsub = self._redis_client.redis_store.pubsub()
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+
+            while True:
+                message = pubsub.get_message(timeout=self.LISTEN_TIMEOUT_IN_SECONDS)
+
+                if message is None:
+                    continue
+
+                if message["type"] == "subscribe":
+                    self._subscribed = True
+                elif message["type"] == "message":
+                    pattern = message["data"]
+                    local_cache.forget_by_pattern(pattern.decode() if isinstance(pattern, bytes) else pattern)
+        except Exception:
+            app.logger.warning("Stopped listening for local cache invalidations", exc_info=True)
+        finally:
+            # we might have missed invalidations, so don’t trust anything we’ve kept, and start listening
+            # again next time something is read
+            self._subscribed = False
+            local_cache.clear()
+            self._listener = None
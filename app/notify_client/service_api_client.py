@@ -266,13 +266,23 @@ class ServiceAPIClient(NotifyAdminAPIClient):
             endpoint = f"{endpoint}/version/{version}"
         return self.get(endpoint)
 
-    @cache.set("service-{service_id}-template-{template_id}-versions")
-    def get_service_template_versions(self, service_id, template_id):
+    @cache.set("service-{service_id}-template-{template_id}-versions-page-{page}-of-{page_size}")
+    def get_service_template_versions(self, service_id, template_id, page=1, page_size=25):
         """
-        Retrieve a list of versions for a template
+        Retrieve one page of versions for a template, newest first, along with the total number of versions
         """
         endpoint = f"/service/{service_id}/template/{template_id}/versions"
-        return self.get(endpoint)
+        response = self.get(endpoint, params={"page": page, "page_size": page_size})
+
+        if "total" not in response:
+            # A version of the API which doesn’t page the versions returns all of them, so only keep (and cache)
+            # the ones on this page
+            return {
+                "data": response["data"][(page - 1) * page_size : page * page_size],
+                "total": len(response["data"]),
+            }
+
+        return response
 
     @cache.set("service-{service_id}-template-precompiled")
     def get_precompiled_template(self, service_id):
@@ -1,21 +1,86 @@
-from boto3 import client, resource
+import os
+import typing
+from contextvars import ContextVar
+
+from boto3.session import Session
+from botocore.config import Config as BotocoreConfig
 from botocore.exceptions import ClientError
 from flask import current_app
 from notifications_utils.eventlet import EventletTimeout
 from notifications_utils.exception_handling import extract_reraise_chained_exception
+from notifications_utils.local_vars import LazyLocalGetter
+from werkzeug.local import LocalProxy
+
+from app import memo_resetters
+
+if typing.TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client, S3ServiceResource
+
+
+def _get_botocore_config():
+    return BotocoreConfig(
+        region_name=current_app.config["AWS_REGION"],
+        max_pool_connections=current_app.config["S3_MAX_POOL_CONNECTIONS"],
+        tcp_keepalive=current_app.config["S3_TCP_KEEPALIVE"],
+        retries={"max_attempts": current_app.config["S3_MAX_ATTEMPTS"], "mode": "standard"},
+        # otherwise presigned urls use the legacy signature, which S3 is phasing out
+        signature_version="s3v4",
+    )
+
+
+class _PerProcess[T]:
+    """
+    Builds something the first time it’s needed, then shares it between every green thread in the process.
+
+    Forked processes (like gunicorn workers forked from an app loaded by the master) build their own, so they
+    don’t share a connection pool with the process they were forked from.
+    """
+
+    def __init__(self, factory: typing.Callable[[], T]):
+        self._factory = factory
+        self._value: T | None = None
+        os.register_at_fork(after_in_child=self.clear)
+
+    def __call__(self) -> T:
+        if self._value is None:
+            self._value = self._factory()
+        return self._value
+
+    def clear(self):
+        self._value = None
+
+
+# Building a client means resolving credentials and loading the S3 service model, which is slow enough to notice
+# if it happens every time we touch a file, so we only do it once per worker and reuse the client and its
+# connection pool
+get_s3_session: _PerProcess[Session] = _PerProcess(Session)
+memo_resetters.append(lambda: get_s3_session.clear())
+
+get_s3_client: _PerProcess["S3Client"] = _PerProcess(
+    lambda: get_s3_session().client("s3", config=_get_botocore_config()),
+)
+memo_resetters.append(lambda: get_s3_client.clear())
+s3_client: "S3Client" = LocalProxy(get_s3_client)  # type: ignore[assignment]
+
+# Unlike clients, boto3 resources aren’t safe to share, so each green thread builds its own from the shared session
+_s3_resource_context_var: ContextVar["S3ServiceResource | None"] = ContextVar("s3_resource")
+get_s3_resource: LazyLocalGetter["S3ServiceResource"] = LazyLocalGetter(
+    _s3_resource_context_var,
+    lambda: get_s3_session().resource("s3", config=_get_botocore_config()),
+)
+memo_resetters.append(lambda: get_s3_resource.clear())
+s3_resource: "S3ServiceResource" = LocalProxy(get_s3_resource)  # type: ignore[assignment]
 
 
 @extract_reraise_chained_exception(EventletTimeout)
 def get_s3_object(bucket_name, filename):
-    s3 = resource("s3")
-    return s3.Object(bucket_name, filename)
+    return s3_resource.Object(bucket_name, filename)
 
 
 @extract_reraise_chained_exception(EventletTimeout)
 def check_s3_object_exists(bucket_name, filename):
     try:
-        s3 = client("s3")
-        s3.head_object(Bucket=bucket_name, Key=filename)
+        s3_client.head_object(Bucket=bucket_name, Key=filename)
         return True
     except ClientError as e:
         if e.response["Error"]["Code"] == "404":
@@ -28,3 +93,18 @@ def check_s3_object_exists(bucket_name, filename):
                 extra={"s3_bucket": bucket_name, "s3_key": filename},
             )
             raise e
+
+
+@extract_reraise_chained_exception(EventletTimeout)
+def get_s3_object_body(bucket_name, filename):
+    # the body is a file-like object which only reads from S3 as it's read from, rather than all at once
+    return s3_client.get_object(Bucket=bucket_name, Key=filename)["Body"]
+
+
+def get_s3_presigned_url(bucket_name, filename, *, expires_in, **params):
+    # urls are signed locally, so this doesn't need to call S3
+    return s3_client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket_name, "Key": filename, **params},
+        ExpiresIn=expires_in,
+    )
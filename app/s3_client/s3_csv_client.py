@@ -1,12 +1,12 @@
 import uuid
 
 import botocore
-from flask import current_app
+from flask import current_app, has_request_context, request
 from notifications_utils.eventlet import EventletTimeout
 from notifications_utils.exception_handling import extract_reraise_chained_exception
 from notifications_utils.s3 import s3upload as utils_s3upload
 
-from app.s3_client import get_s3_object
+from app.s3_client import get_s3_object, s3_client
 
 FILE_LOCATION_STRUCTURE = "service-{}-notify/{}.csv"
 
@@ -50,24 +50,67 @@ def s3download(service_id, upload_id, bucket=None):
     return contents
 
 
+def _get_request_csv_metadata():
+    # metadata we’ve already read or written while serving this request, keyed by bucket and file location
+    if not has_request_context():
+        return {}
+
+    if not hasattr(request, "csv_metadata"):
+        request.csv_metadata = {}
+
+    return request.csv_metadata
+
+
 def set_metadata_on_csv_upload(service_id, upload_id, bucket=None, **kwargs):
+    metadata = {key: str(value) for key, value in kwargs.items()}
     get_csv_upload(service_id, upload_id, bucket=bucket).copy_from(
         CopySource="{}/{}".format(*get_csv_location(service_id, upload_id, bucket=bucket)),
         ServerSideEncryption="AES256",
-        Metadata={key: str(value) for key, value in kwargs.items()},
+        Metadata=metadata,
         MetadataDirective="REPLACE",
     )
+    _get_request_csv_metadata()[get_csv_location(service_id, upload_id, bucket)] = metadata
 
 
 def get_csv_metadata(service_id, upload_id, bucket=None):
-    try:
-        key = get_csv_upload(service_id, upload_id, bucket)
-        with extract_reraise_chained_exception(EventletTimeout):
-            return key.get()["Metadata"]
-    except botocore.exceptions.ClientError as e:
-        extra = {
-            "upload_id": upload_id,
-        }
-        extra["s3_key"], extra["s3_bucket"] = get_csv_location(service_id, upload_id, bucket)
-        current_app.logger.error("Unable to download s3 file %(s3_key)s from bucket %(s3_bucket)s", extra, extra=extra)
-        raise e
+    location = get_csv_location(service_id, upload_id, bucket)
+    request_csv_metadata = _get_request_csv_metadata()
+
+    if location not in request_csv_metadata:
+        try:
+            with extract_reraise_chained_exception(EventletTimeout):
+                # a HEAD request gets us the metadata without downloading the whole file
+                request_csv_metadata[location] = s3_client.head_object(Bucket=location[0], Key=location[1])["Metadata"]
+        except botocore.exceptions.ClientError as e:
+            extra = {
+                "upload_id": upload_id,
+            }
+            extra["s3_key"], extra["s3_bucket"] = location
+            current_app.logger.error(
+                "Unable to download s3 file %(s3_key)s from bucket %(s3_bucket)s", extra, extra=extra
+            )
+            raise e
+
+    return dict(request_csv_metadata[location])
+
+
+def copy_csv_upload(service_id, upload_id, *, from_bucket, **kwargs):
+    """
+    Copies a file into the uploads bucket, with new metadata, without it leaving S3
+    """
+    new_upload_id = str(uuid.uuid4())
+    bucket_name, file_location = get_csv_location(service_id, new_upload_id)
+    metadata = {key: str(value) for key, value in kwargs.items()}
+
+    with extract_reraise_chained_exception(EventletTimeout):
+        s3_client.copy_object(
+            Bucket=bucket_name,
+            Key=file_location,
+            CopySource="{}/{}".format(*get_csv_location(service_id, upload_id, from_bucket)),
+            ServerSideEncryption="AES256",
+            Metadata=metadata,
+            MetadataDirective="REPLACE",
+        )
+
+    _get_request_csv_metadata()[(bucket_name, file_location)] = metadata
+    return new_upload_id
@@ -1,12 +1,18 @@
 import urllib
+from io import BytesIO
+from time import monotonic, sleep
 
 import botocore
-from boto3 import resource
 from flask import current_app
 from notifications_utils.eventlet import EventletTimeout
 from notifications_utils.exception_handling import extract_reraise_chained_exception
 from notifications_utils.json import RelaxedContainerJSONEncoder as RCJSONEncoder
 from notifications_utils.s3 import s3upload as utils_s3upload
+from pypdf import PdfReader, PdfWriter
+
+from app.extensions import redis_client
+from app.s3_client import s3_client, s3_resource
+from app.utils.redis_locks import acquire_lock, release_lock
 
 
 class LetterNotFoundError(Exception):
@@ -71,9 +77,8 @@ class LetterMetadata:
 def get_letter_s3_object(service_id, file_id):
     try:
         file_location = get_transient_letter_file_location(service_id, file_id)
-        s3 = resource("s3")
         with extract_reraise_chained_exception(EventletTimeout):
-            return s3.Object(current_app.config["S3_BUCKET_TRANSIENT_UPLOADED_LETTERS"], file_location).get()
+            return s3_resource.Object(current_app.config["S3_BUCKET_TRANSIENT_UPLOADED_LETTERS"], file_location).get()
     except botocore.exceptions.ClientError as e:
         if e.response["Error"]["Code"] == "NoSuchKey":
             raise LetterNotFoundError(f"Letter not found for service {service_id} and file {file_id}") from e
@@ -88,10 +93,93 @@ def get_letter_pdf_and_metadata(service_id, file_id):
 
 
 def get_letter_metadata(service_id, file_id):
-    s3_object = get_letter_s3_object(service_id, file_id)
+    # a HEAD request gets us the metadata without downloading the whole letter
+    try:
+        with extract_reraise_chained_exception(EventletTimeout):
+            s3_object = s3_client.head_object(
+                Bucket=current_app.config["S3_BUCKET_TRANSIENT_UPLOADED_LETTERS"],
+                Key=get_transient_letter_file_location(service_id, file_id),
+            )
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] == "404":
+            raise LetterNotFoundError(f"Letter not found for service {service_id} and file {file_id}") from e
+
+        raise
+
     return LetterMetadata(s3_object["Metadata"])
 
 
+def _get_letter_pdf_page_cache_key(service_id, file_id, page):
+    return f"letter-upload-{service_id}-{file_id}-page-{page}"
+
+
+def _split_pdf_into_pages(pdf):
+    pages = []
+
+    for page in PdfReader(BytesIO(pdf)).pages:
+        writer = PdfWriter()
+        writer.add_page(page)
+        buffer = BytesIO()
+        writer.write(buffer)
+        pages.append(buffer.getvalue())
+
+    return pages
+
+
+def get_letter_pdf_page(service_id, file_id, page):
+    """
+    Returns one page of an uploaded letter as a PDF of its own.
+
+    The first time any page is asked for, the whole letter is split into pages which are kept in Redis for a
+    little while, so previewing the rest of the letter doesn’t mean downloading and parsing it again each time.
+    The pages of a letter are usually all asked for at once, so only one request splits it while the others wait.
+    """
+    cache_key = _get_letter_pdf_page_cache_key(service_id, file_id, page)
+
+    if pdf_page := redis_client.get(cache_key):
+        return pdf_page
+
+    lock_key = f"letter-upload-{service_id}-{file_id}-pages-lock"
+    lock_token = None
+
+    if redis_client.active:
+        lock_token = acquire_lock(lock_key, ttl_in_seconds=current_app.config["LETTER_UPLOAD_PAGE_SPLIT_WAIT_FOR"])
+
+        if not lock_token and (pdf_page := _wait_for_letter_pdf_page(cache_key)):
+            return pdf_page
+
+    try:
+        pdf, _ = get_letter_pdf_and_metadata(service_id, file_id)
+        pages = _split_pdf_into_pages(pdf)
+
+        for page_number, pdf_page in enumerate(pages, start=1):
+            redis_client.set(
+                _get_letter_pdf_page_cache_key(service_id, file_id, page_number),
+                pdf_page,
+                ex=current_app.config["LETTER_UPLOAD_PAGE_CACHE_TTL"],
+            )
+    finally:
+        if lock_token:
+            release_lock(lock_key, lock_token)
+
+    if not 0 < page <= len(pages):
+        raise IndexError(f"Letter {file_id} has no page {page}")
+
+    return pages[page - 1]
+
+
+def _wait_for_letter_pdf_page(cache_key):
+    waited_until = monotonic() + current_app.config["LETTER_UPLOAD_PAGE_SPLIT_WAIT_FOR"]
+
+    while monotonic() < waited_until:
+        sleep(0.1)
+
+        if pdf_page := redis_client.get(cache_key):
+            return pdf_page
+
+    return None
+
+
 def get_attachment_pdf_and_metadata(service_id, file_id):
     s3_object = get_letter_s3_object(service_id, file_id)
     pdf = s3_object["Body"].read()
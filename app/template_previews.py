@@ -1,6 +1,9 @@
 import base64
+import hashlib
 from contextvars import ContextVar
+from datetime import date as datetime_date
 from io import BytesIO
+from time import time
 
 import requests
 from flask import abort, current_app, json, request
@@ -8,9 +11,53 @@ from flask.ctx import has_request_context
 from notifications_utils.json import RelaxedContainerJSONEncoder as RCJSONEncoder
 from notifications_utils.local_vars import LazyLocalGetter
 from notifications_utils.pdf import extract_page_from_pdf
+from werkzeug.datastructures import ResponseCacheControl
+from werkzeug.http import parse_cache_control_header
 from werkzeug.local import LocalProxy
 
 from app import memo_resetters
+from app.extensions import redis_client
+
+# a sorted set of the keys of cached preview pages, scored by when they expire
+LETTER_PREVIEW_CACHE_INDEX_KEY = "letter-preview-index"
+# a hash of how many bytes each cached preview page takes up, and the total of them
+LETTER_PREVIEW_CACHE_SIZES_KEY = "letter-preview-sizes"
+LETTER_PREVIEW_CACHE_TOTAL_SIZE_KEY = "letter-preview-total-size"
+
+# Adds a page to the index, then removes pages (those which expire soonest first) until the total size of the ones
+# left is under the limit. Done in one go so that workers caching pages at the same time can’t lose track of the total
+_INDEX_CACHED_PREVIEW_SCRIPT = """
+local index, sizes, total_size = KEYS[1], KEYS[2], KEYS[3]
+local cache_key, size, expires_at, now, max_total_size = ARGV[1], ARGV[2], ARGV[3], ARGV[4], tonumber(ARGV[5])
+
+local function forget(key)
+    local used = redis.call("decrby", total_size, redis.call("hget", sizes, key) or 0)
+    redis.call("hdel", sizes, key)
+    redis.call("zrem", index, key)
+    return used
+end
+
+forget(cache_key)
+redis.call("zadd", index, expires_at, cache_key)
+redis.call("hset", sizes, cache_key, size)
+local used = redis.call("incrby", total_size, size)
+
+-- pages which have expired don’t need removing, just forgetting
+for _, key in ipairs(redis.call("zrangebyscore", index, "-inf", now)) do
+    used = forget(key)
+end
+
+while used > max_total_size do
+    local key = redis.call("zrange", index, 0, 0)[1]
+    if not key then
+        break
+    end
+    used = forget(key)
+    redis.call("del", key)
+end
+
+return used
+"""
 
 
 class TemplatePreviewClient:
@@ -58,6 +105,12 @@ class TemplatePreviewClient:
             "filename": branding_filename or (service.letter_branding.filename if service else None),
             "date": date.isoformat() if date else None,
         }
+
+        if filetype == "png":
+            cache_key = self._get_preview_cache_key(data, filetype, page)
+            if cached_preview := self._get_cached_preview(cache_key):
+                return cached_preview
+
         response = self.requests_session.post(
             "{}/preview.{}{}".format(
                 self.api_host,
@@ -73,11 +126,108 @@ class TemplatePreviewClient:
         headers = list(self.get_allowed_headers(response.headers))
         if filetype == "pdf":
             headers.append(("Content-Disposition", "attachment"))
+
+        if filetype == "png":
+            self._cache_preview(
+                cache_key,
+                response.content,
+                response.status_code,
+                headers,
+                personalised=any((values or {}).values()),
+            )
+
         return response.content, response.status_code, headers
 
+    @staticmethod
+    def _get_preview_cache_key(data, filetype, page):
+        digest = hashlib.sha256(
+            RCJSONEncoder(sort_keys=True)
+            .encode(
+                {
+                    "data": data,
+                    "filetype": filetype,
+                    "page": str(page or 1),
+                    # Template preview uses today’s date if we don’t give it one
+                    "today": None if data["date"] else datetime_date.today().isoformat(),
+                }
+            )
+            .encode("utf-8")
+        ).hexdigest()
+        return f"letter-preview-{digest}"
+
+    @staticmethod
+    def _get_cached_preview(cache_key):
+        if not (cached_preview := redis_client.get(cache_key)):
+            return None
+
+        cached_preview = json.loads(cached_preview)
+        return (
+            base64.b64decode(cached_preview["content"]),
+            cached_preview["status_code"],
+            [tuple(header) for header in cached_preview["headers"]],
+        )
+
+    @staticmethod
+    def _cache_preview(cache_key, content, status_code, headers, *, personalised):
+        if status_code != 200 or len(content) > current_app.config["LETTER_PREVIEW_CACHE_MAX_BYTES"]:
+            return
+
+        cache_control = parse_cache_control_header(
+            {key.lower(): value for key, value in headers}.get("cache-control"),
+            cls=ResponseCacheControl,
+        )
+        if cache_control.no_store or cache_control.no_cache:
+            return
+
+        ttl_in_seconds = current_app.config[
+            "LETTER_PREVIEW_PERSONALISED_CACHE_TTL" if personalised else "LETTER_PREVIEW_CACHE_TTL"
+        ]
+        if cache_control.max_age is not None:
+            ttl_in_seconds = min(cache_control.max_age, ttl_in_seconds)
+
+        if ttl_in_seconds <= 0:
+            return
+
+        cached_preview = json.dumps(
+            {
+                "content": base64.b64encode(content).decode("utf-8"),
+                "status_code": status_code,
+                "headers": headers,
+            }
+        )
+        redis_client.set(cache_key, cached_preview, ex=ttl_in_seconds)
+        TemplatePreviewClient._remove_cached_previews_over_size_limit(
+            cache_key, len(cached_preview), ttl_in_seconds=ttl_in_seconds
+        )
+
+    @staticmethod
+    def _remove_cached_previews_over_size_limit(cache_key, size, *, ttl_in_seconds):
+        if not redis_client.active:
+            return
+
+        now = time()
+
+        try:
+            redis_client.redis_store.eval(
+                _INDEX_CACHED_PREVIEW_SCRIPT,
+                3,
+                LETTER_PREVIEW_CACHE_INDEX_KEY,
+                LETTER_PREVIEW_CACHE_SIZES_KEY,
+                LETTER_PREVIEW_CACHE_TOTAL_SIZE_KEY,
+                cache_key,
+                size,
+                now + ttl_in_seconds,
+                now,
+                current_app.config["LETTER_PREVIEW_CACHE_MAX_TOTAL_BYTES"],
+            )
+        except Exception:
+            current_app.logger.warning("Failed to remove old letter previews from the cache", exc_info=True)
+
     def get_png_for_valid_pdf_page(self, pdf_file, page):
         pdf_page = extract_page_from_pdf(BytesIO(pdf_file), int(page) - 1)
+        return self.get_png_for_valid_single_page_pdf(pdf_page, page)
 
+    def get_png_for_valid_single_page_pdf(self, pdf_page, page):
         response = self.requests_session.post(
             "{}/precompiled-preview.png{}".format(self.api_host, "?hide_notify=true" if page == "1" else ""),
             data=base64.b64encode(pdf_page).decode("utf-8"),
@@ -87,7 +237,9 @@ class TemplatePreviewClient:
 
     def get_png_for_invalid_pdf_page(self, pdf_file, page, is_an_attachment=False):
         pdf_page = extract_page_from_pdf(BytesIO(pdf_file), int(page) - 1)
+        return self.get_png_for_invalid_single_page_pdf(pdf_page, page, is_an_attachment=is_an_attachment)
 
+    def get_png_for_invalid_single_page_pdf(self, pdf_page, page, is_an_attachment=False):
         response = self.requests_session.post(
             "{}/precompiled/overlay.png{}".format(
                 self.api_host,
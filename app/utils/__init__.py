@@ -1,10 +1,11 @@
 import hashlib
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 from functools import wraps
 from itertools import chain
 
-from flask import abort, g, make_response, request
+from flask import abort, g, jsonify, make_response, request
 from notifications_utils.field import Field
+from notifications_utils.json import RelaxedContainerJSONEncoder as RCJSONEncoder
 from ordered_set import OrderedSet
 from werkzeug.datastructures import MultiDict
 from werkzeug.routing import RequestRedirect
@@ -129,6 +130,45 @@ def hide_from_search_engines(f):
     return decorated_function
 
 
+STOP_POLLING = "stop"
+
+
+def make_json_updates_response(render_partials, *data, poll_interval=None):
+    """
+    Responds to a page polling for updates with freshly rendered partials, unless the data they’re rendered from
+    is the same as last time the page asked, in which case we can skip rendering and respond with 304 Not Modified.
+
+    The current minute is part of the fingerprint, so that times shown relative to now still get updated.
+
+    `poll_interval` tells the page how many seconds to wait before asking again, or `STOP_POLLING` if nothing it
+    shows can change any more. Without it the page works out how often to poll by itself.
+    """
+    etag = hashlib.sha256(
+        RCJSONEncoder(sort_keys=True)
+        .encode(
+            {
+                "path": request.full_path,
+                "user_id": current_user.id,
+                "minute": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M"),
+                "data": data,
+            }
+        )
+        .encode()
+    ).hexdigest()
+
+    if request.method == "GET" and etag in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = jsonify(render_partials())
+
+    response.set_etag(etag)
+
+    if poll_interval is not None:
+        response.headers["X-Poll-Interval"] = str(poll_interval)
+
+    return response
+
+
 # Function to merge two dict or lists with a JSON-like structure into one.
 # JSON-like means they can contain all types JSON can: all the main primitives
 # plus nested lists or dictionaries.
@@ -1,64 +1,186 @@
+import csv
+from collections import OrderedDict
+from functools import partial
+from io import StringIO
+from time import monotonic, sleep
+
+from flask import current_app, stream_with_context
 from notifications_python_client.errors import HTTPError
 from notifications_utils.recipients import RecipientCSV
 
 from app.formatters import recipient_count
 from app.models.notification import NotificationsForCSV
 from app.models.spreadsheet import Spreadsheet
+from app.notify_client import fan_out
 from app.utils.templates import get_sample_template
 
 
-def get_errors_for_csv(recipients, template_type):
+class RowErrorSummary:
+    """
+    Counts how many rows of a `RecipientCSV` have each kind of error,
+    looking at every row once rather than once per kind of error.
+    """
+
+    def __init__(self, recipients):
+        self.rows_with_errors = 0
+        self.rows_with_bad_recipients = 0
+        self.rows_with_missing_data = 0
+        self.rows_with_message_too_long = 0
+        self.rows_with_empty_message = 0
+        self.rows_with_bad_qr_codes = 0
+
+        for row in recipients.rows:
+            self.rows_with_errors += bool(row.has_error)
+            self.rows_with_bad_recipients += bool(row.has_bad_recipient)
+            self.rows_with_missing_data += bool(row.has_missing_data)
+            self.rows_with_message_too_long += bool(row.message_too_long)
+            self.rows_with_empty_message += bool(row.message_empty)
+            self.rows_with_bad_qr_codes += bool(row.qr_code_too_long)
+
+
+def get_errors_for_csv(recipients, template_type, row_error_summary=None):
+    summary = row_error_summary or RowErrorSummary(recipients)
     errors = []
 
-    if any(recipients.rows_with_bad_recipients):
-        number_of_bad_recipients = len(list(recipients.rows_with_bad_recipients))
-        errors.append(f"fix {recipient_count(number_of_bad_recipients, template_type)}")
+    if summary.rows_with_bad_recipients:
+        errors.append(f"fix {recipient_count(summary.rows_with_bad_recipients, template_type)}")
 
-    if any(recipients.rows_with_missing_data):
-        number_of_rows_with_missing_data = len(list(recipients.rows_with_missing_data))
-        if 1 == number_of_rows_with_missing_data:
+    if summary.rows_with_missing_data:
+        if 1 == summary.rows_with_missing_data:
             errors.append("enter missing data in 1 row")
         else:
-            errors.append(f"enter missing data in {number_of_rows_with_missing_data} rows")
+            errors.append(f"enter missing data in {summary.rows_with_missing_data} rows")
 
-    if any(recipients.rows_with_message_too_long):
-        number_of_rows_with_message_too_long = len(list(recipients.rows_with_message_too_long))
-        if 1 == number_of_rows_with_message_too_long:
+    if summary.rows_with_message_too_long:
+        if 1 == summary.rows_with_message_too_long:
             errors.append("shorten the message in 1 row")
         else:
-            errors.append(f"shorten the messages in {number_of_rows_with_message_too_long} rows")
+            errors.append(f"shorten the messages in {summary.rows_with_message_too_long} rows")
 
-    if any(recipients.rows_with_empty_message):
-        number_of_rows_with_empty_message = len(list(recipients.rows_with_empty_message))
-        if 1 == number_of_rows_with_empty_message:
+    if summary.rows_with_empty_message:
+        if 1 == summary.rows_with_empty_message:
             errors.append("check you have content for the empty message in 1 row")
         else:
-            errors.append(f"check you have content for the empty messages in {number_of_rows_with_empty_message} rows")
+            errors.append(f"check you have content for the empty messages in {summary.rows_with_empty_message} rows")
 
-    if any(recipients.rows_with_bad_qr_codes):
-        number_of_rows_with_bad_qr_codes = len(list(recipients.rows_with_bad_qr_codes))
-        if 1 == number_of_rows_with_bad_qr_codes:
+    if summary.rows_with_bad_qr_codes:
+        if 1 == summary.rows_with_bad_qr_codes:
             errors.append("enter fewer characters for the QR code links in 1 row")
         else:
-            errors.append(f"enter fewer characters for the QR code links in {number_of_rows_with_bad_qr_codes} rows")
+            errors.append(f"enter fewer characters for the QR code links in {summary.rows_with_bad_qr_codes} rows")
 
     return errors
 
 
+class OriginalUploadRows:
+    """
+    Gives access to the values in each row of the file originally uploaded
+    for a job, reading the file as far as the requested row rather than
+    parsing (and validating) the whole thing up front.
+
+    Rows can be asked for in any order, and more than once. Only the values
+    of the most recently used `MAX_ROWS_KEPT` rows are kept. Asking for a row
+    that has been forgotten means reading the file again from the start.
+    Notifications come back newest first, so this happens about once every
+    `MAX_ROWS_KEPT` rows for a large job.
+    """
+
+    MAX_ROWS_KEPT = 10_000
+
+    def __init__(self, recipient_csv):
+        self.column_headers = recipient_csv.column_headers
+        self._recipient_csv = recipient_csv
+        self._rows = recipient_csv.get_rows()
+        self._next_index = 0
+        self._kept = OrderedDict()
+
+    def __getitem__(self, index):
+        if index in self._kept:
+            self._kept.move_to_end(index)
+            return self._kept[index]
+
+        if index < self._next_index:
+            self._rows = self._recipient_csv.get_rows()
+            self._next_index = 0
+
+        for row in self._rows:
+            self._next_index = row.index + 1
+            self._kept[row.index] = [row.get(header).data for header in self.column_headers]
+
+            if len(self._kept) > self.MAX_ROWS_KEPT:
+                self._kept.popitem(last=False)
+
+            if row.index == index:
+                return self._kept[index]
+
+        raise IndexError(f"No row {index} in original upload")
+
+
+def _get_notifications_csv_batch(**kwargs):
+    try:
+        return NotificationsForCSV(**kwargs)
+    except HTTPError as e:
+        # if we get 404, means last page was not there - so just finish up cleanly
+        if e.status_code == 404:
+            return None
+        raise e
+
+
+def _get_notifications_csv_row(notification, original_upload):
+    if original_upload is not None:
+        return (
+            [
+                notification.row_number,
+            ]
+            + original_upload[notification.row_number - 1]
+            + [
+                notification.template_name,
+                notification.template_type,
+                notification.job_name,
+                notification.status,
+                notification.created_at,
+            ]
+        )
+
+    return [
+        # the recipient for precompiled letters is the full address block
+        notification.recipient.splitlines()[0].lstrip().rstrip(" ,"),
+        notification.client_reference,
+        notification.template_name,
+        notification.template_type,
+        notification.created_by_name or "",
+        notification.created_by_email_address or "",
+        notification.job_name or "",
+        notification.status,
+        notification.created_at,
+        notification.api_key_name or "",
+    ]
+
+
 def generate_notifications_csv(**kwargs):
+    """
+    Yields a CSV of notifications, one chunk per page of notifications. The
+    first chunk starts with the header.
+
+    The same CSV writer and buffer are used for every row, and the next page
+    of notifications is fetched from the API while the current one is being
+    written, so the time taken is mostly that of the API calls.
+    """
     from app.s3_client.s3_csv_client import s3download
 
     if "page" not in kwargs:
         kwargs["page"] = 1
 
+    original_upload = None
+
     if kwargs.get("job_id"):
-        original_file_contents = s3download(kwargs["service_id"], kwargs["job_id"])
-        original_upload = RecipientCSV(
-            original_file_contents,
-            template=get_sample_template(kwargs["template_type"]),
+        original_upload = OriginalUploadRows(
+            RecipientCSV(
+                s3download(kwargs["service_id"], kwargs["job_id"]),
+                template=get_sample_template(kwargs["template_type"]),
+            )
         )
-        original_column_headers = original_upload.column_headers
-        fieldnames = ["Row number"] + original_column_headers + ["Template", "Type", "Job", "Status", "Time"]
+        fieldnames = ["Row number"] + original_upload.column_headers + ["Template", "Type", "Job", "Status", "Time"]
     else:
         fieldnames = [
             "Recipient",
@@ -73,55 +195,81 @@ def generate_notifications_csv(**kwargs):
             "API key name",
         ]
 
-    yield ",".join(fieldnames) + "\n"
+    buffer = StringIO()
+    writer = csv.writer(buffer)
 
-    while True:
-        try:
-            notifications_batch = NotificationsForCSV(**kwargs)
-        except HTTPError as e:
-            # if we get 404, means last page was not there - so just finish up cleanly
-            if e.status_code == 404:
-                return
-            else:
-                raise e
-
-        for notification in notifications_batch:
-            if kwargs.get("job_id"):
-                values = (
-                    [
-                        notification.row_number,
-                    ]
-                    + [
-                        original_upload[notification.row_number - 1].get(header).data
-                        for header in original_column_headers
-                    ]
-                    + [
-                        notification.template_name,
-                        notification.template_type,
-                        notification.job_name,
-                        notification.status,
-                        notification.created_at,
-                    ]
-                )
-            else:
-                values = [
-                    # the recipient for precompiled letters is the full address block
-                    notification.recipient.splitlines()[0].lstrip().rstrip(" ,"),
-                    notification.client_reference,
-                    notification.template_name,
-                    notification.template_type,
-                    notification.created_by_name or "",
-                    notification.created_by_email_address or "",
-                    notification.job_name or "",
-                    notification.status,
-                    notification.created_at,
-                    notification.api_key_name or "",
-                ]
-            yield Spreadsheet.from_rows([map(str, values)]).as_csv_data
+    # the header is sent along with the first page, so that if we can’t get the first page there’s an error
+    # before the response starts, rather than a download with nothing but a header in it
+    buffer.write(",".join(fieldnames) + "\n")
 
+    def write_rows(notifications_batch):
+        for i, notification in enumerate(notifications_batch):
+            writer.writerow(map(str, _get_notifications_csv_row(notification, original_upload)))
+
+            if not (i + 1) % Spreadsheet.AS_CSV_LOOP_INTERRUPTIBLE_EVERY:
+                # let other green threads (like the one fetching the next page) run
+                sleep(0)
+
+    notifications_batch = _get_notifications_csv_batch(**kwargs)
+
+    if notifications_batch is None:
+        yield buffer.getvalue()
+
+    while notifications_batch is not None:
         if len(notifications_batch) == kwargs["page_size"]:
             kwargs["page"] += 1
             kwargs["older_than"] = notifications_batch[-1].id
+            _, next_notifications_batch = fan_out(
+                partial(write_rows, notifications_batch),
+                partial(_get_notifications_csv_batch, **kwargs),
+            )
         else:
-            return
-    raise Exception("Should never reach here")
+            write_rows(notifications_batch)
+            next_notifications_batch = None
+
+        yield buffer.getvalue()
+
+        buffer.seek(0)
+        buffer.truncate()
+        notifications_batch = next_notifications_batch
+
+
+def stream_csv(chunks, *, min_chunk_size=64 * 1024):
+    """
+    Sends the chunks of a CSV to the client as they are generated, rather than building the whole file in memory
+    first. Small chunks are joined together so we don’t send lots of tiny writes.
+
+    The first chunk is generated before the response starts, so that problems getting the data (like a missing
+    job, or the first page of notifications) still turn into an error page. A problem after that can only stop
+    the response part way through, which the client will see as a failed download.
+    """
+    started_at = monotonic()
+    chunks = iter(chunks)
+    first_chunk = next(chunks, "")
+
+    def generate():
+        extra = {"time_to_first_byte": monotonic() - started_at, "csv_length": len(first_chunk)}
+        try:
+            yield first_chunk
+
+            pending, pending_size = [], 0
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= min_chunk_size:
+                    yield "".join(pending)
+                    extra["csv_length"] += pending_size
+                    pending, pending_size = [], 0
+
+            if pending:
+                yield "".join(pending)
+                extra["csv_length"] += pending_size
+        finally:
+            extra["duration"] = monotonic() - started_at
+            current_app.logger.info(
+                "Streamed CSV of %(csv_length)s characters in %(duration)ss, first byte after %(time_to_first_byte)ss",
+                extra,
+                extra=extra,
+            )
+
+    return stream_with_context(generate())
@@ -0,0 +1,48 @@
+import secrets
+
+from flask import current_app
+
+from app.extensions import redis_client
+
+# only delete the lock if it’s still ours – it might have expired and been taken by someone else
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Returned instead of a token when Redis can’t be reached. There’s no telling whether anyone else has the lock, but
+# nobody can be storing anything for us to wait for either, so it’s best to get on with the work straight away
+NO_LOCK = "no-lock"
+
+
+def acquire_lock(lock_key, *, ttl_in_seconds):
+    """
+    Tries to take a lock in Redis which expires after `ttl_in_seconds`, so that only one worker does some
+    piece of work at once.
+
+    Returns a token to pass to `release_lock` if we got the lock, or `None` if someone else has it. If Redis
+    couldn’t be reached, returns `NO_LOCK` so the caller does the work itself rather than waiting for someone else.
+    """
+    token = secrets.token_urlsafe(16)
+
+    try:
+        if redis_client.redis_store.set(lock_key, token, nx=True, ex=ttl_in_seconds):
+            return token
+    except Exception:
+        current_app.logger.warning("Failed to take lock %s", lock_key, exc_info=True)
+        return NO_LOCK
+
+    return None
+
+
+def release_lock(lock_key, token):
+    if token == NO_LOCK:
+        return
+
+    try:
+        redis_client.redis_store.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+    except Exception:
+        # it will expire on its own
+        current_app.logger.warning("Failed to release lock %s", lock_key, exc_info=True)
@@ -0,0 +1,67 @@
+"""
+The rules for working out how many text messages an SMS template will be charged as.
+
+The template editor counts fragments in the browser using these rules, rather than asking the server after every
+key press. They’re built from the same constants `SMSMessageTemplate` uses, and tests/sms-fragment-counts.json holds
+examples which both this and the browser have to agree with `SMSMessageTemplate` on.
+"""
+
+from functools import cache
+
+from notifications_utils import SMS_CHAR_COUNT_LIMIT
+from notifications_utils.field import Field
+from notifications_utils.sanitise_text import SanitiseSMS
+
+# Bump this if the shape of the rules changes, so that browsers with old javascript ask the server to count instead
+SMS_FRAGMENT_COUNTING_RULES_VERSION = 2
+
+# Latin letters with accents, some of which downgrade to a Welsh letter which isn’t in the GSM character set
+_LATIN_CHARACTERS_WITH_ACCENTS = [*range(0x00C0, 0x0250), *range(0x1E00, 0x1F00)]
+
+
+def _get_replacement_characters():
+    """
+    The characters which are changed before a message is sent into something which doesn’t count as a single
+    GSM character, for example `…` becomes `...` and zero width spaces are removed.
+
+    Any other character which isn’t allowed is sent as a single GSM character (without its accent, or as a `?`),
+    so the browser doesn’t need to know about it.
+    """
+    replacement_characters = {}
+
+    for character in set(SanitiseSMS.REPLACEMENT_CHARACTERS) | set(map(chr, _LATIN_CHARACTERS_WITH_ACCENTS)):
+        if character in SanitiseSMS.ALLOWED_CHARACTERS:
+            continue
+
+        replacement = SanitiseSMS.encode(character)
+
+        if len(replacement) != 1 or replacement in (
+            SanitiseSMS.EXTENDED_GSM_CHARACTERS | SanitiseSMS.WELSH_NON_GSM_CHARACTERS
+        ):
+            replacement_characters[character] = replacement
+
+    return replacement_characters
+
+
+@cache
+def get_sms_fragment_counting_rules():
+    return {
+        "version": SMS_FRAGMENT_COUNTING_RULES_VERSION,
+        "character_limit": SMS_CHAR_COUNT_LIMIT,
+        # a message which fits in one fragment can use all of it, but each part of a longer message loses a few
+        # characters to the header which tells the phone how to join them back together
+        "fragment_lengths": {
+            "gsm": {"single": 160, "multipart": 153},
+            "unicode": {"single": 70, "multipart": 67},
+        },
+        # characters in the GSM character set (including the extended ones) are sent as they are
+        "gsm_characters": "".join(sorted(SanitiseSMS.GSM_CHARACTERS)),
+        # these take up 2 characters each, because they’re sent as an escape character followed by another one
+        "extended_gsm_characters": "".join(sorted(SanitiseSMS.EXTENDED_GSM_CHARACTERS)),
+        # any one of these means the whole message has to be sent as unicode
+        "unicode_characters": "".join(sorted(SanitiseSMS.WELSH_NON_GSM_CHARACTERS)),
+        # these are changed before the message is sent, so count as whatever they’re changed into
+        "replacement_characters": _get_replacement_characters(),
+        # personalisation doesn’t count towards the length of the template
+        "placeholder_pattern": Field.placeholder_pattern.pattern,
+    }
@@ -0,0 +1,201 @@
+"""
+Converts uploaded spreadsheets to CSV in separate worker processes.
+
+Parsing a big xlsx file with openpyxl can keep the CPU busy for seconds at a time, and while it does nothing else
+being served by the same gunicorn worker gets a look in. Doing the parsing in a child process means the worker
+only has to wait on a pipe, which lets eventlet get on with other requests.
+
+Run as a module (`python -m app.utils.spreadsheet_conversion`) this is the child process, which converts
+spreadsheets it’s sent on stdin and writes the CSV back to stdout, one after another, until stdin is closed.
+"""
+
+import json
+import os
+import pickle
+import struct
+import sys
+from io import BytesIO
+
+import eventlet
+from eventlet.green import subprocess
+from eventlet.queue import Empty, LightQueue
+
+from app.models.spreadsheet import Spreadsheet
+
+# each frame is a one byte kind, followed by the length of its payload
+_FRAME_HEADER = struct.Struct(">cI")
+_REQUEST = b"r"
+_DATA = b"d"
+_ERROR = b"e"
+_END = b"x"
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def _read_exactly(stream, size):
+    data = b""
+    while len(data) < size:
+        if not (chunk := stream.read(size - len(data))):
+            raise EOFError("Spreadsheet conversion process closed the pipe")
+        data += chunk
+    return data
+
+
+def _read_frame(stream):
+    kind, size = _FRAME_HEADER.unpack(_read_exactly(stream, _FRAME_HEADER.size))
+    return kind, _read_exactly(stream, size)
+
+
+def _write_frame(stream, kind, payload=b""):
+    stream.write(_FRAME_HEADER.pack(kind, len(payload)))
+    stream.write(payload)
+
+
+def _pickle_exception(exception):
+    try:
+        return pickle.dumps(exception)
+    except Exception:
+        return pickle.dumps(RuntimeError(repr(exception)))
+
+
+def serve(stdin, stdout):
+    while True:
+        try:
+            _, request = _read_frame(stdin)
+        except EOFError:
+            return
+
+        request = json.loads(request)
+        _, file_content = _read_frame(stdin)
+
+        try:
+            csv_data = Spreadsheet.from_file(BytesIO(file_content), filename=request["filename"]).as_csv_data.encode()
+        except Exception as e:
+            _write_frame(stdout, _ERROR, _pickle_exception(e))
+        else:
+            for start in range(0, len(csv_data), _CHUNK_SIZE):
+                _write_frame(stdout, _DATA, csv_data[start : start + _CHUNK_SIZE])
+            _write_frame(stdout, _END)
+
+        stdout.flush()
+
+
+class SpreadsheetConversionPool:
+    class ConversionTimeoutError(TimeoutError):
+        pass
+
+    EXTENSIONS = ("xlsx", "xlsm", "xls", "ods")
+
+    processes: int = 0
+    max_queued: int = 0
+    timeout: float = 0
+    inline_below_bytes: int = 0
+
+    def __init__(self):
+        self._reset()
+
+    def init_app(self, application):
+        self.processes = application.config["SPREADSHEET_CONVERSION_PROCESSES"]
+        self.max_queued = application.config["SPREADSHEET_CONVERSION_MAX_QUEUED"]
+        self.timeout = application.config["SPREADSHEET_CONVERSION_TIMEOUT"]
+        self.inline_below_bytes = application.config["SPREADSHEET_CONVERSION_INLINE_BELOW_BYTES"]
+
+    def _reset(self):
+        # gunicorn forks workers after the app is loaded, so each process needs its own children
+        self._pid = os.getpid()
+        self._idle = LightQueue()
+        self._started = 0
+        self._waiting = 0
+
+    @staticmethod
+    def _get_size(file_content):
+        start = file_content.tell()
+        file_content.seek(0, os.SEEK_END)
+        size = file_content.tell() - start
+        file_content.seek(start)
+        return size
+
+    def convert_to_csv(self, file_content, filename):
+        if (
+            not self.processes
+            or Spreadsheet.get_extension(filename) not in self.EXTENSIONS
+            or self._get_size(file_content) < self.inline_below_bytes
+        ):
+            return Spreadsheet.from_file(file_content, filename=filename).as_csv_data
+
+        return self._convert_in_worker_process(file_content.read(), filename)
+
+    def _start_process(self):
+        return subprocess.Popen(
+            [sys.executable, "-m", "app.utils.spreadsheet_conversion"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def _check_out_process(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        if self._started < self.processes:
+            self._started += 1
+            try:
+                return self._start_process()
+            except Exception:
+                self._started -= 1
+                raise
+
+        if self._waiting >= self.max_queued:
+            raise self.ConversionTimeoutError("Too many spreadsheets are already waiting to be converted")
+
+        self._waiting += 1
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except Empty:
+            raise self.ConversionTimeoutError("Timed out waiting for a spreadsheet conversion process") from None
+        finally:
+            self._waiting -= 1
+
+    def _discard_process(self, process):
+        self._started -= 1
+        process.kill()
+        process.wait()
+
+    def _convert_in_worker_process(self, file_content, filename):
+        process = self._check_out_process()
+        csv_chunks = []
+
+        try:
+            with eventlet.Timeout(self.timeout, self.ConversionTimeoutError(f"Timed out converting {filename}")):
+                _write_frame(process.stdin, _REQUEST, json.dumps({"filename": filename}).encode())
+                _write_frame(process.stdin, _REQUEST, file_content)
+                process.stdin.flush()
+
+                while (frame := _read_frame(process.stdout))[0] == _DATA:
+                    csv_chunks.append(frame[1])
+        except BaseException:
+            # we don’t know what state the process is in, so don’t give it to anyone else
+            self._discard_process(process)
+            raise
+
+        self._idle.put(process)
+
+        kind, payload = frame
+        if kind == _ERROR:
+            raise pickle.loads(payload)
+
+        return b"".join(csv_chunks).decode()
+
+
+spreadsheet_conversion_pool = SpreadsheetConversionPool()
+
+
+if __name__ == "__main__":
+    stdout = sys.stdout.buffer
+    # stdout is only for talking to the parent process, so anything else printed mustn’t end up there
+    sys.stdout = sys.stderr
+    serve(sys.stdin.buffer, stdout)
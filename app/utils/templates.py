@@ -1,3 +1,4 @@
+import hashlib
 import json
 from typing import Any
 
@@ -161,18 +162,7 @@ class TemplatedLetterImageTemplate(BaseLetterImageTemplate):
         if self._all_page_counts:
             return self._all_page_counts
 
-        if self.values:
-            self._all_page_counts = template_preview_client.get_page_counts_for_letter(
-                self._template,
-                service=current_service,
-                values=self.values,
-            )
-            return self._all_page_counts
-
-        cache_key = (
-            f"service-{self.get_raw('service')}-template-{self.id}-version-{self.get_raw('version')}-all-page-counts"
-        )
-        if cached_value := redis_client.get(cache_key):
+        if cached_value := redis_client.get(self._all_page_counts_cache_key):
             self._all_page_counts = json.loads(cached_value)
             return self._all_page_counts
 
@@ -181,10 +171,33 @@ class TemplatedLetterImageTemplate(BaseLetterImageTemplate):
             service=current_service,
             values=self.values,
         )
-        redis_client.set(cache_key, RCJSONEncoder().encode(self._all_page_counts), ex=cache.DEFAULT_TTL)
+        redis_client.set(
+            self._all_page_counts_cache_key,
+            RCJSONEncoder().encode(self._all_page_counts),
+            ex=cache.DEFAULT_TTL,
+        )
 
         return self._all_page_counts
 
+    @property
+    def _all_page_counts_cache_key(self):
+        cache_key = (
+            f"service-{self.get_raw('service')}-template-{self.id}-version-{self.get_raw('version')}-all-page-counts"
+        )
+
+        if not self.values:
+            return cache_key
+
+        # A version of a template always gives the same page counts for the same personalisation, so we can
+        # address the cached value by its content
+        values_hash = hashlib.sha256(
+            RCJSONEncoder(sort_keys=True)
+            .encode({"values": dict(self.values), "letter_contact_block": self.get_raw("reply_to_text")})
+            .encode("utf-8")
+        ).hexdigest()
+
+        return f"{cache_key}-{values_hash}"
+
     @property
     def page_count(self):
         return self.all_page_counts["count"]
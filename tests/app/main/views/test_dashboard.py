@@ -1,4 +1,5 @@
 import copy
+import itertools
 import json
 from datetime import UTC, datetime
 
@@ -6,6 +7,7 @@ import pytest
 from flask import url_for
 from freezegun import freeze_time
 
+from app.extensions import redis_client
 from app.main.views.dashboard import (
     aggregate_notifications_stats,
     aggregate_status_types,
@@ -413,7 +415,7 @@ def test_view_inbox_updates(
 
     assert json.loads(response.get_data(as_text=True)) == {"messages": "foo"}
 
-    mock_get_partials.assert_called_once_with(SERVICE_ONE_ID)
+    mock_get_partials.assert_called_once_with(SERVICE_ONE_ID, {"has_next": False, "data": []})
 
 
 @freeze_time("2016-07-01 13:00")
@@ -1547,6 +1549,143 @@ def test_service_dashboard_updates_gets_dashboard_totals(
     assert "123" in numbers
     assert "456" in numbers
     assert "789" in numbers
+    assert json_response.headers["X-Poll-Interval"] == "5"
+
+
+FRESH = datetime(2024, 1, 1, 12, 0, 3, tzinfo=UTC).timestamp()
+OUT_OF_DATE = datetime(2024, 1, 1, 11, 59, 57, tzinfo=UTC).timestamp()
+
+
+@freeze_time("2024-01-01 12:00:00")
+@pytest.mark.parametrize(
+    "fresh_until_each_read, lock_token, expected_totals, expect_rendered, expect_stored",
+    (
+        # still fresh, so used as is
+        ([FRESH], "our-token", "cached totals", False, False),
+        # out of date, but someone else is already rendering new ones
+        ([OUT_OF_DATE], None, "cached totals", False, False),
+        # out of date, and it’s our turn to render new ones
+        ([OUT_OF_DATE], "our-token", "rendered totals", True, True),
+        # not rendered yet, and it’s our turn to do it
+        ([None], "our-token", "rendered totals", True, True),
+        # not rendered yet, but someone else is doing it so we wait for them
+        ([None, None, FRESH], None, "cached totals", False, False),
+        # not rendered yet, and whoever is doing it is taking too long
+        ([None, None, None, None], None, "rendered totals", True, False),
+    ),
+)
+def test_service_dashboard_updates_shares_cached_partials(
+    client_request,
+    mock_get_service_templates,
+    mock_get_template_statistics,
+    mock_get_service_statistics,
+    mock_get_unsubscribe_requests_statistics,
+    mock_has_no_jobs,
+    mock_get_inbound_sms_summary,
+    mock_get_returned_letter_statistics_with_no_returned_letters,
+    mocker,
+    fresh_until_each_read,
+    lock_token,
+    expected_totals,
+    expect_rendered,
+    expect_stored,
+):
+    cache_key = f"service-{SERVICE_ONE_ID}-dashboard-partials"
+    cached_values = iter(
+        fresh_until
+        and json.dumps(
+            {"fresh_until": fresh_until, "partials": {"totals": "cached totals", "template-statistics": "cached stats"}}
+        )
+        for fresh_until in fresh_until_each_read
+    )
+    mocker.patch.object(redis_client, "active", True)
+    mock_redis_get = mocker.patch(
+        "app.extensions.RedisClient.get",
+        side_effect=lambda key, *args, **kwargs: next(cached_values) if key == cache_key else None,
+    )
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_acquire_lock = mocker.patch("app.main.views.dashboard.acquire_lock", return_value=lock_token)
+    mock_release_lock = mocker.patch("app.main.views.dashboard.release_lock")
+    mocker.patch("app.main.views.dashboard.sleep")
+    # time stands still with freeze_time, so move it on half a second each time we check
+    mocker.patch("app.main.views.dashboard.monotonic", side_effect=itertools.count(0, 0.5))
+    mocker.patch(
+        "app.main.views.dashboard.render_shared_dashboard_partials",
+        return_value={"totals": "rendered totals", "template-statistics": "rendered stats"},
+    )
+
+    json_response = client_request.get_response("json_updates.service_dashboard_updates", service_id=SERVICE_ONE_ID)
+    json_content = json.loads(json_response.get_data(as_text=True))
+
+    assert json_content["totals"] == expected_totals
+    assert [call.args[0] for call in mock_redis_get.call_args_list].count(cache_key) == len(fresh_until_each_read)
+
+    if fresh_until_each_read[0] != FRESH:
+        mock_acquire_lock.assert_called_once_with(f"{cache_key}-lock", ttl_in_seconds=5)
+
+    if expect_stored:
+        assert mock_redis_set.call_args[0][0] == cache_key
+        assert json.loads(mock_redis_set.call_args[0][1]) == {
+            "fresh_until": datetime(2024, 1, 1, 12, 0, 5, tzinfo=UTC).timestamp(),
+            "partials": {"totals": "rendered totals", "template-statistics": "rendered stats"},
+        }
+        assert mock_redis_set.call_args[1] == {"ex": 60}
+        mock_release_lock.assert_called_once_with(f"{cache_key}-lock", "our-token")
+    else:
+        assert not any(call[0][0] == cache_key for call in mock_redis_set.call_args_list)
+        assert mock_release_lock.called is False
+
+
+def test_service_dashboard_updates_renders_partials_straight_away_if_redis_is_unavailable(
+    client_request,
+    mock_get_service_templates,
+    mock_get_template_statistics,
+    mock_get_service_statistics,
+    mock_get_unsubscribe_requests_statistics,
+    mock_has_no_jobs,
+    mock_get_inbound_sms_summary,
+    mock_get_returned_letter_statistics_with_no_returned_letters,
+    mocker,
+):
+    mocker.patch.object(redis_client, "active", True)
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.extensions.RedisClient.set")
+    mock_redis_store = mocker.patch.object(redis_client, "redis_store")
+    mock_redis_store.set.side_effect = ConnectionError
+    mock_sleep = mocker.patch("app.main.views.dashboard.sleep")
+    mocker.patch(
+        "app.main.views.dashboard.render_shared_dashboard_partials",
+        return_value={"totals": "rendered totals", "template-statistics": "rendered stats"},
+    )
+
+    json_response = client_request.get_response("json_updates.service_dashboard_updates", service_id=SERVICE_ONE_ID)
+
+    assert json.loads(json_response.get_data(as_text=True))["totals"] == "rendered totals"
+    assert mock_sleep.called is False
+    assert mock_redis_store.eval.called is False
+
+
+def test_service_dashboard_updates_releases_lock_if_rendering_fails(
+    client_request,
+    mock_get_service_templates,
+    mock_get_template_statistics,
+    mock_get_service_statistics,
+    mock_get_unsubscribe_requests_statistics,
+    mock_has_no_jobs,
+    mock_get_inbound_sms_summary,
+    mock_get_returned_letter_statistics_with_no_returned_letters,
+    mocker,
+):
+    mocker.patch.object(redis_client, "active", True)
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.main.views.dashboard.acquire_lock", return_value="our-token")
+    mock_release_lock = mocker.patch("app.main.views.dashboard.release_lock")
+    mocker.patch("app.main.views.dashboard.render_shared_dashboard_partials", side_effect=ValueError)
+
+    with pytest.raises(ValueError):
+        client_request.get_response("json_updates.service_dashboard_updates", service_id=SERVICE_ONE_ID)
+
+    mock_release_lock.assert_called_once_with(f"service-{SERVICE_ONE_ID}-dashboard-partials-lock", "our-token")
 
 
 def test_service_dashboard_totals_link_to_view_notifications(
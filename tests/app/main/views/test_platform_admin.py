@@ -184,7 +184,7 @@ def test_clear_cache_shows_form(
                     "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-version-*"
                 ),
                 call(
-                    "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-versions"
+                    "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-versions*"
                 ),
                 call(
                     "service-????????-????-????-????-????????????-template-????????-????-????-????-????????????-page-count"
@@ -2,27 +2,51 @@ import json
 import uuid
 from io import BytesIO
 
+from botocore.response import StreamingBody
 from flask import url_for
 from notifications_python_client.errors import HTTPError
 
 from app.main.views.report_requests import ReportRequest
-from tests.conftest import SERVICE_ONE_ID, create_report_request
+from tests.conftest import SERVICE_ONE_ID, create_report_request, set_config
 
 
-def test_report_request_download_gets_file_from_s3(client_request, fake_uuid, mocker):
+def test_report_request_download_gets_file_from_s3(notify_admin, client_request, fake_uuid, mocker):
     report_request = create_report_request(id="5bf2a1f9-0e6b-4d5e-b409-3509bf7a37b0", user_id=fake_uuid)
     mocker.patch("app.report_request_api_client.get_report_request", return_value={"data": report_request})
-    mocker.patch.object(ReportRequest, "download", return_value=BytesIO(b"my notifications file"))
+    file_contents = StreamingBody(BytesIO(b"my notifications file"), len(b"my notifications file"))
+    mocker.patch.object(ReportRequest, "download", return_value=file_contents)
+    mock_get_download_url = mocker.patch.object(ReportRequest, "get_download_url")
 
-    response = client_request.get_response(
-        "main.report_request_download",
-        service_id=SERVICE_ONE_ID,
-        report_request_id=report_request["id"],
-    )
+    with set_config(notify_admin, "REPORT_REQUEST_DOWNLOAD_CHUNK_SIZE", 4):
+        response = client_request.get_response(
+            "main.report_request_download",
+            service_id=SERVICE_ONE_ID,
+            report_request_id=report_request["id"],
+        )
 
     assert response.get_data() == b"my notifications file"
     assert response.headers["Content-Type"] == "text/csv; charset=utf-8"
     assert response.headers["Content-Disposition"] == f"attachment; filename={report_request['id']}.csv"
+    response.close()
+    assert file_contents._raw_stream.closed
+    assert mock_get_download_url.called is False
+
+
+def test_report_request_download_redirects_to_presigned_url(notify_admin, client_request, fake_uuid, mocker):
+    report_request = create_report_request(id="5bf2a1f9-0e6b-4d5e-b409-3509bf7a37b0", user_id=fake_uuid)
+    mocker.patch("app.report_request_api_client.get_report_request", return_value={"data": report_request})
+    mock_download = mocker.patch.object(ReportRequest, "download")
+    mocker.patch.object(ReportRequest, "get_download_url", return_value="https://s3.example.com/report.csv?signed")
+
+    with set_config(notify_admin, "REPORT_REQUEST_DOWNLOAD_VIA_PRESIGNED_URL", True):
+        client_request.get(
+            "main.report_request_download",
+            service_id=SERVICE_ONE_ID,
+            report_request_id=report_request["id"],
+            _expected_redirect="https://s3.example.com/report.csv?signed",
+        )
+
+    assert mock_download.called is False
 
 
 def test_report_request_download_when_report_does_not_exist(client_request, fake_uuid, mocker):
@@ -1,4 +1,5 @@
 import gzip
+import json
 import uuid
 from functools import partial
 from glob import glob
@@ -6,7 +7,7 @@ from io import BytesIO
 from itertools import repeat
 from os import path
 from random import randbytes
-from unittest.mock import ANY, Mock
+from unittest.mock import Mock
 from uuid import uuid4
 from zipfile import BadZipFile
 
@@ -16,6 +17,7 @@ from freezegun import freeze_time
 from notifications_python_client.errors import HTTPError
 from notifications_utils.recipients import RecipientCSV
 from notifications_utils.template import SMSPreviewTemplate
+from werkzeug.exceptions import Forbidden
 from xlrd.biffh import XLRDError
 from xlrd.xldate import XLDateAmbiguous, XLDateError, XLDateNegative, XLDateTooLarge
 
@@ -3333,6 +3335,68 @@ def test_should_show_preview_letter_message(
     assert mocked_preview.call_args_list[0].kwargs["service"].id == service_id
 
 
+def test_preview_letter_message_uses_cached_row_from_checked_upload(
+    client_request,
+    mock_get_service_letter_template,
+    service_one,
+    fake_uuid,
+    mocker,
+):
+    mock_redis_get = mocker.patch(
+        "app.main.views.send.redis_client.get",
+        return_value=json.dumps(
+            {
+                "count_of_recipients": 2,
+                "rows": {"3": {"address line 1": "321 avenue", "postcode": "cba321"}},
+            }
+        ),
+    )
+    mock_s3download = mocker.patch("app.main.views.send.s3download")
+    mocked_preview = mocker.patch("app.template_preview_client.get_preview_for_templated_letter", return_value="foo")
+
+    response = client_request.get_response(
+        "no_cookie.check_messages_preview",
+        service_id=SERVICE_ONE_ID,
+        template_id=fake_uuid,
+        upload_id=fake_uuid,
+        filetype="png",
+        row_index=3,
+    )
+
+    assert response.get_data(as_text=True) == "foo"
+    assert (
+        mocker.call(f"service-{SERVICE_ONE_ID}-upload-{fake_uuid}-template-{fake_uuid}-version-1-checked")
+        in mock_redis_get.call_args_list
+    )
+    assert mock_s3download.called is False
+    assert mocked_preview.call_args_list[0].kwargs["values"] == {"address line 1": "321 avenue", "postcode": "cba321"}
+
+
+def test_preview_letter_message_404s_for_row_outside_cached_upload(
+    client_request,
+    mock_get_service_letter_template,
+    fake_uuid,
+    mocker,
+):
+    mocker.patch(
+        "app.main.views.send.redis_client.get",
+        return_value=json.dumps({"count_of_recipients": 2, "rows": {}}),
+    )
+    mock_s3download = mocker.patch("app.main.views.send.s3download")
+
+    client_request.get_response(
+        "no_cookie.check_messages_preview",
+        service_id=SERVICE_ONE_ID,
+        template_id=fake_uuid,
+        upload_id=fake_uuid,
+        filetype="png",
+        row_index=4,
+        _expected_status=404,
+    )
+
+    assert mock_s3download.called is False
+
+
 def test_dont_show_preview_letter_templates_for_bad_filetype(
     client_request, mock_get_service_template, service_one, fake_uuid
 ):
@@ -4819,6 +4883,31 @@ def test_redirects_to_template_if_job_exists_already(
     )
 
 
+def test_check_messages_403s_without_reading_upload_if_user_cant_use_template(
+    client_request,
+    mock_get_job_doesnt_exist,
+    fake_uuid,
+    mocker,
+):
+    mocker.patch(
+        "app.models.service.Service.get_template_with_user_permission_or_403",
+        side_effect=Forbidden,
+    )
+    mock_s3download = mocker.patch("app.main.views.send.s3download", side_effect=ConnectionError)
+    mock_get_metadata = mocker.patch("app.main.views.send.get_csv_metadata", side_effect=ConnectionError)
+
+    client_request.get(
+        "main.check_messages",
+        service_id=SERVICE_ONE_ID,
+        template_id=fake_uuid,
+        upload_id=fake_uuid,
+        _expected_status=403,
+    )
+
+    assert mock_s3download.called is False
+    assert mock_get_metadata.called is False
+
+
 @pytest.mark.parametrize(
     "template_type, expected_list_id, expected_filenames, expected_time, expected_count",
     (
@@ -4933,15 +5022,14 @@ def test_send_from_contact_list(
     mocker,
 ):
     new_uuid = uuid.uuid4()
-    mock_download = mocker.patch("app.models.contact_list.s3download", return_value="contents")
+    mock_download = mocker.patch("app.models.contact_list.s3download")
     mock_get_metadata = mocker.patch(
         "app.models.contact_list.get_csv_metadata",
         return_value={
             "example_key": "example value",
         },
     )
-    mock_upload = mocker.patch("app.models.contact_list.s3upload", return_value=new_uuid)
-    mock_set_metadata = mocker.patch("app.models.contact_list.set_metadata_on_csv_upload")
+    mock_copy = mocker.patch("app.models.contact_list.copy_csv_upload", return_value=new_uuid)
     client_request.get(
         "main.send_from_contact_list",
         service_id=SERVICE_ONE_ID,
@@ -4957,10 +5045,11 @@ def test_send_from_contact_list(
             emergency_contact=True,
         ),
     )
-    mock_download.assert_called_once_with(SERVICE_ONE_ID, fake_uuid, bucket="test-contact-list")
+    assert mock_download.called is False
     mock_get_metadata.assert_called_once_with(SERVICE_ONE_ID, fake_uuid, bucket="test-contact-list")
-    mock_upload.assert_called_once_with(SERVICE_ONE_ID, "contents", ANY)
-    mock_set_metadata.assert_called_once_with(SERVICE_ONE_ID, new_uuid, example_key="example value")
+    mock_copy.assert_called_once_with(
+        SERVICE_ONE_ID, fake_uuid, from_bucket="test-contact-list", example_key="example value"
+    )
 
 
 def test_send_to_myself_sets_placeholder_and_redirects_for_email(
@@ -3,6 +3,7 @@ from datetime import datetime
 import pytest
 from flask import url_for
 
+from app.template_previews import TemplatePreviewClient, get_template_preview_client
 from tests import template_version_json
 from tests.conftest import normalize_spaces
 
@@ -78,7 +79,7 @@ def test_view_template_versions(
     versions = mock_get_template_versions(service_id, template_id)
     assert api_user_active["name"] in page.text
     assert versions["data"][0]["content"] in page.text
-    mock_get_template_versions.assert_called_with(service_id, template_id)
+    mock_get_template_versions.assert_called_with(service_id, template_id, page=1, page_size=25)
 
 
 def test_view_template_versions_pages(
@@ -92,9 +93,11 @@ def test_view_template_versions_pages(
     template_id = fake_uuid
 
     versions = [template_version_json(service_id, template_id, api_user_active, version=v + 1) for v in range(51)][::-1]
-    mocker.patch(
-        "app.service_api_client.get_service_template_versions", side_effect=lambda sid, tid: {"data": versions}
-    )
+
+    def _get(service_id, template_id, page, page_size):
+        return {"data": versions[(page - 1) * page_size : page * page_size], "total": len(versions)}
+
+    mock_get_template_versions = mocker.patch("app.service_api_client.get_service_template_versions", side_effect=_get)
 
     page = client_request.get(".view_template_versions", service_id=service_id, template_id=template_id)
     assert api_user_active["name"] in page.text
@@ -133,3 +136,62 @@ def test_view_template_versions_pages(
     assert "Version 1: " in page.text
     assert "Next page" not in page.text
     assert "Previous page" in page.text
+    assert mock_get_template_versions.call_args_list == [
+        mocker.call(service_id, template_id, page=page, page_size=25) for page in (1, 2, 3)
+    ]
+
+
+def test_view_template_versions_redirects_to_last_page(
+    client_request,
+    mock_get_template_versions,
+    mock_has_permissions,
+    fake_uuid,
+):
+    client_request.get(
+        ".view_template_versions",
+        service_id=fake_uuid,
+        template_id=fake_uuid,
+        page=2,
+        _expected_redirect=url_for(
+            ".view_template_versions",
+            service_id=fake_uuid,
+            template_id=fake_uuid,
+            page=1,
+        ),
+    )
+
+
+def test_view_template_versions_only_gets_page_counts_for_letters_on_the_page(
+    client_request,
+    api_user_active,
+    mocker,
+    mock_has_permissions,
+    fake_uuid,
+):
+    get_template_preview_client.clear()
+    mock_init_template_preview_client = mocker.spy(TemplatePreviewClient, "__init__")
+    mock_get_page_counts_for_letter = mocker.patch(
+        "app.template_previews.TemplatePreviewClient.get_page_counts_for_letter",
+        return_value={"count": 1, "welsh_page_count": 0, "attachment_page_count": 0},
+    )
+    versions = [
+        template_version_json(fake_uuid, fake_uuid, api_user_active, version=version, type_="letter")
+        for version in range(60, 0, -1)
+    ]
+    mocker.patch(
+        "app.service_api_client.get_service_template_versions",
+        side_effect=lambda service_id, template_id, page, page_size: {
+            "data": versions[(page - 1) * page_size : page * page_size],
+            "total": len(versions),
+        },
+    )
+
+    page = client_request.get(".view_template_versions", service_id=fake_uuid, template_id=fake_uuid, page=3)
+
+    assert "Version 10: " in page.text
+    assert "Version 11: " not in page.text
+    assert sorted(call.args[0]["version"] for call in mock_get_page_counts_for_letter.call_args_list) == list(
+        range(1, 11)
+    )
+    # the page counts are fetched in parallel, all using the same client
+    assert mock_init_template_preview_client.call_count == 1
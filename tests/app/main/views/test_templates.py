@@ -2385,6 +2385,26 @@ def test_choosing_letter_creates(
     )
 
 
+def test_choose_a_template_to_copy_streams_page_for_user_with_several_services(
+    client_request,
+    mock_get_service_templates,
+    mock_get_template_folders,
+    mock_get_no_api_keys,
+    mock_get_just_services_for_user,
+):
+    with client_request.session_transaction() as session:
+        session["_flashes"] = [("default", "Some message")]
+
+    response = client_request.get_response("main.choose_template_to_copy", service_id=SERVICE_ONE_ID)
+
+    assert response.is_streamed
+    assert "Some message" in response.get_data(as_text=True)
+
+    with client_request.session_transaction() as session:
+        # the message was taken out of the session before the page started
+        assert "_flashes" not in session
+
+
 def test_choose_a_template_to_copy(
     client_request,
     mock_get_service_templates,
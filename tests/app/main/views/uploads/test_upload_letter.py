@@ -1,4 +1,5 @@
 from unittest.mock import ANY, Mock
+from uuid import UUID
 
 import pytest
 from flask import make_response, url_for
@@ -683,21 +684,21 @@ def test_uploaded_letter_preview_image_shows_overlay_when_content_outside_printa
     mocker,
 ):
     mocker.patch(
-        "app.main.views.uploads.get_letter_pdf_and_metadata",
-        return_value=(
-            "pdf_file",
+        "app.main.views.uploads.get_letter_metadata",
+        return_value=LetterMetadata(
             {
                 "message": "content-outside-printable-area",
                 "invalid_pages": invalid_pages,
-            },
+            }
         ),
     )
+    mock_get_page = mocker.patch("app.main.views.uploads.get_letter_pdf_page", return_value="pdf_page")
     template_preview_mock_valid = mocker.patch(
-        "app.template_preview_client.get_png_for_valid_pdf_page",
+        "app.template_preview_client.get_png_for_valid_single_page_pdf",
         return_value=make_response("page.html", 200),
     )
     template_preview_mock_invalid = mocker.patch(
-        "app.template_preview_client.get_png_for_invalid_pdf_page",
+        "app.template_preview_client.get_png_for_invalid_single_page_pdf",
         return_value=make_response("page.html", 200),
     )
 
@@ -708,11 +709,12 @@ def test_uploaded_letter_preview_image_shows_overlay_when_content_outside_printa
         page=page_requested,
     )
 
+    mock_get_page.assert_called_once_with(UUID(SERVICE_ONE_ID), UUID(fake_uuid), page_requested)
     if overlay_expected:
-        template_preview_mock_invalid.assert_called_once_with("pdf_file", page_requested)
+        template_preview_mock_invalid.assert_called_once_with("pdf_page", page_requested)
         assert template_preview_mock_valid.called is False
     else:
-        template_preview_mock_valid.assert_called_once_with("pdf_file", page_requested)
+        template_preview_mock_valid.assert_called_once_with("pdf_page", page_requested)
         assert template_preview_mock_invalid.called is False
 
 
@@ -730,9 +732,10 @@ def test_uploaded_letter_preview_image_does_not_show_overlay_if_no_content_outsi
     fake_uuid,
     mocker,
 ):
-    mocker.patch("app.main.views.uploads.get_letter_pdf_and_metadata", return_value=("pdf_file", metadata))
+    mocker.patch("app.main.views.uploads.get_letter_metadata", return_value=LetterMetadata(metadata))
+    mocker.patch("app.main.views.uploads.get_letter_pdf_page", return_value="pdf_page")
     template_preview_mock = mocker.patch(
-        "app.template_preview_client.get_png_for_valid_pdf_page",
+        "app.template_preview_client.get_png_for_valid_single_page_pdf",
         return_value=make_response("page.html", 200),
     )
 
@@ -743,7 +746,25 @@ def test_uploaded_letter_preview_image_does_not_show_overlay_if_no_content_outsi
         page=1,
     )
 
-    template_preview_mock.assert_called_once_with("pdf_file", 1)
+    template_preview_mock.assert_called_once_with("pdf_page", 1)
+
+
+def test_uploaded_letter_preview_image_404s_for_page_not_in_letter(
+    client_request,
+    fake_uuid,
+    mocker,
+):
+    mocker.patch("app.main.views.uploads.get_letter_metadata", return_value=LetterMetadata({}))
+    mocker.patch("app.main.views.uploads.get_letter_pdf_page", side_effect=IndexError)
+
+    client_request.get(
+        "main.view_letter_upload_as_preview",
+        file_id=fake_uuid,
+        service_id=SERVICE_ONE_ID,
+        page=11,
+        _test_page_title=False,
+        _expected_status=404,
+    )
 
 
 def test_uploaded_letter_preview_image_400s_for_bad_page_type(
@@ -1,4 +1,5 @@
 import pytest
+from freezegun import freeze_time
 
 from app.models.job import Job
 from tests import job_json, user_json
@@ -28,6 +29,35 @@ def test_still_processing(notify_admin, job_status, num_notifications_created, e
     assert job.still_processing == expected_still_processing
 
 
+@pytest.mark.parametrize(
+    "job_status, template_type, statistics, scheduled_for, expected_poll_interval",
+    [
+        ("cancelled", "sms", [], "2024-01-01T13:00:00.000000", "stop"),
+        ("finished", "sms", [{"status": "delivered", "count": 8}, {"status": "failed", "count": 2}], None, "stop"),
+        ("scheduled", "sms", [], "2024-01-01T12:00:30.000000", 30),
+        ("scheduled", "sms", [], "2024-01-02T12:00:00.000000", 60),
+        ("scheduled", "sms", [], "2024-01-01T11:59:59.000000", 2),
+        ("in progress", "sms", [{"status": "sending", "count": 5}], None, None),
+        ("finished", "sms", [{"status": "sending", "count": 10}], None, None),
+        ("finished", "letter", [{"status": "sending", "count": 10}], None, 60),
+    ],
+)
+@freeze_time("2024-01-01 12:00:00")
+def test_poll_interval(job_status, template_type, statistics, scheduled_for, expected_poll_interval):
+    job = Job(
+        {
+            "id": "foo",
+            "job_status": job_status,
+            "template_type": template_type,
+            "notification_count": 10,
+            "statistics": statistics,
+            "scheduled_for": scheduled_for,
+        }
+    )
+
+    assert job.poll_interval == expected_poll_interval
+
+
 @pytest.mark.parametrize(
     "failed, delivered, expected_failure_rate", [(0, 0, 0), (0, 1, 0), (1, 1, 50), (1, 0, 100), (1, 4, 20)]
 )
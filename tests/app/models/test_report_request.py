@@ -1,3 +1,5 @@
+from urllib.parse import parse_qs, urlparse
+
 import boto3
 from moto import mock_aws
 
@@ -16,6 +18,18 @@ def test_report_request_download(notify_admin):
     assert csv_file.read().decode("utf-8") == "csv_content"
 
 
+@mock_aws
+def test_report_request_get_download_url(notify_admin):
+    url = urlparse(ReportRequest.get_download_url("abcd"))
+    query = parse_qs(url.query)
+
+    assert url.netloc == f"{ReportRequest.get_bucket_name()}.s3.amazonaws.com"
+    assert url.path == "/notifications_report/abcd.csv"
+    assert query["response-content-type"] == ["text/csv; charset=utf-8"]
+    assert query["response-content-disposition"] == ["attachment; filename=abcd.csv"]
+    assert query["X-Amz-Expires"] == ["60"]
+
+
 @mock_aws
 def test_exists_in_s3_should_return_true_when_report_exists(notify_admin):
     bucket_name = ReportRequest.get_bucket_name()
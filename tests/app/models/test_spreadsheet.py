@@ -1,5 +1,7 @@
+from io import BytesIO
 from pathlib import Path
 
+import openpyxl
 import pytest
 from notifications_utils.interruptible_io import InterruptibleIOZipFile
 
@@ -52,3 +54,44 @@ def test_openpyxl_zipfile_monkeypatch(mocker):
         assert Spreadsheet.from_file(xl, filename=xl.name).as_csv_data
 
     assert mocker.call(mocker.ANY, "xl/worksheets/sheet1.xml") in open_method_mock.mock_calls
+
+
+def test_xlsx_rows_missing_from_file_and_merged_cells_from_hidden_rows():
+    book = openpyxl.Workbook()
+    sheet = book.active
+    sheet.row_dimensions[1].hidden = True
+    sheet["A1"] = "hidden"
+    sheet["B1"] = "merged from a hidden row"
+    sheet.merge_cells("B1:B6")
+    # rows 2, 3 and 5 have no cells at all, so won't appear in the sheet's xml
+    sheet["A4"] = "name"
+    sheet["A6"] = "Jo"
+    sheet["C6"] = "07700 900123"
+    sheet.column_dimensions["D"].hidden = True
+    sheet["D6"] = "hidden column"
+
+    with BytesIO() as xl:
+        book.save(xl)
+        xl.seek(0)
+        spreadsheet = Spreadsheet.from_file(xl, filename="xl.xlsx")
+
+    assert spreadsheet.as_csv_data == (
+        ",merged from a hidden row,\r\n"
+        ",merged from a hidden row,\r\n"
+        "name,merged from a hidden row,\r\n"
+        ",merged from a hidden row,\r\n"
+        "Jo,merged from a hidden row,07700 900123\r\n"
+    )
+
+
+def test_xlsx_all_rows_hidden_before_row_limit():
+    book = openpyxl.Workbook()
+    for row_index in range(1, 4):
+        book.active.row_dimensions[row_index].hidden = True
+        book.active.cell(row_index, 1, "hidden")
+
+    with BytesIO() as xl:
+        book.save(xl)
+        xl.seek(0)
+        with pytest.raises(Spreadsheet.AllRowsHiddenError):
+            Spreadsheet.from_file(xl, filename="xl.xlsx", row_limit=3)
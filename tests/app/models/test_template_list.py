@@ -1,9 +1,16 @@
 import uuid
 
+import eventlet
 import pytest
 
 from app.models.service import Service
-from app.models.template_list import TemplateList, UserTemplateList
+from app.models.template_list import (
+    TemplateList,
+    UserTemplateFolderView,
+    UserTemplateList,
+    UserTemplateLists,
+    get_user_template_folder_view,
+)
 from app.models.user import User
 
 INV_PARENT_FOLDER_ID = "7e979e79-d970-43a5-ac69-b625a8d147b0"
@@ -104,3 +111,189 @@ def test_template_list_yields_all_folders_without_user(
         "2's Visible grandchild",
         "2's Visible child",
     )
+
+
+def test_template_list_only_shows_folders_containing_templates_of_type(
+    mock_get_template_folders,
+    mocker,
+    service_one,
+):
+    mock_get_template_folders.return_value = [
+        {"name": "Parent", "id": "parent", "parent_id": None},
+        {"name": "Child with SMS", "id": "child-1", "parent_id": "parent"},
+        {"name": "Child with email", "id": "child-2", "parent_id": "parent"},
+        {"name": "Empty", "id": "empty", "parent_id": None},
+    ]
+    mocker.patch(
+        "app.service_api_client.get_service_templates",
+        return_value={
+            "data": [
+                {"id": "1", "name": "SMS", "template_type": "sms", "folder": "child-1"},
+                {"id": "2", "name": "Email", "template_type": "email", "folder": "child-2"},
+            ]
+        },
+    )
+    service = Service(service_one)
+
+    assert [item.name for item in TemplateList(service=service, template_type="sms")] == [
+        "Parent",
+        "Child with SMS",
+        "SMS",
+    ]
+    assert [item.name for item in TemplateList(service=service, template_type="email")] == [
+        "Parent",
+        "Child with email",
+        "Email",
+    ]
+    assert [item.name for item in TemplateList(service=service, template_type="letter")] == []
+
+
+@pytest.mark.parametrize("template_list_class", [TemplateList, UserTemplateList])
+def test_template_list_reads_each_template_a_few_times_for_service_with_10k_templates(
+    template_list_class,
+    mock_get_template_folders,
+    mocker,
+    service_one,
+    active_user_with_permissions,
+):
+    folders = []
+    for index in range(500):
+        folders.append(
+            {
+                "name": f"Folder {index}",
+                "id": f"folder-{index}",
+                # nest each folder under one of the folders before it, giving a tree a few levels deep
+                "parent_id": f"folder-{index // 5}" if index >= 5 else None,
+                "users_with_permission": [active_user_with_permissions["id"]],
+            }
+        )
+    mock_get_template_folders.return_value = folders
+    reads = 0
+
+    class CountingDict(dict):
+        def __getitem__(self, key):
+            nonlocal reads
+            reads += 1
+            return super().__getitem__(key)
+
+        def get(self, key, default=None):
+            nonlocal reads
+            reads += 1
+            return super().get(key, default)
+
+    templates = [
+        CountingDict(
+            id=f"template-{index}",
+            name=f"Template {index}",
+            template_type=("sms", "email", "letter")[index % 3],
+            folder=f"folder-{index % 500}",
+        )
+        for index in range(10_000)
+    ]
+    mocker.patch("app.service_api_client.get_service_templates", return_value={"data": templates})
+    service = Service(service_one)
+    user = User(active_user_with_permissions)
+    kwargs = {"user": user} if template_list_class is UserTemplateList else {}
+
+    items = list(template_list_class(service=service, template_type="sms", **kwargs))
+
+    # Looking up the contents of each folder by scanning every template would read each template
+    # hundreds of times for a service this size, rather than a handful
+    assert reads < 20 * len(templates)
+    assert len([item for item in items if not item.is_folder]) == 3334
+    assert len([item for item in items if item.is_folder]) == 500
+
+
+def test_user_template_lists_fetches_every_services_templates_and_folders_at_the_same_time(
+    mocker,
+    service_one,
+    active_user_with_permissions,
+):
+    in_flight = []
+    most_in_flight = 0
+
+    def slow_api_call(response):
+        def _call(service_id):
+            nonlocal most_in_flight
+            in_flight.append(service_id)
+            most_in_flight = max(most_in_flight, len(in_flight))
+            eventlet.sleep(0.01)
+            in_flight.remove(service_id)
+            return response(service_id)
+
+        return _call
+
+    mock_get_service_templates = mocker.patch(
+        "app.service_api_client.get_service_templates",
+        side_effect=slow_api_call(
+            lambda service_id: {
+                "data": [{"id": str(uuid.uuid4()), "name": "Template", "template_type": "sms", "folder": None}]
+            }
+        ),
+    )
+    mock_get_template_folders = mocker.patch(
+        "app.template_folder_api_client.get_template_folders",
+        side_effect=slow_api_call(lambda service_id: []),
+    )
+    services = [Service(service_one | {"id": str(uuid.uuid4()), "name": f"Service {index:02}"}) for index in range(15)]
+    mocker.patch.object(User, "services", new_callable=mocker.PropertyMock, return_value=services)
+
+    items = list(UserTemplateLists(User(active_user_with_permissions)))
+
+    assert [item.name for item in items] == [
+        name for index in range(15) for name in (f"Service {index:02}", "Template")
+    ]
+    assert mock_get_service_templates.call_count == 15
+    assert mock_get_template_folders.call_count == 15
+    # each service’s templates and folders are fetched at the same time as each other
+    assert most_in_flight == 2 * UserTemplateLists.MAX_CONCURRENT_SERVICES
+
+
+def test_user_template_lists_share_one_folder_view_for_the_rest_of_the_request(
+    notify_admin,
+    mock_get_hierarchy_of_folders,
+    mock_get_service_templates,
+    service_one,
+    active_user_with_permissions,
+    mocker,
+):
+    service = Service(service_one)
+    user = User(active_user_with_permissions)
+    mock_has_permission = mocker.spy(User, "has_template_folder_permission")
+
+    with notify_admin.test_request_context():
+        folder_view = get_user_template_folder_view(service=service, user=user)
+        list(UserTemplateList(service=service, user=user, template_folder_id=VIS_PARENT_FOLDER_ID))
+        list(UserTemplateList(service=service, user=user, template_type="sms"))
+
+        assert UserTemplateList(service=service, user=user).folder_view is folder_view
+        # once for each folder, however many lists there are or however deeply the folders are nested
+        assert mock_has_permission.call_count == len(service.all_template_folders)
+
+    with notify_admin.test_request_context():
+        assert get_user_template_folder_view(service=service, user=user) is not folder_view
+
+
+def test_user_template_folder_view_groups_visible_folders_by_closest_visible_parent(
+    mock_get_hierarchy_of_folders,
+    mock_get_service_templates,
+    service_one,
+    active_user_with_permissions,
+):
+    folder_view = UserTemplateFolderView(service=Service(service_one), user=User(active_user_with_permissions))
+    names_by_id = dict(folder_view.move_to_choices)
+
+    assert {
+        parent_id: sorted(str(names_by_id[folder_id]) for folder_id in folder_ids)
+        for parent_id, folder_ids in folder_view.child_folder_ids_by_parent_id.items()
+    } == {
+        None: [
+            "Parent 2 - visible",
+            "['Parent 1 - invisible', \"1's Visible child\"]",
+            "['Parent 1 - invisible', [\"1's Invisible child\", \"1's Visible grandchild\"]]",
+        ],
+        VIS_PARENT_FOLDER_ID: [
+            "2's Visible child",
+            '["2\'s Invisible child", "2\'s Visible grandchild"]',
+        ],
+    }
@@ -1,4 +1,10 @@
-from app.notify_client import NotifyAdminAPIClient
+from functools import partial
+
+import eventlet
+import pytest
+from flask import request
+
+from app.notify_client import NotifyAdminAPIClient, fan_out, fan_out_lazily
 
 
 class TestBaseClient:
@@ -38,3 +44,104 @@ class TestBaseClient:
         request_kwargs = perform_request_mock.call_args_list[-1][0][2]
         headers = request_kwargs["headers"]
         assert headers["X-Notify-User-Id"] == str(fake_uuid)
+
+    def test_get_many_returns_responses_in_order(self, notify_admin, mocker):
+        api_client = NotifyAdminAPIClient(notify_admin)
+        mock_get = mocker.patch.object(api_client, "get", side_effect=lambda url, params: {"url": url})
+
+        assert api_client.get_many(["/one", ("/two", {"page": 2}), "/three"]) == [
+            {"url": "/one"},
+            {"url": "/two"},
+            {"url": "/three"},
+        ]
+        assert mock_get.call_args_list == [
+            mocker.call("/one", params=None),
+            mocker.call("/two", params={"page": 2}),
+            mocker.call("/three", params=None),
+        ]
+
+    def test_get_many_adds_headers_from_request_context(
+        self, notify_admin, active_user_with_permissions, mock_onwards_request_headers, mocker, fake_uuid
+    ):
+        api_client = NotifyAdminAPIClient(notify_admin)
+        perform_request_mock = mocker.patch.object(api_client, "_perform_request")
+
+        with notify_admin.test_request_context(), notify_admin.test_client() as client:
+            client.login(active_user_with_permissions)
+            notify_admin.preprocess_request()  # Run `before_request`-decorated functions
+            api_client.get_many(["/mocked-request-1", "/mocked-request-2"])
+
+        assert perform_request_mock.call_count == 2
+        for call in perform_request_mock.call_args_list:
+            headers = call[0][2]["headers"]
+            assert headers["X-Notify-User-Id"] == str(fake_uuid)
+            assert headers["some-onwards"] == "request-headers"
+
+
+def test_fan_out_raises_first_exception_after_all_calls_finish(mocker):
+    finished = mocker.Mock()
+
+    def fail(message):
+        raise ValueError(message)
+
+    with pytest.raises(ValueError, match="first"):
+        fan_out(lambda: fail("first"), lambda: fail("second"), finished)
+
+    finished.assert_called_once_with()
+
+
+def test_fan_out_with_single_call_runs_it_directly():
+    assert fan_out(lambda: 1) == [1]
+    assert fan_out() == []
+
+
+def test_fan_out_lazily_yields_results_in_order_as_soon_as_they_are_ready():
+    events = []
+
+    def call(result, delay):
+        def _call():
+            eventlet.sleep(delay)
+            events.append(f"finished {result}")
+            return result
+
+        return _call
+
+    for result in fan_out_lazily(call("first", 0), call("second", 0.1), max_concurrency=2):
+        events.append(f"got {result}")
+
+    assert events == ["finished first", "got first", "finished second", "got second"]
+
+
+def test_fan_out_lazily_limits_concurrency():
+    running = []
+    most_running = 0
+
+    def call(index):
+        nonlocal most_running
+        running.append(index)
+        most_running = max(most_running, len(running))
+        eventlet.sleep(0.01)
+        running.remove(index)
+        return index
+
+    assert list(fan_out_lazily(*(partial(call, index) for index in range(10)), max_concurrency=3)) == list(range(10))
+    assert most_running == 3
+
+
+def test_fan_out_lazily_raises_exception_in_place_of_result():
+    def fail():
+        raise ValueError("failed")
+
+    results = fan_out_lazily(lambda: 1, fail, lambda: 3, max_concurrency=3)
+
+    assert next(results) == 1
+    with pytest.raises(ValueError, match="failed"):
+        next(results)
+
+
+def test_fan_out_lazily_runs_calls_in_copy_of_current_context(notify_admin):
+    with notify_admin.test_request_context("/some-path"):
+        assert list(fan_out_lazily(lambda: request.path, lambda: request.path, max_concurrency=2)) == [
+            "/some-path",
+            "/some-path",
+        ]
@@ -0,0 +1,173 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.config import Config
+from app.extensions import redis_client
+from app.notify_client import cache
+from app.notify_client.letter_rate_api_client import letter_rate_api_client
+from app.notify_client.local_cache import INVALIDATION_CHANNEL, LocalCache, LocallyCachedRedisClient, local_cache
+from app.notify_client.service_api_client import service_api_client
+
+
+def test_local_cache_expires_values(mocker):
+    mock_monotonic = mocker.patch("app.notify_client.local_cache.monotonic", return_value=100)
+    cache = LocalCache()
+
+    cache.set("key", "value", ttl_in_seconds=10, max_items=10)
+    assert cache.get("key") == "value"
+
+    mock_monotonic.return_value = 110
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache()
+
+    cache.set("a", 1, ttl_in_seconds=10, max_items=2)
+    cache.set("b", 2, ttl_in_seconds=10, max_items=2)
+    cache.get("a")
+    cache.set("c", 3, ttl_in_seconds=10, max_items=2)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_local_cache_forgets_by_pattern():
+    cache = LocalCache()
+
+    cache.set("service-1", 1, ttl_in_seconds=10, max_items=10)
+    cache.set("service-1-templates", 2, ttl_in_seconds=10, max_items=10)
+    cache.set("service-2", 3, ttl_in_seconds=10, max_items=10)
+    cache.forget_by_pattern("service-1*")
+
+    assert cache.get("service-1") is None
+    assert cache.get("service-1-templates") is None
+    assert cache.get("service-2") == 3
+
+
+@pytest.fixture
+def locally_cached_redis_client(notify_admin, mocker):
+    mocker.patch.dict(notify_admin.config, {"LOCAL_CACHE_TTLS": {"letter-rates": 60}})
+    mocker.patch("app.notify_client.local_cache.eventlet.spawn")
+    locally_cached_redis_client = LocallyCachedRedisClient(Mock(active=True))
+    locally_cached_redis_client._ensure_listening_for_invalidations()
+    locally_cached_redis_client._subscribed = True
+    return locally_cached_redis_client
+
+
+def test_locally_cached_redis_client_only_goes_to_redis_once_for_matching_keys(locally_cached_redis_client):
+    redis_client = locally_cached_redis_client._redis_client
+    redis_client.get.return_value = b"[]"
+
+    assert locally_cached_redis_client.get("letter-rates", skippable=True) == b"[]"
+    assert locally_cached_redis_client.get("letter-rates", skippable=True) == b"[]"
+
+    redis_client.get.assert_called_once_with("letter-rates", skippable=True)
+
+
+def test_locally_cached_redis_client_ignores_keys_not_matching_patterns(locally_cached_redis_client):
+    redis_client = locally_cached_redis_client._redis_client
+    redis_client.get.return_value = b"{}"
+
+    locally_cached_redis_client.get("service-1234")
+    locally_cached_redis_client.get("service-1234")
+
+    assert redis_client.get.call_count == 2
+    assert len(local_cache) == 0
+
+
+def test_locally_cached_redis_client_broadcasts_deletes(locally_cached_redis_client):
+    redis_client = locally_cached_redis_client._redis_client
+    redis_client.get.return_value = b"[]"
+
+    locally_cached_redis_client.get("letter-rates")
+    locally_cached_redis_client.delete("letter-rates")
+    locally_cached_redis_client.get("letter-rates")
+
+    redis_client.delete.assert_called_once_with("letter-rates")
+    redis_client.redis_store.publish.assert_called_once_with(INVALIDATION_CHANNEL, "letter-rates")
+    assert redis_client.get.call_count == 2
+
+
+def test_locally_cached_redis_client_does_not_keep_anything_until_subscribed(locally_cached_redis_client):
+    redis_client = locally_cached_redis_client._redis_client
+    redis_client.get.return_value = b"[]"
+    locally_cached_redis_client._subscribed = False
+
+    locally_cached_redis_client.get("letter-rates")
+    locally_cached_redis_client.get("letter-rates")
+
+    assert redis_client.get.call_count == 2
+    assert len(local_cache) == 0
+
+
+def test_locally_cached_redis_client_forgets_keys_published_by_other_workers(locally_cached_redis_client):
+    redis_client = locally_cached_redis_client._redis_client
+    locally_cached_redis_client._subscribed = False
+    local_cache.set("letter-rates", b"[]", ttl_in_seconds=60, max_items=10)
+    local_cache.set("sms-rate", b"{}", ttl_in_seconds=60, max_items=10)
+    messages = iter(
+        (
+            {"type": "subscribe", "channel": INVALIDATION_CHANNEL, "data": 1},
+            # nothing published for a while
+            None,
+            {"type": "message", "channel": INVALIDATION_CHANNEL, "data": b"letter-*"},
+        )
+    )
+    subscribed_before_each_message = []
+    keys_remaining_before_each_message = []
+
+    def get_message(timeout):
+        subscribed_before_each_message.append(locally_cached_redis_client._subscribed)
+        keys_remaining_before_each_message.append([key for key in ("letter-rates", "sms-rate") if local_cache.get(key)])
+        try:
+            return next(messages)
+        except StopIteration as e:
+            raise ConnectionError from e
+
+    redis_client.redis_store.pubsub.return_value.get_message.side_effect = get_message
+
+    locally_cached_redis_client._listen_for_invalidations(Mock())
+
+    redis_client.redis_store.pubsub.return_value.subscribe.assert_called_once_with(INVALIDATION_CHANNEL)
+    assert subscribed_before_each_message == [False, True, True, True]
+    assert keys_remaining_before_each_message == [
+        ["letter-rates", "sms-rate"],
+        ["letter-rates", "sms-rate"],
+        ["letter-rates", "sms-rate"],
+        ["sms-rate"],
+    ]
+    # once we stop listening we can’t trust anything we’ve kept
+    assert locally_cached_redis_client._subscribed is False
+    assert len(local_cache) == 0
+
+
+def test_local_cache_ttls_used_in_production_keep_rates_in_memory(notify_admin, mocker):
+    mocker.patch.dict(notify_admin.config, {"LOCAL_CACHE_TTLS": Config.LOCAL_CACHE_TTLS})
+    mocker.patch.object(redis_client, "active", True)
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b'[{"rate": 0.5}]')
+    locally_cached_redis_client = cache.redis_client._redis_client
+    mocker.patch.object(locally_cached_redis_client, "_ensure_listening_for_invalidations")
+    mocker.patch.object(locally_cached_redis_client, "_subscribed", True)
+
+    assert letter_rate_api_client.get_letter_rates() == [{"rate": 0.5}]
+    assert letter_rate_api_client.get_letter_rates() == [{"rate": 0.5}]
+    service_api_client.get_service("1234")
+    service_api_client.get_service("1234")
+
+    assert [call.args[0] for call in mock_redis_get.call_args_list] == ["letter-rates", "service-1234", "service-1234"]
+
+
+def test_locally_cached_redis_client_passes_through_when_disabled(notify_admin):
+    redis_client = Mock(active=True)
+    locally_cached_redis_client = LocallyCachedRedisClient(redis_client)
+
+    locally_cached_redis_client.get("letter-rates")
+    locally_cached_redis_client.get("letter-rates")
+    locally_cached_redis_client.delete("letter-rates")
+
+    assert redis_client.get.call_count == 2
+    assert redis_client.redis_store.publish.called is False
@@ -1,7 +1,11 @@
 from datetime import date
 
+from flask import request
+
 from app.notify_client import NotifyAdminAPIClient
 from app.notify_client.notification_api_client import notification_api_client
+from app.notify_client.service_api_client import service_api_client
+from app.notify_client.user_api_client import user_api_client
 
 
 def test_generate_headers_sets_standard_headers(notify_admin):
@@ -42,3 +46,87 @@ def test_get_notification_status_by_service(notify_admin, mocker):
     mock_get.assert_called_once_with(
         url="service/monthly-data-by-service", params={"start_date": "2019-04-01", "end_date": "2019-04-30"}
     )
+
+
+def test_request_cache_memo_only_reads_each_key_from_redis_once_per_request(notify_admin, mocker, fake_uuid):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b'{"data": {"id": "1234"}}')
+    mock_api_get = mocker.patch.object(service_api_client, "get")
+
+    with notify_admin.test_request_context():
+        assert service_api_client.get_service(fake_uuid) == {"data": {"id": "1234"}}
+        assert service_api_client.get_service(fake_uuid) == {"data": {"id": "1234"}}
+
+        assert request.request_cache_memo.hits == 1
+        assert request.request_cache_memo.misses == 1
+
+    mock_redis_get.assert_called_once_with(f"service-{fake_uuid}", skippable=True)
+    assert mock_api_get.called is False
+
+    with notify_admin.test_request_context():
+        service_api_client.get_service(fake_uuid)
+
+    # a new request starts with nothing remembered
+    assert mock_redis_get.call_count == 2
+
+
+def test_request_cache_memo_forgets_keys_deleted_by_cache_decorator(notify_admin, mocker, fake_uuid):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b'{"data": {"id": "1234"}}')
+    mocker.patch("app.extensions.RedisClient.delete")
+    mocker.patch.object(user_api_client, "post")
+
+    with notify_admin.test_request_context():
+        user_api_client.get_user(fake_uuid)
+        user_api_client.archive_user(fake_uuid)
+        user_api_client.get_user(fake_uuid)
+
+    assert mock_redis_get.call_count == 2
+
+
+def test_request_cache_memo_forgets_everything_after_a_write(notify_admin, mocker, fake_uuid):
+    mocker.patch("app.extensions.RedisClient.get", return_value=b'{"data": {"id": "1234"}}')
+    mocker.patch.object(service_api_client, "_perform_request")
+
+    with notify_admin.test_request_context():
+        service_api_client.get_service(fake_uuid)
+        assert request.request_cache_memo.values
+
+        service_api_client.post("/some-write", data={})
+        assert request.request_cache_memo.values == {}
+
+
+def test_request_cache_memo_remembers_what_cache_decorator_writes(notify_admin, mocker, fake_uuid):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mock_api_get = mocker.patch.object(service_api_client, "get", return_value={"data": {"id": "1234"}})
+
+    with notify_admin.test_request_context():
+        assert service_api_client.get_service(fake_uuid) == {"data": {"id": "1234"}}
+        assert service_api_client.get_service(fake_uuid) == {"data": {"id": "1234"}}
+
+    mock_redis_get.assert_called_once_with(f"service-{fake_uuid}", skippable=True)
+    mock_redis_set.assert_called_once()
+    mock_api_get.assert_called_once()
+
+
+def test_request_cache_memo_used_when_redis_is_disabled(notify_admin, mocker, fake_uuid):
+    # REDIS_ENABLED is False in tests, so the real client reads nothing and writes nothing
+    mock_api_get = mocker.patch.object(service_api_client, "get", return_value={"data": {"id": "1234"}})
+
+    with notify_admin.test_request_context():
+        service_api_client.get_service(fake_uuid)
+        service_api_client.get_service(fake_uuid)
+
+    mock_api_get.assert_called_once()
+
+
+def test_request_cache_memo_not_used_when_disabled(notify_admin, mocker, fake_uuid):
+    mocker.patch.dict(notify_admin.config, {"REQUEST_CACHE_MEMO_ENABLED": False})
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b'{"data": {"id": "1234"}}')
+
+    with notify_admin.test_request_context():
+        service_api_client.get_service(fake_uuid)
+        service_api_client.get_service(fake_uuid)
+
+        assert not hasattr(request, "request_cache_memo")
+
+    assert mock_redis_get.call_count == 2
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import Mock, call
 from uuid import uuid4
 
@@ -267,7 +268,7 @@ def test_get_precompiled_template(mocker):
             [SERVICE_ONE_ID, FAKE_TEMPLATE_ID],
             [
                 call(
-                    f"service-{SERVICE_ONE_ID}-template-{FAKE_TEMPLATE_ID}-versions",
+                    f"service-{SERVICE_ONE_ID}-template-{FAKE_TEMPLATE_ID}-versions-page-1-of-25",
                     skippable=True,
                 )
             ],
@@ -276,27 +277,6 @@ def test_get_precompiled_template(mocker):
             [],
             {"data_from": "cache"},
         ),
-        (
-            "get_service_template_versions",
-            [SERVICE_ONE_ID, FAKE_TEMPLATE_ID],
-            [
-                call(
-                    f"service-{SERVICE_ONE_ID}-template-{FAKE_TEMPLATE_ID}-versions",
-                    skippable=True,
-                ),
-            ],
-            None,
-            [call(f"/service/{SERVICE_ONE_ID}/template/{FAKE_TEMPLATE_ID}/versions")],
-            [
-                call(
-                    f"service-{SERVICE_ONE_ID}-template-{FAKE_TEMPLATE_ID}-versions",
-                    '{"data_from": "api"}',
-                    ex=2_419_200,
-                    skippable=True,
-                ),
-            ],
-            {"data_from": "api"},
-        ),
         (
             "get_returned_letter_summary",
             [SERVICE_ONE_ID],
@@ -371,6 +351,33 @@ def test_returns_value_from_cache(
     assert mock_redis_set.call_args_list == expected_cache_set_calls
 
 
+@pytest.mark.parametrize(
+    "api_response, expected_versions",
+    (
+        # the API only returns the page asked for
+        ({"data": [{"version": 10}], "total": 60}, [10]),
+        # the API doesn’t page the versions, so returns all of them
+        ({"data": [{"version": version} for version in range(60, 0, -1)]}, list(range(10, 0, -1))),
+    ),
+)
+def test_get_service_template_versions_only_caches_one_page(mocker, notify_admin, api_response, expected_versions):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_api_get = mocker.patch("app.notify_client.NotifyAdminAPIClient.get", return_value=api_response)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+    response = service_api_client.get_service_template_versions(SERVICE_ONE_ID, FAKE_TEMPLATE_ID, page=3)
+
+    assert [version["version"] for version in response["data"]] == expected_versions
+    assert response["total"] == 60
+    mock_api_get.assert_called_once_with(
+        f"/service/{SERVICE_ONE_ID}/template/{FAKE_TEMPLATE_ID}/versions",
+        params={"page": 3, "page_size": 25},
+    )
+    ((cache_key, cached_value), _) = mock_redis_set.call_args
+    assert cache_key == f"service-{SERVICE_ONE_ID}-template-{FAKE_TEMPLATE_ID}-versions-page-3-of-25"
+    assert json.loads(cached_value) == response
+
+
 # feeding LocalProxys that need an app context into pytest's parametrization system
 # leads to bad things
 _clients_by_name = {
@@ -0,0 +1,77 @@
+from unittest.mock import Mock
+
+import boto3
+from moto import mock_aws
+
+from app import reset_memos
+from app.notify_client import fan_out
+from app.s3_client import _PerProcess, check_s3_object_exists, get_s3_client, get_s3_object, get_s3_resource
+
+
+def test_s3_client_is_built_once_and_reused(notify_admin, mocker):
+    mock_session = mocker.patch("app.s3_client.Session")
+
+    assert get_s3_client() is get_s3_client()
+    assert get_s3_resource() is get_s3_resource()
+
+    mock_session.assert_called_once_with()
+    mock_session.return_value.client.assert_called_once()
+    mock_session.return_value.resource.assert_called_once()
+
+
+def test_s3_client_is_shared_between_green_threads(notify_admin, mocker):
+    mocker.patch("app.s3_client.Session")
+
+    client, other_client = fan_out(get_s3_client, get_s3_client)
+
+    assert client is other_client
+
+
+def test_s3_client_is_built_again_after_fork(mocker):
+    mock_register_at_fork = mocker.patch("app.s3_client.os.register_at_fork")
+    factory = Mock(side_effect=[object(), object()])
+
+    get_thing = _PerProcess(factory)
+    first_thing = get_thing()
+
+    assert get_thing() is first_thing
+
+    mock_register_at_fork.call_args.kwargs["after_in_child"]()
+
+    assert get_thing() is not first_thing
+    assert factory.call_count == 2
+
+
+def test_s3_client_is_configured_from_app_config(notify_admin, mocker):
+    mock_session = mocker.patch("app.s3_client.Session")
+    mocker.patch.dict(notify_admin.config, {"S3_MAX_POOL_CONNECTIONS": 25})
+
+    get_s3_client()
+
+    config = mock_session.return_value.client.call_args.kwargs["config"]
+    assert config.region_name == "eu-west-1"
+    assert config.max_pool_connections == 25
+    assert config.tcp_keepalive is True
+    assert config.retries == {"max_attempts": 3, "mode": "standard"}
+    assert config.signature_version == "s3v4"
+
+
+def test_reset_memos_forgets_s3_client(notify_admin, mocker):
+    mock_session = mocker.patch("app.s3_client.Session")
+
+    get_s3_client()
+    reset_memos()
+    get_s3_client()
+
+    assert mock_session.return_value.client.call_count == 2
+
+
+@mock_aws
+def test_s3_helpers_use_shared_client(notify_admin):
+    s3 = boto3.client("s3", region_name="eu-west-1")
+    s3.create_bucket(Bucket="bucket", CreateBucketConfiguration={"LocationConstraint": "eu-west-1"})
+    s3.put_object(Bucket="bucket", Key="exists", Body=b"hello")
+
+    assert check_s3_object_exists("bucket", "exists") is True
+    assert check_s3_object_exists("bucket", "does-not-exist") is False
+    assert get_s3_object("bucket", "exists").get()["Body"].read() == b"hello"
@@ -1,6 +1,6 @@
 from unittest.mock import Mock
 
-from app.s3_client.s3_csv_client import set_metadata_on_csv_upload
+from app.s3_client.s3_csv_client import copy_csv_upload, get_csv_metadata, set_metadata_on_csv_upload
 
 
 def test_sets_metadata(client_request, mocker):
@@ -19,3 +19,66 @@ def test_sets_metadata(client_request, mocker):
         MetadataDirective="REPLACE",
         ServerSideEncryption="AES256",
     )
+
+
+def test_gets_metadata_without_downloading_file(client_request, mocker):
+    mock_s3_client = mocker.patch("app.s3_client.s3_csv_client.s3_client")
+    mock_s3_client.head_object.return_value = {"Metadata": {"original_file_name": "example.csv"}}
+
+    assert get_csv_metadata("1234", "5678") == {"original_file_name": "example.csv"}
+
+    mock_s3_client.head_object.assert_called_once_with(
+        Bucket="test-notifications-csv-upload",
+        Key="service-1234-notify/5678.csv",
+    )
+    assert mock_s3_client.get_object.called is False
+
+
+def test_remembers_metadata_for_rest_of_request(notify_admin, mocker):
+    mock_s3_client = mocker.patch("app.s3_client.s3_csv_client.s3_client")
+    mock_s3_client.head_object.return_value = {"Metadata": {"original_file_name": "example.csv"}}
+
+    with notify_admin.test_request_context():
+        get_csv_metadata("1234", "5678")
+        get_csv_metadata("1234", "5678")
+        get_csv_metadata("1234", "5678", bucket="test-contact-list")
+
+    with notify_admin.test_request_context():
+        get_csv_metadata("1234", "5678")
+
+    assert [call.kwargs["Bucket"] for call in mock_s3_client.head_object.call_args_list] == [
+        "test-notifications-csv-upload",
+        "test-contact-list",
+        "test-notifications-csv-upload",
+    ]
+
+
+def test_remembers_metadata_set_during_request(notify_admin, mocker):
+    mocker.patch("app.s3_client.s3_csv_client.get_csv_upload")
+    mock_s3_client = mocker.patch("app.s3_client.s3_csv_client.s3_client")
+
+    with notify_admin.test_request_context():
+        set_metadata_on_csv_upload("1234", "5678", row_count=10)
+        assert get_csv_metadata("1234", "5678") == {"row_count": "10"}
+
+    assert mock_s3_client.head_object.called is False
+
+
+def test_copies_csv_upload_without_downloading_it(notify_admin, mocker):
+    mock_s3_client = mocker.patch("app.s3_client.s3_csv_client.s3_client")
+    mocker.patch("app.s3_client.s3_csv_client.uuid.uuid4", return_value="9012")
+
+    with notify_admin.test_request_context():
+        assert copy_csv_upload("1234", "5678", from_bucket="test-contact-list", row_count=10) == "9012"
+        assert get_csv_metadata("1234", "9012") == {"row_count": "10"}
+
+    mock_s3_client.copy_object.assert_called_once_with(
+        Bucket="test-notifications-csv-upload",
+        Key="service-1234-notify/9012.csv",
+        CopySource="test-contact-list/service-1234-notify/5678.csv",
+        ServerSideEncryption="AES256",
+        Metadata={"row_count": "10"},
+        MetadataDirective="REPLACE",
+    )
+    assert mock_s3_client.get_object.called is False
+    assert mock_s3_client.head_object.called is False
@@ -1,17 +1,23 @@
+import itertools
 import urllib
 import uuid
+from io import BytesIO
 
 import boto3
 import botocore
 import pytest
 from flask import current_app
 from moto import mock_aws
+from pypdf import PdfReader, PdfWriter
 
+from app.extensions import redis_client
 from app.s3_client.s3_letter_upload_client import (
     LetterMetadata,
     LetterNotFoundError,
     backup_original_letter_to_s3,
     get_letter_metadata,
+    get_letter_pdf_and_metadata,
+    get_letter_pdf_page,
     upload_letter_to_s3,
 )
 
@@ -116,4 +122,134 @@ def test_get_letter_s3_object_raises_custom_error(will_raise_custom_error, expec
         s3.create_bucket(Bucket=bucket_name, CreateBucketConfiguration={"LocationConstraint": "eu-west-1"})
 
     with pytest.raises(expected_exception):
+        get_letter_pdf_and_metadata("service", "file")
+
+
+@mock_aws
+def test_get_letter_metadata_only_fetches_metadata(notify_admin, mocker):
+    bucket_name = current_app.config["S3_BUCKET_TRANSIENT_UPLOADED_LETTERS"]
+    s3 = boto3.client("s3", region_name="eu-west-1")
+    s3.create_bucket(Bucket=bucket_name, CreateBucketConfiguration={"LocationConstraint": "eu-west-1"})
+    s3.put_object(Bucket=bucket_name, Key="service-1234/5678.pdf", Body=b"pdf", Metadata={"filename": "%C2%A3hello"})
+    mock_get_object = mocker.patch("app.s3_client.s3_letter_upload_client.get_letter_s3_object")
+
+    assert get_letter_metadata("1234", "5678").get("filename") == "£hello"
+    assert mock_get_object.called is False
+
+
+@mock_aws
+def test_get_letter_metadata_raises_custom_error_if_letter_not_found(notify_admin):
+    bucket_name = current_app.config["S3_BUCKET_TRANSIENT_UPLOADED_LETTERS"]
+    s3 = boto3.client("s3", region_name="eu-west-1")
+    s3.create_bucket(Bucket=bucket_name, CreateBucketConfiguration={"LocationConstraint": "eu-west-1"})
+
+    with pytest.raises(LetterNotFoundError):
         get_letter_metadata("service", "file")
+
+
+def _make_pdf(number_of_pages):
+    writer = PdfWriter()
+    for _ in range(number_of_pages):
+        writer.add_blank_page(width=595, height=842)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_get_letter_pdf_page_splits_letter_into_pages_once(notify_admin, mocker):
+    mock_get_pdf = mocker.patch(
+        "app.s3_client.s3_letter_upload_client.get_letter_pdf_and_metadata",
+        return_value=(_make_pdf(3), LetterMetadata({})),
+    )
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+    pdf_page = get_letter_pdf_page("1234", "5678", 2)
+
+    assert len(PdfReader(BytesIO(pdf_page)).pages) == 1
+    mock_get_pdf.assert_called_once_with("1234", "5678")
+    assert [call.args[0] for call in mock_redis_set.call_args_list] == [
+        "letter-upload-1234-5678-page-1",
+        "letter-upload-1234-5678-page-2",
+        "letter-upload-1234-5678-page-3",
+    ]
+    assert mock_redis_set.call_args_list[1].args[1] == pdf_page
+    assert all(call.kwargs == {"ex": 600} for call in mock_redis_set.call_args_list)
+
+
+def test_get_letter_pdf_page_uses_cached_page(notify_admin, mocker):
+    mock_get_pdf = mocker.patch("app.s3_client.s3_letter_upload_client.get_letter_pdf_and_metadata")
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=b"cached page")
+
+    assert get_letter_pdf_page("1234", "5678", 2) == b"cached page"
+    mock_redis_get.assert_called_once_with("letter-upload-1234-5678-page-2")
+    assert mock_get_pdf.called is False
+
+
+def test_get_letter_pdf_page_takes_lock_while_splitting_letter(notify_admin, mocker):
+    mocker.patch.object(redis_client, "active", True)
+    mocker.patch(
+        "app.s3_client.s3_letter_upload_client.get_letter_pdf_and_metadata",
+        return_value=(_make_pdf(3), LetterMetadata({})),
+    )
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.extensions.RedisClient.set")
+    mock_acquire_lock = mocker.patch(
+        "app.s3_client.s3_letter_upload_client.acquire_lock",
+        return_value="our-token",
+    )
+    mock_release_lock = mocker.patch("app.s3_client.s3_letter_upload_client.release_lock")
+
+    get_letter_pdf_page("1234", "5678", 2)
+
+    mock_acquire_lock.assert_called_once_with("letter-upload-1234-5678-pages-lock", ttl_in_seconds=5)
+    mock_release_lock.assert_called_once_with("letter-upload-1234-5678-pages-lock", "our-token")
+
+
+@pytest.mark.parametrize(
+    "cached_pages, expected_page, expect_split",
+    (
+        # whoever has the lock finishes splitting the letter while we wait
+        ([None, None, b"page from other request"], b"page from other request", False),
+        # they take too long, so we do it ourselves
+        ([None] * 20, None, True),
+    ),
+)
+def test_get_letter_pdf_page_waits_for_other_request_splitting_letter(
+    notify_admin,
+    mocker,
+    cached_pages,
+    expected_page,
+    expect_split,
+):
+    mocker.patch.object(redis_client, "active", True)
+    mock_get_pdf = mocker.patch(
+        "app.s3_client.s3_letter_upload_client.get_letter_pdf_and_metadata",
+        return_value=(_make_pdf(3), LetterMetadata({})),
+    )
+    mocker.patch("app.extensions.RedisClient.get", side_effect=cached_pages)
+    mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.s3_client.s3_letter_upload_client.acquire_lock", return_value=None)
+    mock_release_lock = mocker.patch("app.s3_client.s3_letter_upload_client.release_lock")
+    mocker.patch("app.s3_client.s3_letter_upload_client.sleep")
+    mocker.patch("app.s3_client.s3_letter_upload_client.monotonic", side_effect=itertools.count())
+
+    pdf_page = get_letter_pdf_page("1234", "5678", 2)
+
+    if expected_page:
+        assert pdf_page == expected_page
+    assert mock_get_pdf.called is expect_split
+    assert mock_release_lock.called is False
+
+
+@pytest.mark.parametrize("page", (0, 4))
+def test_get_letter_pdf_page_raises_if_letter_does_not_have_page(notify_admin, mocker, page):
+    mocker.patch(
+        "app.s3_client.s3_letter_upload_client.get_letter_pdf_and_metadata",
+        return_value=(_make_pdf(3), LetterMetadata({})),
+    )
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.extensions.RedisClient.set")
+
+    with pytest.raises(IndexError):
+        get_letter_pdf_page("1234", "5678", page)
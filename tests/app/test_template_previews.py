@@ -3,13 +3,20 @@ from datetime import UTC, datetime
 from unittest.mock import Mock
 
 import pytest
+from flask import current_app
 from notifications_utils.insensitive_dict import InsensitiveDict
 from notifications_utils.testing.comparisons import AnySupersetOf
 from werkzeug.exceptions import BadRequest, NotFound
 
 from app import load_service_before_request, template_preview_client
+from app.extensions import redis_client
 from app.models.branding import LetterBranding
 from app.models.service import Service
+from app.template_previews import (
+    LETTER_PREVIEW_CACHE_INDEX_KEY,
+    LETTER_PREVIEW_CACHE_SIZES_KEY,
+    LETTER_PREVIEW_CACHE_TOTAL_SIZE_KEY,
+)
 from tests.conftest import create_notification
 
 
@@ -132,6 +139,211 @@ def test_get_preview_for_templated_letter_allows_service_branding_to_be_overridd
     )
 
 
+@pytest.mark.parametrize(
+    "cache_control, expected_ttl",
+    (
+        (None, 86_400),
+        ("public, max-age=600", 600),
+        ("public, max-age=999999", 86_400),
+        ("no-store", None),
+        ("no-cache", None),
+    ),
+)
+def test_get_preview_for_templated_letter_caches_png_pages(
+    client_request,
+    mock_get_service_letter_template,
+    requests_mock,
+    mocker,
+    cache_control,
+    expected_ttl,
+):
+    redis = {}
+    mock_redis_set = mocker.patch(
+        "app.extensions.RedisClient.set",
+        side_effect=lambda key, value, ex: redis.update({key: value}),
+    )
+    mocker.patch("app.extensions.RedisClient.get", side_effect=redis.get)
+    requests_mock.post(
+        "http://localhost:9999/preview.png?page=2",
+        content=b"a",
+        status_code=200,
+        headers={"content-type": "image/png"} | ({"cache-control": cache_control} if cache_control else {}),
+    )
+    service = Mock(spec=Service, letter_branding=LetterBranding({"filename": "hm-government"}))
+    template = mock_get_service_letter_template("123", "456")["data"]
+
+    responses = [
+        template_preview_client.get_preview_for_templated_letter(
+            db_template=template, filetype="png", page=2, service=service
+        )
+        for _ in range(2)
+    ]
+
+    assert responses[0] == responses[1]
+    assert responses[0][:2] == (b"a", 200)
+
+    if expected_ttl:
+        assert len(requests_mock.request_history) == 1
+        assert mock_redis_set.call_args[1]["ex"] == expected_ttl
+    else:
+        assert len(requests_mock.request_history) == 2
+        assert mock_redis_set.called is False
+
+
+def test_get_preview_for_templated_letter_cache_depends_on_values_and_page(
+    client_request,
+    mock_get_service_letter_template,
+    requests_mock,
+    mocker,
+):
+    redis = {}
+    mocker.patch("app.extensions.RedisClient.set", side_effect=lambda key, value, ex: redis.update({key: value}))
+    mocker.patch("app.extensions.RedisClient.get", side_effect=redis.get)
+    requests_mock.post("http://localhost:9999/preview.png?page=1", content=b"a", status_code=200)
+    requests_mock.post("http://localhost:9999/preview.png?page=2", content=b"b", status_code=200)
+    service = Mock(spec=Service, letter_branding=LetterBranding({"filename": "hm-government"}))
+    template = mock_get_service_letter_template("123", "456")["data"]
+
+    for values, page in (({"name": "Jo"}, 1), ({"name": "Sam"}, 1), ({"name": "Jo"}, 2), ({"name": "Jo"}, 1)):
+        template_preview_client.get_preview_for_templated_letter(
+            db_template=template, filetype="png", page=page, values=values, service=service
+        )
+
+    assert len(requests_mock.request_history) == 3
+    assert len(redis) == 3
+
+
+@pytest.mark.parametrize(
+    "values, cache_control, expected_ttl",
+    (
+        (None, None, 86_400),
+        ({"name": None}, None, 86_400),
+        ({"name": "Jo"}, None, 3_600),
+        ({"name": "Jo"}, "public, max-age=600", 600),
+    ),
+)
+def test_get_preview_for_templated_letter_keeps_personalised_pages_for_less_time(
+    client_request,
+    mock_get_service_letter_template,
+    requests_mock,
+    mocker,
+    values,
+    cache_control,
+    expected_ttl,
+):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    requests_mock.post(
+        "http://localhost:9999/preview.png?page=1",
+        content=b"a",
+        status_code=200,
+        headers={"cache-control": cache_control} if cache_control else {},
+    )
+    service = Mock(spec=Service, letter_branding=LetterBranding({"filename": "hm-government"}))
+
+    template_preview_client.get_preview_for_templated_letter(
+        db_template=mock_get_service_letter_template("123", "456")["data"],
+        filetype="png",
+        page=1,
+        values=values,
+        service=service,
+    )
+
+    assert mock_redis_set.call_args[1]["ex"] == expected_ttl
+
+
+@pytest.mark.parametrize(
+    "values, expected_expiry",
+    (
+        (None, 100_000 + 86_400),
+        ({"name": "Jo"}, 100_000 + 3_600),
+    ),
+)
+def test_get_preview_for_templated_letter_limits_total_size_of_cached_pages(
+    client_request,
+    mock_get_service_letter_template,
+    requests_mock,
+    mocker,
+    values,
+    expected_expiry,
+):
+    mocker.patch.dict(current_app.config, {"LETTER_PREVIEW_CACHE_MAX_TOTAL_BYTES": 1_000})
+    mocker.patch.object(redis_client, "active", True)
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch("app.template_previews.time", return_value=100_000)
+    mock_redis_store = mocker.patch.object(redis_client, "redis_store")
+    requests_mock.post("http://localhost:9999/preview.png?page=1", content=b"a", status_code=200)
+    service = Mock(spec=Service, letter_branding=LetterBranding({"filename": "hm-government"}))
+
+    template_preview_client.get_preview_for_templated_letter(
+        db_template=mock_get_service_letter_template("123", "456")["data"],
+        filetype="png",
+        page=1,
+        values=values,
+        service=service,
+    )
+
+    ((cache_key, cached_preview), _) = mock_redis_set.call_args
+    (script, *args) = mock_redis_store.eval.call_args[0]
+    assert "zadd" in script
+    assert args == [
+        3,
+        LETTER_PREVIEW_CACHE_INDEX_KEY,
+        LETTER_PREVIEW_CACHE_SIZES_KEY,
+        LETTER_PREVIEW_CACHE_TOTAL_SIZE_KEY,
+        cache_key,
+        len(cached_preview),
+        expected_expiry,
+        100_000,
+        1_000,
+    ]
+
+
+def test_get_preview_for_templated_letter_still_returns_page_if_size_limit_cant_be_checked(
+    client_request,
+    mock_get_service_letter_template,
+    requests_mock,
+    mocker,
+):
+    mocker.patch.object(redis_client, "active", True)
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mocker.patch("app.extensions.RedisClient.set")
+    mocker.patch.object(redis_client, "redis_store").eval.side_effect = ConnectionError
+    requests_mock.post("http://localhost:9999/preview.png?page=1", content=b"a", status_code=200)
+    service = Mock(spec=Service, letter_branding=LetterBranding({"filename": "hm-government"}))
+
+    content, status_code, _ = template_preview_client.get_preview_for_templated_letter(
+        db_template=mock_get_service_letter_template("123", "456")["data"],
+        filetype="png",
+        page=1,
+        service=service,
+    )
+
+    assert (content, status_code) == (b"a", 200)
+
+
+def test_get_preview_for_templated_letter_does_not_cache_pdfs(
+    client_request,
+    mock_get_service_letter_template,
+    requests_mock,
+    mocker,
+):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    requests_mock.post("http://localhost:9999/preview.pdf", content=b"a", status_code=200)
+    service = Mock(spec=Service, letter_branding=LetterBranding({"filename": "hm-government"}))
+
+    template_preview_client.get_preview_for_templated_letter(
+        db_template=mock_get_service_letter_template("123", "456")["data"],
+        filetype="pdf",
+        service=service,
+    )
+
+    assert mock_redis_get.called is False
+    assert mock_redis_set.called is False
+
+
 def test_get_preview_for_templated_letter_from_notification_has_correct_args(
     client_request,
     mock_onwards_request_headers,
@@ -1,6 +1,9 @@
+from unittest.mock import Mock
+
 import pytest
+from freezegun import freeze_time
 
-from app.utils import merge_jsonlike
+from app.utils import make_json_updates_response, merge_jsonlike
 
 
 @pytest.mark.parametrize(
@@ -39,3 +42,96 @@ from app.utils import merge_jsonlike
 def test_merge_jsonlike_merges_jsonlike_objects_correctly(source_object, destination_object, expected_result):
     merge_jsonlike(source_object, destination_object)
     assert source_object == expected_result
+
+
+@pytest.fixture
+def json_updates_user(mocker, fake_uuid):
+    return mocker.patch("app.utils.current_user", Mock(id=fake_uuid))
+
+
+def _get_json_updates_response(notify_admin, data, if_none_match=None, method="GET", poll_interval=None):
+    render_partials = Mock(return_value={"partial": "<p>rendered</p>"})
+    with notify_admin.test_request_context(
+        "/services/1234/jobs/5678.json",
+        method=method,
+        headers={"If-None-Match": if_none_match} if if_none_match else {},
+    ):
+        return make_json_updates_response(render_partials, data, poll_interval=poll_interval), render_partials
+
+
+@freeze_time("2024-01-01 12:00:01")
+def test_make_json_updates_response_renders_partials_with_etag(notify_admin, json_updates_user):
+    response, render_partials = _get_json_updates_response(notify_admin, {"status": "sending"})
+
+    assert response.status_code == 200
+    assert response.json == {"partial": "<p>rendered</p>"}
+    assert response.get_etag()[0]
+    render_partials.assert_called_once_with()
+
+
+@freeze_time("2024-01-01 12:00:01")
+def test_make_json_updates_response_skips_rendering_if_data_unchanged(notify_admin, json_updates_user):
+    first_response, _ = _get_json_updates_response(notify_admin, {"status": "sending"})
+
+    with freeze_time("2024-01-01 12:00:59"):
+        response, render_partials = _get_json_updates_response(
+            notify_admin, {"status": "sending"}, if_none_match=first_response.headers["ETag"]
+        )
+
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers["ETag"] == first_response.headers["ETag"]
+    assert render_partials.called is False
+
+
+@pytest.mark.parametrize(
+    "data, frozen_time, method",
+    (
+        ({"status": "delivered"}, "2024-01-01 12:00:01", "GET"),
+        ({"status": "sending"}, "2024-01-01 12:01:00", "GET"),
+        ({"status": "sending"}, "2024-01-01 12:00:01", "POST"),
+    ),
+)
+def test_make_json_updates_response_renders_if_data_or_time_changed_or_not_a_get(
+    notify_admin,
+    json_updates_user,
+    data,
+    frozen_time,
+    method,
+):
+    with freeze_time("2024-01-01 12:00:01"):
+        first_response, _ = _get_json_updates_response(notify_admin, {"status": "sending"})
+
+    with freeze_time(frozen_time):
+        response, render_partials = _get_json_updates_response(
+            notify_admin, data, if_none_match=first_response.headers["ETag"], method=method
+        )
+
+    assert response.status_code == 200
+    render_partials.assert_called_once_with()
+
+
+@pytest.mark.parametrize(
+    "poll_interval, expected_header",
+    (
+        (None, None),
+        (30, "30"),
+        ("stop", "stop"),
+    ),
+)
+def test_make_json_updates_response_suggests_when_to_poll_next(
+    notify_admin,
+    json_updates_user,
+    poll_interval,
+    expected_header,
+):
+    first_response, _ = _get_json_updates_response(notify_admin, {"status": "sending"}, poll_interval=poll_interval)
+    not_modified_response, _ = _get_json_updates_response(
+        notify_admin,
+        {"status": "sending"},
+        if_none_match=first_response.headers["ETag"],
+        poll_interval=poll_interval,
+    )
+
+    assert first_response.headers.get("X-Poll-Interval") == expected_header
+    assert not_modified_response.headers.get("X-Poll-Interval") == expected_header
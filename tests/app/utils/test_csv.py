@@ -5,8 +5,16 @@ from unittest.mock import Mock
 
 import pytest
 from notifications_python_client.errors import HTTPError
-
-from app.utils.csv import generate_notifications_csv, get_errors_for_csv
+from notifications_utils.recipients import RecipientCSV
+
+from app.utils.csv import (
+    OriginalUploadRows,
+    RowErrorSummary,
+    generate_notifications_csv,
+    get_errors_for_csv,
+    stream_csv,
+)
+from app.utils.templates import get_sample_template
 from tests import sample_uuid
 from tests.conftest import fake_uuid
 
@@ -286,16 +294,135 @@ def test_generate_notifications_csv_when_rows_number_divisible_by_page_size(
     assert mock_get_notifications.mock_calls[2][2]["page"] == 3
 
 
-MockRecipients = namedtuple(
-    "RecipientCSV",
+def test_original_upload_rows_reads_rows_in_any_order():
+    original_upload = OriginalUploadRows(
+        RecipientCSV(
+            """
+                phone_number, name
+                07700900000, Alice
+                07700900001, Bob
+                07700900002, Charlie
+            """,
+            template=get_sample_template("sms"),
+        )
+    )
+
+    assert original_upload.column_headers == ["phone_number", "name"]
+    assert original_upload[1] == ["07700900001", "Bob"]
+    assert original_upload[0] == ["07700900000", "Alice"]
+    assert original_upload[2] == ["07700900002", "Charlie"]
+
+    with pytest.raises(IndexError):
+        original_upload[3]
+
+
+def test_original_upload_rows_reads_repeated_and_descending_rows(mocker):
+    mocker.patch.object(OriginalUploadRows, "MAX_ROWS_KEPT", 2)
+    recipient_csv = RecipientCSV(
+        "phone_number\n" + "\n".join(f"0770090000{i}" for i in range(6)),
+        template=get_sample_template("sms"),
+    )
+    mock_get_rows = mocker.spy(recipient_csv, "get_rows")
+    original_upload = OriginalUploadRows(recipient_csv)
+
+    assert [original_upload[index][0] for index in (5, 5, 4, 3, 3, 2, 1, 0, 0)] == [
+        "07700900005",
+        "07700900005",
+        "07700900004",
+        "07700900003",
+        "07700900003",
+        "07700900002",
+        "07700900001",
+        "07700900000",
+        "07700900000",
+    ]
+    # the file is read again from the start each time we go back past the rows we’ve kept
+    assert mock_get_rows.call_count == 3
+    assert len(original_upload._kept) == 2
+
+
+def test_generate_notifications_csv_yields_one_chunk_per_page(
+    notify_admin,
+    mocker,
+):
+    service_id = "1234"
+    mocker.patch(
+        "app.models.notification.NotificationsForCSV._get_items",
+        side_effect=[
+            _get_notifications_csv(rows=3, job_id=None, row_number="")(service_id),
+            _get_notifications_csv(rows=2, job_id=None, row_number="")(service_id),
+        ],
+    )
+
+    chunks = list(generate_notifications_csv(service_id=service_id, page_size=3))
+
+    # the header comes with the first page, so the response doesn’t start until we have some notifications
+    assert chunks[0].startswith("Recipient,Reference,")
+    assert [chunk.count("\r\n") for chunk in chunks] == [3, 2]
+
+
+def test_generate_notifications_csv_yields_header_if_there_are_no_notifications(notify_admin, mocker):
+    mocker.patch(
+        "app.models.notification.NotificationsForCSV._get_items",
+        side_effect=HTTPError(response=Mock(status_code=404)),
+    )
+
+    assert list(generate_notifications_csv(service_id="1234", page_size=3)) == [
+        "Recipient,Reference,Template,Type,Sent by,Sent by email,Job,Status,Time,API key name\n"
+    ]
+
+
+def test_generate_notifications_csv_raises_errors_getting_first_page_with_first_chunk(notify_admin, mocker):
+    mocker.patch(
+        "app.models.notification.NotificationsForCSV._get_items",
+        side_effect=HTTPError(response=Mock(status_code=500)),
+    )
+
+    with notify_admin.test_request_context(), pytest.raises(HTTPError):
+        stream_csv(generate_notifications_csv(service_id="1234", page_size=3))
+
+
+MockRow = namedtuple(
+    "Row",
     [
-        "rows_with_bad_recipients",
-        "rows_with_missing_data",
-        "rows_with_message_too_long",
-        "rows_with_empty_message",
-        "rows_with_bad_qr_codes",
+        "has_error",
+        "has_bad_recipient",
+        "has_missing_data",
+        "message_too_long",
+        "message_empty",
+        "qr_code_too_long",
     ],
 )
+MockRecipients = namedtuple("RecipientCSV", ["rows"])
+
+
+def _mock_recipients(
+    rows_with_bad_recipients,
+    rows_with_missing_data,
+    rows_with_message_too_long,
+    rows_with_empty_message,
+    rows_with_bad_qr_codes,
+):
+    rows_with_errors = (
+        set(rows_with_bad_recipients)
+        | set(rows_with_missing_data)
+        | set(rows_with_message_too_long)
+        | set(rows_with_empty_message)
+        | set(rows_with_bad_qr_codes)
+    )
+    return MockRecipients(
+        [
+            MockRow(
+                has_error=index in rows_with_errors,
+                has_bad_recipient=index in rows_with_bad_recipients,
+                has_missing_data=index in rows_with_missing_data,
+                message_too_long=index in rows_with_message_too_long,
+                message_empty=index in rows_with_empty_message,
+                qr_code_too_long=index in rows_with_bad_qr_codes,
+            )
+            for index in range(20)
+        ]
+    )
 
 
 @pytest.mark.parametrize(
@@ -330,7 +457,7 @@ def test_get_errors_for_csv(
 ):
     assert (
         get_errors_for_csv(
-            MockRecipients(
+            _mock_recipients(
                 rows_with_bad_recipients,
                 rows_with_missing_data,
                 rows_with_message_too_long,
@@ -341,3 +468,55 @@ def test_get_errors_for_csv(
         )
         == expected_errors
     )
+
+
+def test_row_error_summary_counts_each_kind_of_error():
+    rows = [
+        Mock(has_error=True, has_bad_recipient=True, has_missing_data=False),
+        Mock(has_error=True, has_bad_recipient=False, has_missing_data=True),
+        Mock(has_error=False, has_bad_recipient=False, has_missing_data=False),
+    ]
+    recipients = Mock(rows=rows)
+    for row in rows:
+        row.message_too_long = row.message_empty = row.qr_code_too_long = False
+
+    summary = RowErrorSummary(recipients)
+
+    assert summary.rows_with_errors == 2
+    assert summary.rows_with_bad_recipients == 1
+    assert summary.rows_with_missing_data == 1
+    assert summary.rows_with_message_too_long == 0
+    assert get_errors_for_csv(recipients, "sms", summary) == [
+        "fix 1 phone number",
+        "enter missing data in 1 row",
+    ]
+
+
+def test_stream_csv_sends_first_chunk_then_joins_small_chunks(notify_admin, mocker):
+    mock_logger = mocker.patch.object(notify_admin.logger, "info")
+    generated = []
+
+    def chunks():
+        for chunk in ("header\n", "a" * 3, "b" * 3, "c" * 3, "d"):
+            generated.append(chunk)
+            yield chunk
+
+    with notify_admin.test_request_context():
+        streamed = stream_csv(chunks(), min_chunk_size=5)
+
+        # only the first chunk is generated before the response starts
+        assert generated == ["header\n"]
+
+        assert list(streamed) == ["header\n", "aaabbb", "cccd"]
+
+    assert mock_logger.call_args[1]["extra"]["csv_length"] == 17
+    assert "time_to_first_byte" in mock_logger.call_args[1]["extra"]
+
+
+def test_stream_csv_raises_errors_getting_first_chunk(notify_admin):
+    def chunks():
+        raise HTTPError(response=Mock(status_code=404))
+        yield
+
+    with notify_admin.test_request_context(), pytest.raises(HTTPError):
+        stream_csv(chunks())
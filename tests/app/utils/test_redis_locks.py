@@ -0,0 +1,44 @@
+from app.extensions import redis_client
+from app.utils.redis_locks import _RELEASE_LOCK_SCRIPT, NO_LOCK, acquire_lock, release_lock
+
+
+def test_acquire_lock_returns_token_if_lock_taken(notify_admin, mocker):
+    mock_redis_store = mocker.patch.object(redis_client, "redis_store")
+    mock_redis_store.set.return_value = True
+
+    token = acquire_lock("some-lock", ttl_in_seconds=5)
+
+    assert token
+    mock_redis_store.set.assert_called_once_with("some-lock", token, nx=True, ex=5)
+    assert acquire_lock("some-lock", ttl_in_seconds=5) != token
+
+
+def test_acquire_lock_returns_none_if_someone_else_has_it(notify_admin, mocker):
+    mocker.patch.object(redis_client, "redis_store").set.return_value = None
+
+    assert acquire_lock("some-lock", ttl_in_seconds=5) is None
+
+
+def test_acquire_lock_returns_no_lock_if_redis_is_unavailable(notify_admin, mocker):
+    mocker.patch.object(redis_client, "redis_store").set.side_effect = ConnectionError
+    mock_logger = mocker.patch.object(notify_admin.logger, "warning")
+
+    assert acquire_lock("some-lock", ttl_in_seconds=5) == NO_LOCK
+    mock_logger.assert_called_once()
+
+
+def test_release_lock_only_deletes_lock_if_still_ours(notify_admin, mocker):
+    mock_redis_store = mocker.patch.object(redis_client, "redis_store")
+
+    release_lock("some-lock", "our-token")
+
+    mock_redis_store.eval.assert_called_once_with(_RELEASE_LOCK_SCRIPT, 1, "some-lock", "our-token")
+    assert mock_redis_store.delete.called is False
+
+
+def test_release_lock_does_nothing_if_redis_was_unavailable_when_taking_it(notify_admin, mocker):
+    mock_redis_store = mocker.patch.object(redis_client, "redis_store")
+
+    release_lock("some-lock", NO_LOCK)
+
+    assert mock_redis_store.eval.called is False
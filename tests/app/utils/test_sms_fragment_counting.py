@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pytest
+from notifications_utils.template import SMSMessageTemplate
+
+from app.utils.sms_fragment_counting import get_sms_fragment_counting_rules
+from tests import NotifyBeautifulSoup
+from tests.conftest import SERVICE_ONE_ID, normalize_spaces
+
+# The browser counts fragments using the same examples (see tests/javascripts/sms-fragment-count.test.mjs), so if
+# anything here changes, the javascript needs to count the same way
+SMS_FRAGMENT_COUNTS = json.loads((Path(__file__).parents[2] / "sms-fragment-counts.json").read_text())
+
+
+def test_rules_for_counting_in_the_browser_match_the_examples():
+    assert get_sms_fragment_counting_rules() == SMS_FRAGMENT_COUNTS["rules"]
+
+
+@pytest.mark.parametrize("case", SMS_FRAGMENT_COUNTS["cases"])
+def test_sms_message_template_agrees_with_examples(case):
+    template = SMSMessageTemplate(
+        {"content": case["content"] * case["repeat"], "template_type": "sms"},
+        prefix=SMS_FRAGMENT_COUNTS["service_name"],
+        show_prefix=case["prefix_sms"],
+    )
+
+    assert template.fragment_count == case["fragment_count"]
+    assert template.is_message_too_long() == case["error"]
+
+
+@pytest.mark.parametrize("case", SMS_FRAGMENT_COUNTS["cases"])
+def test_content_count_json_endpoint_agrees_with_examples(client_request, service_one, case):
+    service_one["name"] = SMS_FRAGMENT_COUNTS["service_name"]
+    service_one["prefix_sms"] = case["prefix_sms"]
+
+    response = client_request.post_response(
+        "main.count_content_length",
+        service_id=SERVICE_ONE_ID,
+        template_type="sms",
+        _data={"template_content": case["content"] * case["repeat"]},
+        _expected_status=200,
+    )
+
+    snippet = NotifyBeautifulSoup(json.loads(response.get_data(as_text=True))["html"], "html.parser").select_one("span")
+
+    assert normalize_spaces(snippet.text) == case["message"]
+    assert snippet.has_attr("class") == case["error"]
+
+
+@pytest.mark.parametrize("prefix_sms, expected_prefix", ((True, "service one"), (False, None)))
+def test_edit_sms_template_page_has_rules_for_counting_in_the_browser(
+    client_request,
+    mock_get_service_template,
+    service_one,
+    fake_uuid,
+    prefix_sms,
+    expected_prefix,
+):
+    service_one["prefix_sms"] = prefix_sms
+
+    page = client_request.get("main.edit_service_template", service_id=SERVICE_ONE_ID, template_id=fake_uuid)
+    update_status = page.select_one("[data-notify-module=update-status]")
+
+    assert json.loads(update_status["data-sms-fragment-counting-rules"]) == get_sms_fragment_counting_rules()
+    assert update_status.get("data-sms-prefix") == expected_prefix
@@ -0,0 +1,117 @@
+import json
+import pickle
+from io import BytesIO
+from zipfile import BadZipFile
+
+import openpyxl
+import pytest
+
+from app.models.spreadsheet import Spreadsheet
+from app.utils.spreadsheet_conversion import (
+    _DATA,
+    _END,
+    _ERROR,
+    _REQUEST,
+    SpreadsheetConversionPool,
+    _read_frame,
+    _write_frame,
+    serve,
+)
+
+
+def _make_pool(**kwargs):
+    pool = SpreadsheetConversionPool()
+    pool.processes = 1
+    pool.max_queued = 1
+    pool.timeout = 10
+    pool.inline_below_bytes = 0
+    for key, value in kwargs.items():
+        setattr(pool, key, value)
+    return pool
+
+
+def _make_xlsx(*rows):
+    book = openpyxl.Workbook()
+    for row in rows:
+        book.active.append(row)
+    file_content = BytesIO()
+    book.save(file_content)
+    file_content.seek(0)
+    return file_content
+
+
+def test_serve_converts_spreadsheets_until_stdin_is_closed():
+    stdin, stdout = BytesIO(), BytesIO()
+    for filename, file_content in (("one.csv", b"phone number\n07700900001"), ("two.tsv", b"name\tage\nJo\t7")):
+        _write_frame(stdin, _REQUEST, json.dumps({"filename": filename}).encode())
+        _write_frame(stdin, _REQUEST, file_content)
+    stdin.seek(0)
+
+    serve(stdin, stdout)
+
+    stdout.seek(0)
+    assert _read_frame(stdout) == (_DATA, b"phone number\r\n07700900001")
+    assert _read_frame(stdout) == (_END, b"")
+    assert _read_frame(stdout) == (_DATA, b"name,age\r\nJo,7\r\n")
+    assert _read_frame(stdout) == (_END, b"")
+    assert stdout.read() == b""
+
+
+def test_serve_sends_back_errors():
+    stdin, stdout = BytesIO(), BytesIO()
+    _write_frame(stdin, _REQUEST, json.dumps({"filename": "broken.xlsx"}).encode())
+    _write_frame(stdin, _REQUEST, b"not a spreadsheet")
+    stdin.seek(0)
+
+    serve(stdin, stdout)
+
+    stdout.seek(0)
+    kind, payload = _read_frame(stdout)
+    assert kind == _ERROR
+    assert isinstance(pickle.loads(payload), BadZipFile)
+
+
+@pytest.mark.parametrize(
+    "pool_settings, filename",
+    (
+        ({"processes": 0}, "example.xlsx"),
+        ({}, "example.csv"),
+        ({"inline_below_bytes": 1024 * 1024}, "example.xlsx"),
+    ),
+)
+def test_convert_to_csv_converts_inline_if_not_worth_using_another_process(mocker, pool_settings, filename):
+    pool = _make_pool(**pool_settings)
+    mock_convert_in_worker_process = mocker.patch.object(pool, "_convert_in_worker_process")
+    file_content = _make_xlsx(["phone number"], ["07700900001"]) if filename.endswith("xlsx") else BytesIO(b"a\n1")
+
+    assert pool.convert_to_csv(file_content, filename).startswith(("phone number", "a"))
+    assert mock_convert_in_worker_process.called is False
+
+
+def test_convert_to_csv_in_worker_process(mocker):
+    pool = _make_pool()
+    mock_start_process = mocker.spy(pool, "_start_process")
+
+    try:
+        for _ in range(2):
+            assert pool.convert_to_csv(_make_xlsx(["phone number"], ["07700900001"]), "example.xlsx") == (
+                Spreadsheet.from_file(_make_xlsx(["phone number"], ["07700900001"]), "example.xlsx").as_csv_data
+            )
+
+        with pytest.raises(BadZipFile):
+            pool.convert_to_csv(BytesIO(b"not a spreadsheet"), "broken.xlsx")
+    finally:
+        while not pool._idle.empty():
+            pool._discard_process(pool._idle.get())
+
+    # the same process is used for every conversion, including after an error
+    assert mock_start_process.call_count == 1
+
+
+def test_convert_to_csv_gives_up_if_too_many_waiting(mocker):
+    pool = _make_pool(processes=1, max_queued=1)
+    pool._started = 1
+    pool._waiting = 1
+
+    with pytest.raises(SpreadsheetConversionPool.ConversionTimeoutError):
+        pool.convert_to_csv(_make_xlsx(["phone number"]), "example.xlsx")
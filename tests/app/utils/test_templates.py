@@ -140,7 +140,7 @@ def test_get_page_counts_for_letter_returns_cached_value(
     mock_redis_get.assert_called_once_with(f"service-{SERVICE_ONE_ID}-template-{fake_uuid}-version-1-all-page-counts")
 
 
-def test_get_page_counts_for_letter_does_not_cache_for_personalised_letters(
+def test_get_page_counts_for_letter_caches_personalised_letters_by_their_values(
     client_request,
     service_one,
     api_user_active,
@@ -149,6 +149,9 @@ def test_get_page_counts_for_letter_does_not_cache_for_personalised_letters(
 ):
     client_request.login(api_user_active, service_one)
 
+    redis = {}
+    mocker.patch("app.extensions.RedisClient.get", side_effect=redis.get)
+    mocker.patch("app.extensions.RedisClient.set", side_effect=lambda key, value, ex: redis.update({key: value}))
     mock_get_page_count = do_mock_get_page_counts_for_letter(mocker, count=5)
 
     template = TemplatedLetterImageTemplate(
@@ -159,13 +162,17 @@ def test_get_page_counts_for_letter_does_not_cache_for_personalised_letters(
         )
     )
 
-    for _ in range(3):
+    for values in ({"foo": "bar"}, {"foo": "baz"}, {"FOO": "bar"}, {"foo": "baz"}):
         # We’re changing the values so the page count might change
-        template.values = {"foo": "bar"}
+        template.values = values
         assert template.page_count == 5
 
-    # No calls to Redis here
-    assert len(mock_get_page_count.call_args_list) == 3
+    # Only two distinct sets of values, so template preview only gets called twice
+    assert len(mock_get_page_count.call_args_list) == 2
+    assert [key.split("-all-page-counts-")[0] for key in redis] == [
+        f"service-{SERVICE_ONE_ID}-template-{fake_uuid}-version-1",
+        f"service-{SERVICE_ONE_ID}-template-{fake_uuid}-version-1",
+    ]
 
 
 @freeze_time("2012-12-12 12:12:12")
@@ -792,9 +792,9 @@ def mock_get_template_version(notify_admin, mocker, api_user_active):
 
 @pytest.fixture(scope="function")
 def mock_get_template_versions(notify_admin, mocker, api_user_active):
-    def _get(service_id, template_id):
+    def _get(service_id, template_id, page=1, page_size=25):
         template_version = template_version_json(service_id, template_id, api_user_active, version=1)
-        return {"data": [template_version]}
+        return {"data": [template_version], "total": 1}
 
     return mocker.patch("app.service_api_client.get_service_template_versions", side_effect=_get)
 
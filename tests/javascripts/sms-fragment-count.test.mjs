@@ -0,0 +1,42 @@
+import fs from 'fs';
+import {
+  SMS_FRAGMENT_COUNTING_RULES_VERSION,
+  countSMSFragments,
+  renderSMSFragmentCount
+} from '../../app/assets/javascripts/esm/sms-fragment-count.mjs';
+
+// The same examples are checked against SMSMessageTemplate by tests/app/utils/test_sms_fragment_counting.py
+const smsFragmentCounts = JSON.parse(fs.readFileSync(new URL('../sms-fragment-counts.json', import.meta.url)));
+
+const renderAsText = html => {
+  document.body.innerHTML = html;
+  return document.body.textContent.replace(/\s+/g, ' ').trim();
+};
+
+describe('SMS fragment count', () => {
+
+  afterEach(() => {
+    document.body.innerHTML = '';
+  });
+
+  test('It should understand the version of the rules the server sends', () => {
+    expect(smsFragmentCounts.rules.version).toEqual(SMS_FRAGMENT_COUNTING_RULES_VERSION);
+  });
+
+  test.each(smsFragmentCounts.cases)(
+    'It should count $repeat × "$content" the same as the server (prefix: $prefix_sms)',
+    ({ content, repeat, prefix_sms, fragment_count, message, error }) => {
+      const count = countSMSFragments(
+        content.repeat(repeat),
+        smsFragmentCounts.rules,
+        prefix_sms ? smsFragmentCounts.service_name : undefined
+      );
+
+      expect(count.fragmentCount).toEqual(fragment_count);
+      expect(count.isMessageTooLong).toEqual(error);
+      expect(renderAsText(renderSMSFragmentCount(count))).toEqual(message);
+      expect(document.querySelector('span').classList.contains('govuk-error-message')).toEqual(error);
+    }
+  );
+
+});
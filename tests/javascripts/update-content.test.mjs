@@ -11,10 +11,11 @@ describe('Update content', () => {
   let serverResponseData = {};
   let mockFetch;
 
-  const createMockResponse = (data, status = 200, statusText = 'OK') => ({
+  const createMockResponse = (data, status = 200, statusText = 'OK', headers = {}) => ({
     ok: status >= 200 && status < 300,
     status,
     statusText,
+    headers: { get: (name) => headers[name] ?? null },
     json: () => Promise.resolve(data),
   });
 
@@ -165,6 +166,77 @@ describe('Update content', () => {
       expect(locationReload).toHaveBeenCalled();
     });
 
+    test('It should ask the server to only send changed content', async () => {
+      mockFetch.mockResolvedValueOnce(createMockResponse(serverResponseData, 200, 'OK', { ETag: '"abc123"' }));
+
+      new UpdateContent(document.querySelector('[data-notify-module="update-content"]'));
+
+      await jest.advanceTimersByTimeAsync(2000);
+      expect(mockFetch.mock.calls[0][1].headers['If-None-Match']).toBeUndefined();
+
+      await jest.advanceTimersByTimeAsync(1000);
+      expect(mockFetch).toHaveBeenCalledTimes(2);
+      expect(mockFetch.mock.calls[1][1].headers['If-None-Match']).toEqual('"abc123"');
+    });
+
+    test('With a 304 response status code, content should not be updated and polling should continue', async () => {
+      const notModifiedResponse = createMockResponse({}, 304, 'Not Modified');
+      notModifiedResponse.json = jest.fn();
+      mockFetch.mockResolvedValueOnce(notModifiedResponse);
+
+      new UpdateContent(document.querySelector('[data-notify-module="update-content"]'));
+
+      await jest.advanceTimersByTimeAsync(2000);
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+      expect(notModifiedResponse.json).not.toHaveBeenCalled();
+      expect(locationReload).not.toHaveBeenCalled();
+
+      await jest.advanceTimersByTimeAsync(1000);
+      expect(mockFetch).toHaveBeenCalledTimes(2);
+    });
+
+    test('It should wait as long as the server suggests before polling again', async () => {
+      mockFetch.mockResolvedValueOnce(createMockResponse(serverResponseData, 200, 'OK', { 'X-Poll-Interval': '30' }));
+
+      new UpdateContent(document.querySelector('[data-notify-module="update-content"]'));
+
+      await jest.advanceTimersByTimeAsync(2000);
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+
+      await jest.advanceTimersByTimeAsync(29999);
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+
+      await jest.advanceTimersByTimeAsync(1);
+      expect(mockFetch).toHaveBeenCalledTimes(2);
+    });
+
+    test('It should stop polling if the server says nothing can change', async () => {
+      const notModifiedResponse = createMockResponse({}, 304, 'Not Modified', { 'X-Poll-Interval': 'stop' });
+      mockFetch.mockResolvedValueOnce(notModifiedResponse);
+
+      new UpdateContent(document.querySelector('[data-notify-module="update-content"]'));
+
+      await jest.advanceTimersByTimeAsync(2000);
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+
+      await jest.advanceTimersByTimeAsync(60000);
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+    });
+
+    test('It should render the last response before stopping if the server says nothing can change', async () => {
+      const finalResponseData = { [updateKey]: '<p class="notification-status">Delivered</p>' };
+      mockFetch.mockResolvedValueOnce(createMockResponse(finalResponseData, 200, 'OK', { 'X-Poll-Interval': 'stop' }));
+
+      new UpdateContent(document.querySelector('[data-notify-module="update-content"]'));
+
+      await jest.advanceTimersByTimeAsync(2000);
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+      expect(document.querySelector('.notification-status').textContent).toEqual('Delivered');
+
+      await jest.advanceTimersByTimeAsync(60000);
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+    });
+
     test('With response.stop === 1, polling should be stopped', async () => {
       const responseWithStop = { stop: 1, ...serverResponseData };
       mockFetch.mockResolvedValueOnce(createMockResponse(responseWithStop));
@@ -1,6 +1,9 @@
 import UpdateStatus from '../../app/assets/javascripts/esm/update-status.mjs';
 import { jest } from '@jest/globals';
 import { triggerEvent } from './support/helpers/events.mjs';
+import fs from 'fs';
+
+const smsFragmentCounts = JSON.parse(fs.readFileSync(new URL('../sms-fragment-counts.json', import.meta.url)));
 
 const serviceNumber = '6658542f-0cad-491f-bec8-ab8457700ead';
 const updatesURL = `/services/${serviceNumber}/templates/count-sms-length`;
@@ -250,3 +253,97 @@ describe('Update content', () => {
   });
 
 });
+
+describe('Update content by counting in the browser', () => {
+
+  let $module;
+  let updateStatus;
+  let mockFetch;
+
+  const setUpModule = ({ rules = smsFragmentCounts.rules, prefix = '' } = {}) => {
+    document.body.innerHTML = `
+      <form>
+        <textarea name="template_content" id="template_content">${'a'.repeat(161)}</textarea>
+      </form>
+      <div class="status-container" hidden>
+        <div data-notify-module="update-status" data-updates-url="${updatesURL}" data-target="template_content" ${prefix}>
+          Initial content
+        </div>
+      </div>
+    `;
+
+    $module = document.querySelector('[data-notify-module="update-status"]');
+    $module.dataset.smsFragmentCountingRules = JSON.stringify(rules);
+
+    updateStatus = new UpdateStatus($module);
+    jest.spyOn(updateStatus, 'update');
+  };
+
+  beforeEach(() => {
+
+    mockFetch = jest.fn();
+    window.fetch = mockFetch;
+
+    document.body.classList.add('govuk-frontend-supported');
+
+  });
+
+  afterEach(() => {
+
+    document.body.innerHTML = '';
+    jest.clearAllTimers();
+    jest.restoreAllMocks();
+
+  });
+
+  test("It should count the content without asking the server", async () => {
+
+    setUpModule();
+    updateStatus.init();
+    await updateStatus.update.mock.results[0].value;
+
+    expect(mockFetch).not.toHaveBeenCalled();
+    expect($module.textContent.replace(/\s+/g, ' ').trim()).toEqual(
+      "Will be charged as 2 text messages Reduce the cost of sending this message by removing 1 character"
+    );
+
+  });
+
+  test("It should count the service name if messages start with it", async () => {
+
+    setUpModule({ prefix: 'data-sms-prefix="service one"' });
+    document.getElementById('template_content').value = 'a'.repeat(147);
+    updateStatus.init();
+    await updateStatus.update.mock.results[0].value;
+
+    expect($module.textContent.replace(/\s+/g, ' ').trim()).toEqual("Will be charged as 1 text message");
+
+    document.getElementById('template_content').value = 'a'.repeat(148);
+    jest.advanceTimersByTime(150);
+    triggerEvent(document.getElementById('template_content'), 'input');
+    await updateStatus.update.mock.results[1].value;
+
+    expect($module.textContent.replace(/\s+/g, ' ').trim()).toEqual(
+      "Will be charged as 2 text messages Reduce the cost of sending this message by removing 1 character"
+    );
+
+  });
+
+  test("It should ask the server if it doesn't understand the rules", async () => {
+
+    mockFetch.mockResolvedValueOnce({
+      ok: true,
+      json: () => Promise.resolve({'html': 'Updated content'})
+    });
+
+    setUpModule({ rules: { ...smsFragmentCounts.rules, version: smsFragmentCounts.rules.version + 1 } });
+    updateStatus.init();
+    await updateStatus.update.mock.results[0].value;
+
+    expect(mockFetch).toHaveBeenCalled();
+    expect($module.textContent.trim()).toEqual("Updated content");
+
+  });
+
+});
+